@@ -1,67 +1,111 @@
 """hookline — Claude Code ↔ Telegram relay."""
 from __future__ import annotations
 
+from typing import Any
+
 __version__ = "4.3.0"
 
-# Re-export the primary entry points
-from hookline._log import log as _log  # noqa: F401
-from hookline.approval import _handle_pre_tool_use, _send_threaded  # noqa: F401
-from hookline.buttons import _build_buttons, _clear_last_button_msg, _get_last_button_msg, _set_last_button_msg  # noqa: F401
-from hookline.config import (  # noqa: F401
-    APPROVAL_ENABLED,
-    APPROVAL_TIMEOUT,
-    APPROVAL_USER,
-    AUDIT_LOG,
-    BOT_TOKEN,
-    CHAT_ID,
-    CLAUDE_DIR,
-    DEBOUNCE_EVENTS,
-    DEBOUNCE_WINDOW,
-    DRY_RUN,
-    EMOJI,
-    FULL_FORMAT_EVENTS,
-    MIN_SESSION_AGE,
-    NOTIFY_CONFIG_PATH,
-    PROJECT_CONFIG_PATH,
-    REPLY_COMMANDS,
-    SENTINEL_DIR,
-    SERVE_PID_FILE,
-    SHOW_BUTTONS,
-    STATE_DIR,
-    SUPPRESS,
-    _cfg_bool,
-    _cfg_int,
-    _cfg_str,
-    _cfg_suppress,
-    _load_config,
-)
-from hookline.debounce import _debounce_accumulate, _debounce_flush, _debounce_should_flush  # noqa: F401
-from hookline.formatting import _esc, _format_body, _strip_html, _truncate, format_compact, format_full  # noqa: F401
-from hookline.project import _get_project_config, _project_emoji, _project_label  # noqa: F401
-from hookline.replies import _handle_reply_message  # noqa: F401
-from hookline.serve import serve  # noqa: F401
-from hookline.session import (  # noqa: F401
-    _extract_project,
-    _is_enabled,
-    _is_muted,
-    _sentinel_path,
-    _sentinel_timestamp,
-    _session_age_seconds,
-    _session_duration,
-    _session_key,
-)
-from hookline.state import _clear_state, _is_serve_running, _locked_update, _read_state, _state_dir, _write_state  # noqa: F401
-from hookline.tasks import _clear_tasks, _track_task  # noqa: F401
-from hookline.telegram import _answer_callback, _remove_buttons, _send_document, _telegram_api, send_message  # noqa: F401
-from hookline.threads import _clear_thread, _find_thread_by_message_id, _get_thread_id, _set_thread_id  # noqa: F401
-from hookline.transcript import _extract_transcript_summary, _read_transcript_tail, _transcript_cache  # noqa: F401
-from hookline.relay import (  # noqa: F401
-    clear_inbox,
-    is_paused,
-    list_active_sessions,
-    mark_read,
-    read_inbox,
-    set_paused,
-    write_inbox,
-)
-from hookline.commands import dispatch as dispatch_command, register as register_command  # noqa: F401
+# Re-exported names, resolved on first attribute access (PEP 562) so that
+# `python -m hookline` only imports the submodules the current command needs.
+_LAZY: dict[str, tuple[str, str]] = {
+    "_handle_pre_tool_use": ("hookline.approval", "_handle_pre_tool_use"),
+    "_send_threaded": ("hookline.approval", "_send_threaded"),
+    "_build_buttons": ("hookline.buttons", "_build_buttons"),
+    "_clear_last_button_msg": ("hookline.buttons", "_clear_last_button_msg"),
+    "_get_last_button_msg": ("hookline.buttons", "_get_last_button_msg"),
+    "_set_last_button_msg": ("hookline.buttons", "_set_last_button_msg"),
+    "APPROVAL_ENABLED": ("hookline.config", "APPROVAL_ENABLED"),
+    "APPROVAL_TIMEOUT": ("hookline.config", "APPROVAL_TIMEOUT"),
+    "APPROVAL_USER": ("hookline.config", "APPROVAL_USER"),
+    "AUDIT_LOG": ("hookline.config", "AUDIT_LOG"),
+    "BOT_TOKEN": ("hookline.config", "BOT_TOKEN"),
+    "CHAT_ID": ("hookline.config", "CHAT_ID"),
+    "CLAUDE_DIR": ("hookline.config", "CLAUDE_DIR"),
+    "DEBOUNCE_EVENTS": ("hookline.config", "DEBOUNCE_EVENTS"),
+    "DEBOUNCE_WINDOW": ("hookline.config", "DEBOUNCE_WINDOW"),
+    "DRY_RUN": ("hookline.config", "DRY_RUN"),
+    "EMOJI": ("hookline.config", "EMOJI"),
+    "FULL_FORMAT_EVENTS": ("hookline.config", "FULL_FORMAT_EVENTS"),
+    "MIN_SESSION_AGE": ("hookline.config", "MIN_SESSION_AGE"),
+    "NOTIFY_CONFIG_PATH": ("hookline.config", "NOTIFY_CONFIG_PATH"),
+    "PROJECT_CONFIG_PATH": ("hookline.config", "PROJECT_CONFIG_PATH"),
+    "REPLY_COMMANDS": ("hookline.config", "REPLY_COMMANDS"),
+    "SENTINEL_DIR": ("hookline.config", "SENTINEL_DIR"),
+    "SERVE_PID_FILE": ("hookline.config", "SERVE_PID_FILE"),
+    "SHOW_BUTTONS": ("hookline.config", "SHOW_BUTTONS"),
+    "STATE_DIR": ("hookline.config", "STATE_DIR"),
+    "SUPPRESS": ("hookline.config", "SUPPRESS"),
+    "_cfg_bool": ("hookline.config", "_cfg_bool"),
+    "_cfg_int": ("hookline.config", "_cfg_int"),
+    "_cfg_str": ("hookline.config", "_cfg_str"),
+    "_cfg_suppress": ("hookline.config", "_cfg_suppress"),
+    "_load_config": ("hookline.config", "_load_config"),
+    "_debounce_accumulate": ("hookline.debounce", "_debounce_accumulate"),
+    "_debounce_flush": ("hookline.debounce", "_debounce_flush"),
+    "_debounce_should_flush": ("hookline.debounce", "_debounce_should_flush"),
+    "_esc": ("hookline.formatting", "_esc"),
+    "_format_body": ("hookline.formatting", "_format_body"),
+    "_strip_html": ("hookline.formatting", "_strip_html"),
+    "_truncate": ("hookline.formatting", "_truncate"),
+    "format_compact": ("hookline.formatting", "format_compact"),
+    "format_full": ("hookline.formatting", "format_full"),
+    "_get_project_config": ("hookline.project", "_get_project_config"),
+    "_project_emoji": ("hookline.project", "_project_emoji"),
+    "_project_label": ("hookline.project", "_project_label"),
+    "_handle_reply_message": ("hookline.replies", "_handle_reply_message"),
+    "_extract_project": ("hookline.session", "_extract_project"),
+    "_is_enabled": ("hookline.session", "_is_enabled"),
+    "_is_muted": ("hookline.session", "_is_muted"),
+    "_sentinel_path": ("hookline.session", "_sentinel_path"),
+    "_sentinel_timestamp": ("hookline.session", "_sentinel_timestamp"),
+    "_session_age_seconds": ("hookline.session", "_session_age_seconds"),
+    "_session_duration": ("hookline.session", "_session_duration"),
+    "_session_key": ("hookline.session", "_session_key"),
+    "_clear_state": ("hookline.state", "_clear_state"),
+    "_clear_states": ("hookline.state", "_clear_states"),
+    "_is_serve_running": ("hookline.state", "_is_serve_running"),
+    "_locked_update": ("hookline.state", "_locked_update"),
+    "_read_state": ("hookline.state", "_read_state"),
+    "_state_dir": ("hookline.state", "_state_dir"),
+    "_write_state": ("hookline.state", "_write_state"),
+    "_clear_tasks": ("hookline.tasks", "_clear_tasks"),
+    "_track_task": ("hookline.tasks", "_track_task"),
+    "_answer_callback": ("hookline.telegram", "_answer_callback"),
+    "_remove_buttons": ("hookline.telegram", "_remove_buttons"),
+    "_send_document": ("hookline.telegram", "_send_document"),
+    "_telegram_api": ("hookline.telegram", "_telegram_api"),
+    "send_message": ("hookline.telegram", "send_message"),
+    "_clear_thread": ("hookline.threads", "_clear_thread"),
+    "_find_thread_by_message_id": ("hookline.threads", "_find_thread_by_message_id"),
+    "_get_thread_id": ("hookline.threads", "_get_thread_id"),
+    "_set_thread_id": ("hookline.threads", "_set_thread_id"),
+    "_extract_transcript_summary": ("hookline.transcript", "_extract_transcript_summary"),
+    "_read_transcript_tail": ("hookline.transcript", "_read_transcript_tail"),
+    "_transcript_cache": ("hookline.transcript", "_transcript_cache"),
+    "clear_inbox": ("hookline.relay", "clear_inbox"),
+    "is_paused": ("hookline.relay", "is_paused"),
+    "list_active_sessions": ("hookline.relay", "list_active_sessions"),
+    "mark_read": ("hookline.relay", "mark_read"),
+    "read_inbox": ("hookline.relay", "read_inbox"),
+    "scan_inbox": ("hookline.relay", "scan_inbox"),
+    "set_paused": ("hookline.relay", "set_paused"),
+    "write_inbox": ("hookline.relay", "write_inbox"),
+    "dispatch_command": ("hookline.commands", "dispatch"),
+    "flush_replies": ("hookline.commands", "flush_replies"),
+    "register_command": ("hookline.commands", "register"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    import importlib
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY])
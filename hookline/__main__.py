@@ -1,14 +1,17 @@
 """CLI dispatch for python3 -m hookline."""
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import sys
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
-from hookline import __version__
+from hookline import __version__, _json
 from hookline._log import log
-from hookline.approval import _handle_pre_tool_use, _send_threaded
-from hookline.buttons import _clear_last_button_msg
 from hookline.config import (
+    APPROVAL_ENABLED,
     DEBOUNCE_EVENTS,
     DRY_RUN,
     FULL_FORMAT_EVENTS,
@@ -18,35 +21,50 @@ from hookline.config import (
     STATE_DIR,
     SUPPRESS,
 )
-from hookline.debounce import _debounce_accumulate, _debounce_flush, _debounce_should_flush
-from hookline.formatting import format_compact, format_full
-from hookline.session import _extract_project, _is_enabled, _session_age_seconds
-from hookline.state import _clear_state, _is_serve_running
-from hookline.tasks import _clear_tasks
-from hookline.telegram import _telegram_api
-from hookline.threads import _clear_thread
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+# Sidecar under STATE_DIR mapping relpath -> [mtime_ns, size, ok, blake2b hex]
+# (a JSON array, so entries stay lists to compare equal after a round-trip)
+_HEALTH_CACHE = ".health_cache.json"
+_HealthEntry = list[Any]
+
+# Lazily created worker for fire-and-forget writes (see _submit_background)
+_executor: ThreadPoolExecutor | None = None
 
 
 def main() -> None:
     """Hook handler: read event from stdin, format, send with all features."""
     try:
-        raw = sys.stdin.read()
+        # Bytes straight into the parser: no intermediate str decode
+        raw = getattr(sys.stdin, "buffer", sys.stdin).read()
         if not raw.strip():
             log("Empty stdin, nothing to do")
             return
-        event = json.loads(raw)
-    except json.JSONDecodeError as e:
+        event = _json.loads(raw)
+    except (_json.JSONDecodeError, UnicodeDecodeError) as e:
         log(f"Invalid JSON on stdin: {e}")
         return
 
-    project = _extract_project(event)
     event_name = event.get("hook_event_name", "Unknown")
-    transcript_path = event.get("transcript_path", "")
 
+    # PreToolUse fires on every tool call: skip loading the approval and
+    # Telegram machinery entirely when approvals are off.
     if event_name == "PreToolUse":
+        if not APPROVAL_ENABLED:
+            return
+        from hookline.approval import _handle_pre_tool_use
         _handle_pre_tool_use(event)
         return
 
+    from hookline.debounce import _debounce_accumulate, _debounce_flush, _debounce_should_flush
+    from hookline.formatting import format_compact, format_full
+    from hookline.session import _extract_project, _is_enabled, _session_age_seconds
+
+    project = _extract_project(event)
+    transcript_path = event.get("transcript_path", "")
+
     if not DRY_RUN and not _is_enabled(project):
         return
     if event_name in SUPPRESS:
@@ -56,102 +74,139 @@ def main() -> None:
         if age is not None and age < MIN_SESSION_AGE:
             return
 
-    if _debounce_should_flush(project):
-        batch_msg = _debounce_flush(project)
-        if batch_msg:
-            _send_threaded(batch_msg, project, transcript_path)
+    batch = _MessageBatch(project, transcript_path)
+    try:
+        if _debounce_should_flush(project):
+            batch_msg = _debounce_flush(project)
+            if batch_msg:
+                batch.add(batch_msg)
 
-    if event_name in DEBOUNCE_EVENTS:
-        _debounce_accumulate(project, event)
-        return
+        if event_name in DEBOUNCE_EVENTS:
+            _debounce_accumulate(project, event)
+            return
+
+        if event_name == "Stop":
+            batch_msg = _debounce_flush(project)
+            if batch_msg:
+                batch.add(batch_msg)
+
+            # Memory logging is non-critical: run it alongside the Telegram send
+            _submit_background(_log_event_to_memory, project, "stop", "Session ended")
+
+            msg = format_full(event_name, event, project)
+            batch.add(msg, is_final=True)
+
+            from hookline.buttons import _clear_last_button_msg
+            from hookline.state import _clear_state
+            from hookline.tasks import _clear_tasks
+            from hookline.threads import _clear_thread
+
+            _clear_tasks(project)
+            _clear_thread(project)
+            _clear_last_button_msg(project)
+            _clear_state(project, "debounce.json")
+            if RELAY_ENABLED:
+                from hookline.relay import clear_inbox, set_paused
+                clear_inbox(project)
+                set_paused(project, paused=False)
+            return
 
-    if event_name == "Stop":
         batch_msg = _debounce_flush(project)
         if batch_msg:
-            _send_threaded(batch_msg, project, transcript_path)
-
-        msg = format_full(event_name, event, project)
-        _send_threaded(msg, project, transcript_path, is_final=True)
-
-        _clear_tasks(project)
-        _clear_thread(project)
-        _clear_last_button_msg(project)
-        _clear_state(project, "debounce.json")
-        if RELAY_ENABLED:
-            from hookline.relay import clear_inbox, set_paused
-            clear_inbox(project)
-            set_paused(project, paused=False)
-        _log_event_to_memory(project, "stop", "Session ended")
-        return
+            batch.add(batch_msg)
+
+        if event_name in FULL_FORMAT_EVENTS:
+            msg = format_full(event_name, event, project)
+        else:
+            msg = format_compact(event_name, event, project)
+        batch.add(msg)
 
-    batch_msg = _debounce_flush(project)
-    if batch_msg:
-        _send_threaded(batch_msg, project, transcript_path)
+        # Surface unread inbox messages as a digest appended to the notification
+        _surface_inbox(project, batch)
+    finally:
+        batch.flush()
 
-    if event_name in FULL_FORMAT_EVENTS:
-        msg = format_full(event_name, event, project)
-    else:
-        msg = format_compact(event_name, event, project)
 
-    _send_threaded(msg, project, transcript_path)
+class _MessageBatch:
+    """Coalesce the notifications one hook event produces into as few sends as possible.
+
+    Pieces are joined with a blank line and sent as one message on is_final,
+    before the total would pass Telegram's 4096-char limit, or on flush().
+    """
+
+    _LIMIT = 3800  # headroom under Telegram's 4096 for HTML entities
 
-    # Surface unread inbox messages as a digest appended to the notification
-    _surface_inbox(project, transcript_path)
+    def __init__(self, project: str, transcript_path: str) -> None:
+        self.project = project
+        self.transcript_path = transcript_path
+        self._parts: list[str] = []
+        self._size = 0
 
+    def add(self, text: str, is_final: bool = False) -> None:
+        if self._parts and self._size + 2 + len(text) > self._LIMIT:
+            self.flush()
+        self._size += len(text) + (2 if self._parts else 0)
+        self._parts.append(text)
+        if is_final:
+            self.flush(is_final=True)
 
-def _surface_inbox(project: str, transcript_path: str) -> None:
-    """Send unread inbox messages as a digest notification."""
+    def flush(self, is_final: bool = False) -> None:
+        if not self._parts:
+            return
+        from hookline.approval import _send_threaded
+        text = "\n\n".join(self._parts)
+        self._parts = []
+        self._size = 0
+        _send_threaded(text, self.project, self.transcript_path, is_final=is_final)
+
+
+def _surface_inbox(project: str, batch: _MessageBatch) -> None:
+    """Queue unread inbox messages as a digest onto the outgoing batch."""
     if not RELAY_ENABLED or not project:
         return
     from hookline.formatting import _esc, _truncate
-    from hookline.relay import mark_read, read_inbox
+    from hookline.relay import mark_read, scan_inbox
 
-    messages = read_inbox(project, unread_only=True)
-    if not messages:
+    total, shown = scan_inbox(project, unread_only=True, tail=5)
+    if not total:
         return
 
-    lines = [f"<b>📨 {len(messages)} message(s) from Telegram</b>", ""]
-    msg_ids: list[str] = []
-    for msg in messages[-5:]:
-        sender = msg.get("sender", "?")
-        text = _truncate(msg.get("text", ""), 200)
-        lines.append(f"  [{sender}] {_esc(text)}")
-        msg_ids.append(msg.get("id", ""))
-    if len(messages) > 5:
-        lines.append(f"  <i>… and {len(messages) - 5} more</i>")
-
-    _send_threaded("\n".join(lines), project, transcript_path)
+    lines = [
+        f"<b>📨 {total} message(s) from Telegram</b>",
+        "",
+        *[
+            f"  [{msg.get('sender', '?')}] {_esc(_truncate(msg.get('text', ''), 200))}"
+            for msg in shown
+        ],
+    ]
+    msg_ids = [msg.get("id", "") for msg in shown]
+    if total > 5:
+        lines.append(f"  <i>… and {total - 5} more</i>")
+
+    batch.add("\n".join(lines))
     mark_read(project, msg_ids if msg_ids else None)
 
 
 def health_check() -> None:
     """Run self-diagnostics and print results."""
-    from hookline.config import BOT_TOKEN, CHAT_ID
+    from concurrent.futures import ThreadPoolExecutor
 
-    checks: list[tuple[str, bool, str]] = []
+    from hookline.config import BOT_TOKEN, CHAT_ID
+    from hookline.state import _is_serve_running
+    from hookline.telegram import _telegram_api
 
     has_token = bool(BOT_TOKEN)
-    checks.append(("BOT_TOKEN", has_token, BOT_TOKEN[:8] + "***" if has_token else "not set"))
-
     has_chat = bool(CHAT_ID)
-    checks.append(("CHAT_ID", has_chat, CHAT_ID if has_chat else "not set"))
-
-    bot_valid = False
-    bot_info = ""
-    if has_token:
-        result = _telegram_api("getMe", {})
-        if result and result.get("ok"):
-            bot_valid = True
-            bot_info = result["result"].get("username", "?")
-        else:
-            bot_info = "API call failed"
-    checks.append(("Bot valid", bot_valid, f"@{bot_info}" if bot_valid else bot_info))
 
-    chat_ok = False
-    if has_token and has_chat:
-        result = _telegram_api("sendChatAction", {"chat_id": CHAT_ID, "action": "typing"})
-        chat_ok = bool(result and result.get("ok"))
-    checks.append(("Chat reachable", chat_ok, "OK" if chat_ok else "unreachable"))
+    # Both Telegram probes wait on network RTT: issue them concurrently and
+    # run the local filesystem checks while they are in flight.
+    pool = ThreadPoolExecutor(max_workers=2)
+    me_future = pool.submit(_telegram_api, "getMe", {}) if has_token else None
+    chat_future = (
+        pool.submit(_telegram_api, "sendChatAction", {"chat_id": CHAT_ID, "action": "typing"})
+        if has_token and has_chat else None
+    )
+    pool.shutdown(wait=False)
 
     state_ok = False
     state_err = ""
@@ -163,21 +218,9 @@ def health_check() -> None:
         state_ok = True
     except OSError as e:
         state_err = str(e)
-    checks.append(("State dir", state_ok, str(STATE_DIR) if state_ok else state_err))
 
-    corrupt_files: list[str] = []
-    if STATE_DIR.exists():
-        for project_dir in STATE_DIR.iterdir():
-            if not project_dir.is_dir():
-                continue
-            for json_file in project_dir.glob("*.json"):
-                try:
-                    json.loads(json_file.read_text())
-                except (json.JSONDecodeError, OSError):
-                    corrupt_files.append(str(json_file.relative_to(STATE_DIR)))
+    corrupt_files = _scan_state_files()
     state_clean = len(corrupt_files) == 0
-    checks.append(("State files", state_clean,
-                    "all valid" if state_clean else f"corrupt: {', '.join(corrupt_files[:3])}"))
 
     daemon_running = _is_serve_running()
     daemon_info = ""
@@ -189,7 +232,32 @@ def health_check() -> None:
         except OSError:
             daemon_info = "running"
     daemon_detail = daemon_info if daemon_running else "not running"
-    checks.append(("Serve daemon", daemon_running, daemon_detail))
+
+    bot_valid = False
+    bot_info = ""
+    if me_future is not None:
+        result = me_future.result()
+        if result and result.get("ok"):
+            bot_valid = True
+            bot_info = result["result"].get("username", "?")
+        else:
+            bot_info = "API call failed"
+
+    chat_ok = False
+    if chat_future is not None:
+        result = chat_future.result()
+        chat_ok = bool(result and result.get("ok"))
+
+    checks = [
+        ("BOT_TOKEN", has_token, BOT_TOKEN[:8] + "***" if has_token else "not set"),
+        ("CHAT_ID", has_chat, CHAT_ID if has_chat else "not set"),
+        ("Bot valid", bot_valid, f"@{bot_info}" if bot_valid else bot_info),
+        ("Chat reachable", chat_ok, "OK" if chat_ok else "unreachable"),
+        ("State dir", state_ok, str(STATE_DIR) if state_ok else state_err),
+        ("State files", state_clean,
+         "all valid" if state_clean else f"corrupt: {', '.join(corrupt_files[:3])}"),
+        ("Serve daemon", daemon_running, daemon_detail),
+    ]
 
     print(f"🩺 hookline v{__version__} health check")
     print("──────────────────────────────────────────────")
@@ -207,6 +275,90 @@ def health_check() -> None:
     sys.exit(0 if all_ok else 1)
 
 
+def _scan_state_files() -> list[str]:
+    """Return relative paths of state JSON files that fail to parse.
+
+    Validity is cached by (mtime_ns, size, content digest) in
+    STATE_DIR/.health_cache.json so unchanged files are not re-read or
+    re-parsed on repeat runs.
+    """
+    if not STATE_DIR.exists():
+        return []
+    cache_path = STATE_DIR / _HEALTH_CACHE
+    try:
+        cache: dict[str, _HealthEntry] = json.loads(cache_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        cache = {}
+
+    fresh: dict[str, _HealthEntry] = {}
+    corrupt: list[str] = []
+    with os.scandir(STATE_DIR) as projects:
+        for project_dir in projects:
+            if not project_dir.is_dir(follow_symlinks=False):
+                continue
+            with os.scandir(project_dir.path) as files:
+                for entry in files:
+                    if not entry.name.endswith(".json") or not entry.is_file():
+                        continue
+                    rel = f"{project_dir.name}/{entry.name}"
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        corrupt.append(rel)
+                        continue
+                    cached = cache.get(rel)
+                    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                        ok = bool(cached[2])
+                        digest = cached[3] if len(cached) > 3 else ""
+                    else:
+                        ok, digest = _check_state_file(entry.path, cached)
+                    fresh[rel] = [st.st_mtime_ns, st.st_size, ok, digest]
+                    if not ok:
+                        corrupt.append(rel)
+    corrupt.sort()
+
+    if fresh != cache:
+        tmp = cache_path.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(fresh))
+            os.replace(tmp, cache_path)
+        except OSError as e:
+            log(f"Health cache write error: {e}")
+    return corrupt
+
+
+def _submit_background(fn: Callable[..., None], *args: Any) -> None:
+    """Run fn(*args) on a single worker thread; joined at interpreter exit."""
+    global _executor
+    if _executor is None:
+        import atexit
+        from concurrent.futures import ThreadPoolExecutor
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hookline-bg")
+        atexit.register(_executor.shutdown, wait=True)
+    _executor.submit(fn, *args)
+
+
+def _check_state_file(path: str, cached: _HealthEntry | None) -> tuple[bool, str]:
+    """Validate one state file: (parses, blake2b digest of its bytes).
+
+    A file rewritten with identical content (same digest as the cached entry)
+    reuses the cached verdict instead of being parsed again.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return False, ""
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    if cached and len(cached) > 3 and cached[3] == digest:
+        return bool(cached[2]), digest
+    try:
+        _json.loads(data)
+    except _json.JSONDecodeError:
+        return False, digest
+    return True, digest
+
+
 def _log_event_to_memory(project: str, event_type: str, text: str) -> None:
     """Log a hook event to memory store if memory is enabled."""
     if not MEMORY_ENABLED or not project:
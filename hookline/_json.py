@@ -0,0 +1,50 @@
+"""JSON codec: orjson when installed, stdlib json otherwise."""
+from __future__ import annotations
+
+import json
+from types import ModuleType
+from typing import Any
+
+_orjson: ModuleType | None
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+# catching the stdlib exception regardless of which backend is active.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str."""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes.
+
+    Both backends emit no whitespace and write non-ASCII as raw UTF-8, but
+    float formatting can differ (orjson writes 1e16 and NaN as null). Dict
+    keys must be str: orjson raises TypeError otherwise, and the stdlib path
+    checks for the same instead of silently coercing them.
+    """
+    if _orjson is not None:
+        out: bytes = _orjson.dumps(obj)
+        return out
+    _check_keys(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _check_keys(obj: Any) -> None:
+    """Raise TypeError, as orjson does, on a non-str dict key anywhere in obj."""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if not isinstance(key, str):
+                raise TypeError("Dict key must be str")
+            _check_keys(value)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            _check_keys(item)
@@ -24,7 +24,7 @@ from hookline.formatting import _esc, _truncate
 from hookline.project import _project_label
 from hookline.session import _extract_project, _is_enabled, _session_duration
 from hookline.state import _clear_state, _is_serve_running, _read_state, _write_state
-from hookline.telegram import _answer_callback, _telegram_api, send_message
+from hookline.telegram import _answer_callback, _send_async, _telegram_api, send_message
 from hookline.threads import _get_thread_id
 
 
@@ -275,14 +275,18 @@ def _handle_pre_tool_use(event: dict) -> None:
 
 
 def _handle_approval_callback(callback: dict) -> None:
-    """Handle an approval button press from the serve daemon."""
+    """Handle an approval button press from the serve daemon.
+
+    Acks go out on the serve loop's send pool; the pipe write that unblocks
+    the waiting hook is never held up by them.
+    """
     data = callback.get("data", "")
     callback_id = callback.get("id", "")
     sender_id = str(callback.get("from", {}).get("id", ""))
     user_name = callback.get("from", {}).get("first_name", "unknown")
 
     if sender_id != APPROVAL_USER:
-        _answer_callback(callback_id, "Not authorized for approvals")
+        _send_async(_answer_callback, callback_id, "Not authorized for approvals")
         log(f"Rejected approval from {sender_id} (expected {APPROVAL_USER})")
         return
 
@@ -293,17 +297,17 @@ def _handle_approval_callback(callback: dict) -> None:
         approval_id = data[6:]
         decision = "block"
     else:
-        _answer_callback(callback_id, "Unknown action")
+        _send_async(_answer_callback, callback_id, "Unknown action")
         return
 
     state = _read_state("_approvals", f"{approval_id}.json")
     if not state:
-        _answer_callback(callback_id, "Approval expired or already handled")
+        _send_async(_answer_callback, callback_id, "Approval expired or already handled")
         return
 
     pipe_path = state.get("pipe_path", "")
     if not pipe_path or not Path(pipe_path).exists():
-        _answer_callback(callback_id, "Approval expired (pipe gone)")
+        _send_async(_answer_callback, callback_id, "Approval expired (pipe gone)")
         return
 
     state["decided_by"] = user_name
@@ -320,12 +324,12 @@ def _handle_approval_callback(callback: dict) -> None:
         if e.errno == errno.ENXIO:
             created_at = state.get("created_at", "unknown")
             log(f"Approval pipe has no reader (hook timed out, created_at={created_at})")
-            _answer_callback(callback_id, "Approval expired (hook timed out)")
+            _send_async(_answer_callback, callback_id, "Approval expired (hook timed out)")
         else:
             log(f"Failed to write to approval pipe: {e}")
-            _answer_callback(callback_id, f"Error: {e}")
+            _send_async(_answer_callback, callback_id, f"Error: {e}")
         return
 
     emoji_char = "✅" if decision == "approve" else "❌"
-    _answer_callback(callback_id, f"{emoji_char} {decision.title()}d")
+    _send_async(_answer_callback, callback_id, f"{emoji_char} {decision.title()}d")
     print(f"[notify-serve] {user_name} {decision}d {state.get('tool_name', '?')} (id={approval_id})")
@@ -1,6 +1,8 @@
 """Inline button building and last-button state tracking."""
 from __future__ import annotations
 
+from functools import lru_cache
+
 from hookline.session import _session_key
 from hookline.state import _clear_state, _read_state, _write_state
 
@@ -27,8 +29,13 @@ def _clear_last_button_msg(project: str) -> None:
     _clear_state(project, "last_buttons.json")
 
 
+@lru_cache(maxsize=256)
 def _build_buttons(project: str, is_final: bool) -> dict:
-    """Build inline keyboard markup based on event context."""
+    """Build inline keyboard markup based on event context.
+
+    Memoized per (project, is_final): callers share the returned dict and
+    must treat it as read-only.
+    """
     if is_final:
         return {
             "inline_keyboard": [
@@ -1,14 +1,27 @@
 """Unified CLI dispatcher for hookline."""
 from __future__ import annotations
 
+import os
 import sys
+import time
+from collections.abc import Callable
 from datetime import datetime, timezone
 from pathlib import Path
 
+_UTC = timezone.utc
+
+_RESET_FILES = ("thread.json", "tasks.json", "debounce.json", "mute.json")
+_SENTINEL_REWRITE_WINDOW = 1.0  # seconds; repeat `on` calls inside it only touch the file
+_PARALLEL_RESET_MIN = 4  # below this many projects, threads cost more than they save
+
 
 def _now_iso() -> str:
     """Return current UTC time as ISO 8601 string."""
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    dt = datetime.now(_UTC)
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+        f"T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z"
+    )
 
 
 def _resolve_project(explicit: str | None) -> str:
@@ -31,17 +44,46 @@ def _sentinel_project(project: str) -> Path:
     return SENTINEL_DIR / f"hookline-enabled.{project}"
 
 
+def _atomic_write(path: Path, data: str) -> None:
+    """Write via a sibling temp file + os.replace so readers never see a partial file."""
+    # Dot-prefixed so the temp file never matches the hookline-enabled.* scan
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(data)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _write_sentinel(path: Path, ts: str) -> str:
+    """Write the enable timestamp, or just touch a sentinel rewritten under a second ago.
+
+    Returns the timestamp the sentinel holds afterwards.
+    """
+    try:
+        if time.time() - path.stat().st_mtime < _SENTINEL_REWRITE_WINDOW:
+            stored = path.read_text().strip()
+            if stored:
+                os.utime(path, None)
+                return stored
+    except OSError:
+        pass
+    _atomic_write(path, ts)
+    return ts
+
+
 def _do_on(project: str | None) -> None:
     """Enable notifications (global or scoped)."""
     resolved = _resolve_project(project)
     ts = _now_iso()
     if resolved == "all":
         path = _sentinel_global()
-        path.write_text(ts)
+        ts = _write_sentinel(path, ts)
         print(f"🔔 hookline ON (global) — {ts}")
     else:
         path = _sentinel_project(resolved)
-        path.write_text(ts)
+        ts = _write_sentinel(path, ts)
         print(f"🔔 hookline ON for '{resolved}' — {ts}")
 
 
@@ -64,37 +106,59 @@ def _do_off(project: str | None) -> None:
             print(f"🔕 hookline already OFF for '{resolved}'")
 
 
+def _read_sentinel_ts(path: str) -> str:
+    """Return a sentinel's timestamp ('' if unreadable); presence alone means ON."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(64).decode(errors="replace").strip()
+    except OSError:
+        return ""
+
+
 def _do_status() -> None:
     """Print enabled/disabled state for all sentinels plus daemon status."""
+    from concurrent.futures import ThreadPoolExecutor
+
     from hookline.config import SENTINEL_DIR
     from hookline.state import _is_serve_running
 
-    global_sentinel = _sentinel_global()
-    project_sentinels = sorted(SENTINEL_DIR.glob("hookline-enabled.*"))
-
-    any_active = False
-
     print("📊 hookline status")
     print("──────────────────────────────────────")
 
-    if global_sentinel.exists():
-        ts = global_sentinel.read_text().strip()
-        print(f"  🔔 global     ON  (since {ts})")
-        any_active = True
-    else:
-        print("  🔕 global     OFF")
+    # Daemon liveness (PID file read + kill(pid, 0)) overlaps the sentinel reads
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        daemon_future = pool.submit(_is_serve_running)
+        any_active = False
+
+        global_sentinel = _sentinel_global()
+        if global_sentinel.exists():
+            ts = _read_sentinel_ts(str(global_sentinel))
+            print(f"  🔔 global     ON  (since {ts})")
+            any_active = True
+        else:
+            print("  🔕 global     OFF")
+
+        try:
+            with os.scandir(SENTINEL_DIR) as it:
+                project_sentinels = sorted(
+                    (e for e in it if e.name.startswith("hookline-enabled.")),
+                    key=lambda e: e.name,
+                )
+        except OSError:
+            project_sentinels = []
 
-    for p in project_sentinels:
-        name = p.name.removeprefix("hookline-enabled.")
-        ts = p.read_text().strip()
-        print(f"  🔔 {name:10s} ON  (since {ts})")
-        any_active = True
+        for entry in project_sentinels:
+            name = entry.name.removeprefix("hookline-enabled.")
+            ts = _read_sentinel_ts(entry.path)
+            print(f"  🔔 {name:10s} ON  (since {ts})")
+            any_active = True
 
-    if not any_active:
-        print("  🔕 all notifications disabled")
+        if not any_active:
+            print("  🔕 all notifications disabled")
+
+        daemon = daemon_future.result()
 
     print()
-    daemon = _is_serve_running()
     print(f"  {'🟢' if daemon else '🔴'} daemon     {'running' if daemon else 'stopped'}")
 
     from hookline.config import RELAY_ENABLED
@@ -165,17 +229,21 @@ def _do_reset(project: str | None) -> None:
         if not STATE_DIR.exists():
             print("⚪ no state to reset")
             return
-        cleared = 0
-        for project_dir in STATE_DIR.iterdir():
-            if not project_dir.is_dir():
-                continue
-            proj = project_dir.name
-            for fname in ("thread.json", "tasks.json", "debounce.json", "mute.json"):
+        projects = [p.name for p in STATE_DIR.iterdir() if p.is_dir()]
+        jobs = [(proj, fname) for proj in projects for fname in _RESET_FILES]
+        if len(projects) < _PARALLEL_RESET_MIN:
+            for proj, fname in jobs:
                 _clear_state(proj, fname)
-            cleared += 1
-        print(f"🧹 reset state for {cleared} project(s)")
+        else:
+            # unlink releases the GIL; overlap syscalls on slow filesystems
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(32, len(jobs))) as pool:
+                futures = [pool.submit(_clear_state, proj, fname) for proj, fname in jobs]
+                for future in futures:
+                    future.result()  # re-raise worker errors as the serial path would
+        print(f"🧹 reset state for {len(projects)} project(s)")
     else:
-        for fname in ("thread.json", "tasks.json", "debounce.json", "mute.json"):
+        for fname in _RESET_FILES:
             _clear_state(resolved, fname)
         print(f"🧹 reset state for '{resolved}'")
 
@@ -362,6 +430,56 @@ _FLAG_MAP: dict[str, str] = {
     "--version": "version",
 }
 
+# Subcommand -> handler taking the effective project (ignored by most)
+_DISPATCH: dict[str, Callable[[str | None], None]] = {
+    "on": _do_on,
+    "off": _do_off,
+    "status": lambda _project: _do_status(),
+    "serve": lambda _project: _do_serve(),
+    "health": lambda _project: _do_health(),
+    "doctor": lambda _project: _do_doctor(),
+    "reset": _do_reset,
+    "remove": _do_remove,
+    "config": lambda _project: _do_config(),
+    "migrate": lambda _project: _do_migrate(),
+    "version": lambda _project: _do_version(),
+}
+
+# Subcommands and flag aliases in one interned set: a single lookup per arg
+_KNOWN: frozenset[str] = frozenset(sys.intern(s) for s in (*_SUBCOMMANDS, *_FLAG_MAP))
+
+
+def _parse_args(args: list[str]) -> tuple[str | None, str | None, str | None, bool]:
+    """Single pass over argv: (cmd, --project value, positional project, has_subcommand).
+
+    --dry-run is skipped (config.py consumes it at import time), flag aliases
+    are resolved to their subcommand, and -V maps to version.
+    """
+    cmd: str | None = None
+    project_arg: str | None = None
+    positional: str | None = None
+    has_subcommand = False
+    i = 0
+    n = len(args)
+    while i < n:
+        arg = args[i]
+        i += 1
+        if arg == "--dry-run":
+            continue
+        if arg == "--project" and i < n:
+            project_arg = args[i]
+            i += 1
+            continue
+        if arg == "--version" or arg == "-V":
+            return "version", project_arg, None, True
+        if not has_subcommand and arg in _KNOWN:
+            has_subcommand = True
+        if cmd is None:
+            cmd = _FLAG_MAP.get(arg, arg)
+        elif positional is None:
+            positional = arg
+    return cmd, project_arg, positional, has_subcommand
+
 
 def cli_main() -> None:
     """Unified CLI entry point.
@@ -369,69 +487,24 @@ def cli_main() -> None:
     Delegates to main() for hook event processing when stdin is not a tty
     and no subcommand is present. Otherwise dispatches CLI subcommands.
     """
-    args = sys.argv[1:]
-
-    # --dry-run is consumed by config.py at import time; strip it from dispatch args
-    args = [a for a in args if a != "--dry-run"]
-
-    # --version shortcut before full parse
-    if "--version" in args or "-V" in args:
-        _do_version()
-        return
+    cmd, project_arg, positional_project, has_subcommand = _parse_args(sys.argv[1:])
 
     # Detect hook-event processing mode: no CLI intent and stdin has piped data
-    has_subcommand = any(a in _SUBCOMMANDS or a in _FLAG_MAP for a in args)
-
     if not has_subcommand and not sys.stdin.isatty():
         from hookline.__main__ import main
         main()
         return
 
-    # Parse --project flag and collect remaining args
-    project_arg: str | None = None
-    clean_args: list[str] = []
-    i = 0
-    while i < len(args):
-        if args[i] == "--project" and i + 1 < len(args):
-            project_arg = args[i + 1]
-            i += 2
-        else:
-            clean_args.append(args[i])
-            i += 1
-
-    if not clean_args:
+    if cmd is None:
         _print_usage()
         return
 
-    cmd = _FLAG_MAP.get(clean_args[0], clean_args[0])
-    # Positional project after on/off/reset: `hookline on myproject`
-    positional_project: str | None = clean_args[1] if len(clean_args) > 1 else None
-    # --project flag takes precedence over positional
+    # --project flag takes precedence over positional (`hookline on myproject`)
     effective_project = project_arg or positional_project
 
-    if cmd == "on":
-        _do_on(effective_project)
-    elif cmd == "off":
-        _do_off(effective_project)
-    elif cmd == "status":
-        _do_status()
-    elif cmd == "serve":
-        _do_serve()
-    elif cmd == "health":
-        _do_health()
-    elif cmd == "doctor":
-        _do_doctor()
-    elif cmd == "reset":
-        _do_reset(effective_project)
-    elif cmd == "remove":
-        _do_remove(effective_project)
-    elif cmd == "config":
-        _do_config()
-    elif cmd == "migrate":
-        _do_migrate()
-    elif cmd == "version":
-        _do_version()
-    else:
+    handler = _DISPATCH.get(cmd)
+    if handler is None:
         print(f"❌ hookline: unknown command '{cmd}'", file=sys.stderr)
         _print_usage()
         sys.exit(1)
+    handler(effective_project)
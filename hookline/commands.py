@@ -1,21 +1,51 @@
 """Extensible command registry for Telegram reply and free-text commands."""
 from __future__ import annotations
 
+import threading
 from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Final
 
 from hookline._log import log
-from hookline.config import CHAT_ID, MEMORY_ENABLED, RELAY_ENABLED, SCHEDULE_ENABLED
+from hookline.config import (
+    CHAT_ID,
+    MEMORY_ENABLED,
+    RELAY_ENABLED,
+    REPLY_IMMEDIATE,
+    SCHEDULE_ENABLED,
+)
 from hookline.formatting import _esc, _truncate
 from hookline.project import _project_label
 from hookline.relay import (
     clear_inbox,
     is_paused,
     list_active_sessions,
-    read_inbox,
+    scan_inbox,
     set_paused,
     write_inbox,
 )
-from hookline.telegram import _telegram_api
+from hookline.telegram import _send_async, _telegram_api
+
+if TYPE_CHECKING:
+    from hookline.memory.knowledge import KnowledgeManager
+    from hookline.memory.store import MemoryStore
+
+
+# Fixed reply texts shared by the command handlers
+_MSG_NO_SESSION: Final[str] = "No active session found for this thread."
+_MSG_RELAY_OFF_HINT: Final[str] = (
+    "Relay is disabled. Set <code>relay_enabled: true</code> in hookline.json"
+)
+_MSG_RELAY_OFF: Final[str] = "Relay is disabled."
+_MSG_MEMORY_OFF: Final[str] = (
+    "Memory is disabled. Set <code>memory_enabled: true</code> in hookline.json"
+)
+_MSG_SCHEDULE_OFF: Final[str] = (
+    "Scheduler is disabled. Set <code>schedule_enabled: true</code> in hookline.json"
+)
+_MSG_USAGE_SEND: Final[str] = "Usage: <code>send &lt;message&gt;</code>"
+_MSG_USAGE_REMEMBER: Final[str] = "Usage: <code>remember &lt;text&gt;</code>"
+_MSG_USAGE_RECALL: Final[str] = "Usage: <code>recall &lt;query&gt;</code>"
+_MSG_USAGE_FORGET: Final[str] = "Usage: <code>forget &lt;id&gt;</code>"
 
 # Type for command handlers: (project, args, reply_to_msg_id) -> None
 CommandHandler = Callable[[str, str, int], None]
@@ -25,39 +55,175 @@ _registry: dict[str, CommandHandler] = {}
 
 
 def register(name: str) -> Callable[[CommandHandler], CommandHandler]:
-    """Decorator to register a command handler."""
+    """Decorator to register a command handler.
+
+    Raises ValueError if another handler already owns the name; re-registering
+    the same function (e.g. on module reload) is allowed.
+    """
     def decorator(fn: CommandHandler) -> CommandHandler:
+        existing = _registry.get(name)
+        if existing is not None and (
+            (existing.__module__, existing.__qualname__) != (fn.__module__, fn.__qualname__)
+        ):
+            raise ValueError(f"Command {name!r} is already registered")
         _registry[name] = fn
         return fn
     return decorator
 
 
 def dispatch(command: str, project: str, args: str, reply_to: int) -> bool:
-    """Dispatch a command. Returns True if handled, False otherwise."""
+    """Dispatch a command. Returns True if handled, False otherwise.
+
+    Replies issued by the handler are buffered and sent in as few
+    sendMessage calls as possible once it returns (see flush_replies).
+    """
     handler = _registry.get(command)
     if handler is None:
         return False
+    if not REPLY_IMMEDIATE:
+        _pending.items = []
+        _pending.deferred = []
+    # Catching here keeps a failing handler from reaching the poll loop.
     try:
         handler(project, args, reply_to)
     except Exception as e:
         log(f"Command '{command}' error: {e}")
-        _telegram_api("sendMessage", {
-            "chat_id": CHAT_ID,
-            "text": f"Command error: {_esc(str(e))}",
-            "parse_mode": "HTML",
-            "reply_to_message_id": reply_to,
-        })
+        _reply(f"Command error: {_esc(str(e))}", reply_to)
+    finally:
+        flush_replies()
     return True
 
 
+# Telegram rejects messages over 4096 chars; leave headroom for entities
+_REPLY_LIMIT = 4000
+
+# Per-thread buffers while a handler runs: items holds (text, reply_to,
+# parse_mode) replies, deferred holds (reply_to, compute) slow lookups
+_pending = threading.local()
+
+
 def _reply(text: str, reply_to: int, parse_mode: str = "HTML") -> None:
-    """Send a reply message."""
-    _telegram_api("sendMessage", {
+    """Send a reply message (buffered while inside dispatch)."""
+    items: list[tuple[str, int, str]] | None = getattr(_pending, "items", None)
+    if items is not None:
+        items.append((text, reply_to, parse_mode))
+        return
+    for chunk in _split_reply(text):
+        _send_reply(chunk, reply_to, parse_mode)
+
+
+def flush_replies() -> None:
+    """Send buffered replies: one message per reply target, split at the size limit.
+
+    Deferred lookups queued by the handler start after the replies are out.
+    """
+    items: list[tuple[str, int, str]] | None = getattr(_pending, "items", None)
+    deferred: list[tuple[int, Callable[[], str]]] | None = getattr(_pending, "deferred", None)
+    _pending.items = None
+    _pending.deferred = None
+    grouped: dict[tuple[int, str], list[str]] = {}
+    for text, reply_to, parse_mode in items or ():
+        grouped.setdefault((reply_to, parse_mode), []).append(text)
+    for (reply_to, parse_mode), texts in grouped.items():
+        for chunk in _pack_replies(texts):
+            _send_reply(chunk, reply_to, parse_mode)
+    for reply_to, compute in deferred or ():
+        _start_deferred(reply_to, compute)
+
+
+def _pack_replies(texts: list[str]) -> list[str]:
+    """Join texts with blank lines into as few chunks under _REPLY_LIMIT as possible."""
+    chunks: list[str] = []
+    current = ""
+    for text in texts:
+        for piece in _split_reply(text):
+            if current and len(current) + 2 + len(piece) <= _REPLY_LIMIT:
+                current = f"{current}\n\n{piece}"
+            else:
+                if current:
+                    chunks.append(current)
+                current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_reply(text: str) -> list[str]:
+    """Split an oversized reply at the last newline before _REPLY_LIMIT."""
+    pieces: list[str] = []
+    while len(text) > _REPLY_LIMIT:
+        cut = text.rfind("\n", 0, _REPLY_LIMIT)
+        if cut <= 0:
+            cut = _hard_cut(text[:_REPLY_LIMIT])
+        pieces.append(text[:cut])
+        text = text[cut:].lstrip("\n")
+    pieces.append(text)
+    return pieces
+
+
+def _hard_cut(head: str) -> int:
+    """Cut point in a newline-free head that leaves no HTML tag or entity open."""
+    cut = len(head)
+    lt = head.rfind("<")
+    if lt > head.rfind(">"):
+        cut = lt
+    amp = head.rfind("&", 0, cut)
+    if amp > head.rfind(";", 0, cut):
+        cut = amp
+    return cut if cut > 0 else len(head)
+
+
+def _send_reply(text: str, reply_to: int, parse_mode: str) -> int | None:
+    result = _telegram_api("sendMessage", {
         "chat_id": CHAT_ID,
         "text": text,
         "parse_mode": parse_mode,
         "reply_to_message_id": reply_to,
     })
+    if not result or not result.get("ok"):
+        return None
+    message_id = result.get("result", {}).get("message_id")
+    return message_id if isinstance(message_id, int) else None
+
+
+def _reply_deferred(reply_to: int, compute: Callable[[], str]) -> None:
+    """Post a placeholder and replace it with compute()'s text when done.
+
+    Inside dispatch the placeholder is queued behind the buffered replies.
+    The lookup runs on the serve send pool, keeping dispatch from blocking
+    on the memory store.
+    """
+    deferred: list[tuple[int, Callable[[], str]]] | None = getattr(_pending, "deferred", None)
+    if deferred is not None:
+        deferred.append((reply_to, compute))
+        return
+    _start_deferred(reply_to, compute)
+
+
+def _start_deferred(reply_to: int, compute: Callable[[], str]) -> None:
+    """Send the placeholder; if that fails, run compute() inline and reply normally."""
+    placeholder_id = _send_reply("🔎 Searching…", reply_to, "HTML")
+    if placeholder_id is None:
+        _reply(compute(), reply_to)
+        return
+    _send_async(_finish_deferred, placeholder_id, reply_to, compute)
+
+
+def _finish_deferred(message_id: int, reply_to: int, compute: Callable[[], str]) -> None:
+    try:
+        text = compute()
+    except Exception as e:
+        log(f"Deferred command error: {e}")
+        text = f"Command error: {_esc(str(e))}"
+    first, *overflow = _split_reply(text)
+    _telegram_api("editMessageText", {
+        "chat_id": CHAT_ID,
+        "message_id": message_id,
+        "text": first,
+        "parse_mode": "HTML",
+    })
+    for chunk in overflow:
+        _send_reply(chunk, reply_to, "HTML")
 
 
 # ── Relay Commands ────────────────────────────────────────────────────────────
@@ -67,13 +233,13 @@ def _reply(text: str, reply_to: int, parse_mode: str = "HTML") -> None:
 def _cmd_send(project: str, args: str, reply_to: int) -> None:
     """Queue a message to the active session's inbox."""
     if not RELAY_ENABLED:
-        _reply("Relay is disabled. Set <code>relay_enabled: true</code> in hookline.json", reply_to)
+        _reply(_MSG_RELAY_OFF_HINT, reply_to)
         return
     if not args.strip():
-        _reply("Usage: <code>send &lt;message&gt;</code>", reply_to)
+        _reply(_MSG_USAGE_SEND, reply_to)
         return
     if not project:
-        _reply("No active session found for this thread.", reply_to)
+        _reply(_MSG_NO_SESSION, reply_to)
         return
     msg_id = write_inbox(project, "telegram", args.strip())
     _reply(f"Queued to <b>{_esc(project)}</b> (id: <code>{msg_id}</code>)", reply_to)
@@ -83,10 +249,10 @@ def _cmd_send(project: str, args: str, reply_to: int) -> None:
 def _cmd_pause(project: str, args: str, reply_to: int) -> None:
     """Pause the active session."""
     if not RELAY_ENABLED:
-        _reply("Relay is disabled.", reply_to)
+        _reply(_MSG_RELAY_OFF, reply_to)
         return
     if not project:
-        _reply("No active session found for this thread.", reply_to)
+        _reply(_MSG_NO_SESSION, reply_to)
         return
     if is_paused(project):
         _reply(f"<b>{_esc(project)}</b> is already paused.", reply_to)
@@ -99,10 +265,10 @@ def _cmd_pause(project: str, args: str, reply_to: int) -> None:
 def _cmd_resume(project: str, args: str, reply_to: int) -> None:
     """Resume a paused session."""
     if not RELAY_ENABLED:
-        _reply("Relay is disabled.", reply_to)
+        _reply(_MSG_RELAY_OFF, reply_to)
         return
     if not project:
-        _reply("No active session found for this thread.", reply_to)
+        _reply(_MSG_NO_SESSION, reply_to)
         return
     if not is_paused(project):
         _reply(f"<b>{_esc(project)}</b> is not paused.", reply_to)
@@ -136,26 +302,29 @@ def _cmd_sessions(project: str, args: str, reply_to: int) -> None:
 def _cmd_inbox(project: str, args: str, reply_to: int) -> None:
     """Show unread inbox messages for a project."""
     if not project:
-        _reply("No active session found for this thread.", reply_to)
+        _reply(_MSG_NO_SESSION, reply_to)
         return
-    messages = read_inbox(project, unread_only=True)
-    if not messages:
+    total, messages = scan_inbox(project, unread_only=True, tail=10)
+    if not total:
         _reply(f"No unread messages for <b>{_esc(project)}</b>.", reply_to)
         return
-    lines = [f"<b>Inbox — {_esc(project)}</b> ({len(messages)} unread)", ""]
-    for msg in messages[-10:]:
-        sender = msg.get("sender", "?")
-        text = _truncate(msg.get("text", ""), 200)
-        ts = msg.get("ts", "")[:19]
-        lines.append(f"  [{sender}] {_esc(text)}  <i>{ts}</i>")
-    _reply("\n".join(lines), reply_to)
+    header = f"<b>Inbox — {_esc(project)}</b> ({total} unread)"
+    _reply(f"{header}\n\n" + "\n".join(map(_fmt_msg, messages)), reply_to)
+
+
+def _fmt_msg(msg: dict[str, Any]) -> str:
+    """One inbox/recall line: sender, truncated text, timestamp."""
+    return (
+        f"  [{_esc(msg.get('sender', '?'))}] {_esc(_truncate(msg.get('text', ''), 200))}"
+        f"  <i>{msg.get('ts', '')[:19]}</i>"
+    )
 
 
 @register("clear")
 def _cmd_clear(project: str, args: str, reply_to: int) -> None:
     """Clear all inbox messages for a project."""
     if not project:
-        _reply("No active session found for this thread.", reply_to)
+        _reply(_MSG_NO_SESSION, reply_to)
         return
     clear_inbox(project)
     _reply(f"Cleared inbox for <b>{_esc(project)}</b>.", reply_to)
@@ -165,10 +334,21 @@ def _cmd_clear(project: str, args: str, reply_to: int) -> None:
 
 
 def _memory_disabled_reply(reply_to: int) -> None:
-    _reply(
-        "Memory is disabled. Set <code>memory_enabled: true</code> in hookline.json",
-        reply_to,
-    )
+    _reply(_MSG_MEMORY_OFF, reply_to)
+
+
+_km_cache: tuple[MemoryStore, KnowledgeManager] | None = None
+
+
+def _km() -> KnowledgeManager:
+    """Return the process-wide KnowledgeManager for the current memory store."""
+    global _km_cache
+    from hookline.memory.store import get_store
+    store = get_store()
+    if _km_cache is None or _km_cache[0] is not store:
+        from hookline.memory.knowledge import KnowledgeManager
+        _km_cache = (store, KnowledgeManager(store))
+    return _km_cache[1]
 
 
 @register("remember")
@@ -178,14 +358,12 @@ def _cmd_remember(project: str, args: str, reply_to: int) -> None:
         _memory_disabled_reply(reply_to)
         return
     if not project:
-        _reply("No active session found for this thread.", reply_to)
+        _reply(_MSG_NO_SESSION, reply_to)
         return
     if not args.strip():
-        _reply("Usage: <code>remember &lt;text&gt;</code>", reply_to)
+        _reply(_MSG_USAGE_REMEMBER, reply_to)
         return
-    from hookline.memory.knowledge import KnowledgeManager
-    from hookline.memory.store import get_store
-    km = KnowledgeManager(get_store())
+    km = _km()
     kid = km.remember(project, args.strip())
     _reply(f"Stored in <b>{_esc(project)}</b> memory (id: <code>{kid}</code>)", reply_to)
 
@@ -197,25 +375,21 @@ def _cmd_recall(project: str, args: str, reply_to: int) -> None:
         _memory_disabled_reply(reply_to)
         return
     if not project:
-        _reply("No active session found for this thread.", reply_to)
+        _reply(_MSG_NO_SESSION, reply_to)
         return
     if not args.strip():
-        _reply("Usage: <code>recall &lt;query&gt;</code>", reply_to)
+        _reply(_MSG_USAGE_RECALL, reply_to)
         return
-    from hookline.memory.knowledge import KnowledgeManager
-    from hookline.memory.store import get_store
-    km = KnowledgeManager(get_store())
-    results = km.recall(project, args.strip(), limit=10)
+    query = args.strip()
+    _reply_deferred(reply_to, lambda: _format_recall(project, query))
+
+
+def _format_recall(project: str, query: str) -> str:
+    results = _km().recall(project, query, limit=10)
     if not results:
-        _reply(f"No results for <b>{_esc(args.strip())}</b> in {_esc(project)}.", reply_to)
-        return
-    lines = [f"<b>Recall — {_esc(project)}</b> ({len(results)} result(s))", ""]
-    for msg in results[:10]:
-        sender = msg.get("sender", "?")
-        text = _truncate(msg.get("text", ""), 200)
-        ts = msg.get("ts", "")[:19]
-        lines.append(f"  [{sender}] {_esc(text)}  <i>{ts}</i>")
-    _reply("\n".join(lines), reply_to)
+        return f"No results for <b>{_esc(query)}</b> in {_esc(project)}."
+    header = f"<b>Recall — {_esc(project)}</b> ({len(results)} result(s))"
+    return f"{header}\n\n" + "\n".join(map(_fmt_msg, results[:10]))
 
 
 @register("goals")
@@ -225,7 +399,7 @@ def _cmd_goals(project: str, args: str, reply_to: int) -> None:
         _memory_disabled_reply(reply_to)
         return
     if not project:
-        _reply("No active session found for this thread.", reply_to)
+        _reply(_MSG_NO_SESSION, reply_to)
         return
     from hookline.memory.store import get_store
     store = get_store()
@@ -246,12 +420,13 @@ def _cmd_context(project: str, args: str, reply_to: int) -> None:
         _memory_disabled_reply(reply_to)
         return
     if not project:
-        _reply("No active session found for this thread.", reply_to)
+        _reply(_MSG_NO_SESSION, reply_to)
         return
-    from hookline.memory.knowledge import KnowledgeManager
-    from hookline.memory.store import get_store
-    km = KnowledgeManager(get_store())
-    ctx = km.get_context(project, limit=10)
+    _reply_deferred(reply_to, lambda: _format_context(project))
+
+
+def _format_context(project: str) -> str:
+    ctx = _km().get_context(project, limit=10)
     lines = [f"<b>Context — {_esc(project)}</b>", ""]
 
     goals = ctx.get("active_goals", [])
@@ -271,9 +446,8 @@ def _cmd_context(project: str, args: str, reply_to: int) -> None:
         lines.append(f"<b>Recent</b> ({len(msgs)} messages)")
 
     if len(lines) <= 2:
-        _reply(f"No memory data for <b>{_esc(project)}</b>.", reply_to)
-        return
-    _reply("\n".join(lines), reply_to)
+        return f"No memory data for <b>{_esc(project)}</b>."
+    return "\n".join(lines)
 
 
 @register("forget")
@@ -283,19 +457,17 @@ def _cmd_forget(project: str, args: str, reply_to: int) -> None:
         _memory_disabled_reply(reply_to)
         return
     if not project:
-        _reply("No active session found for this thread.", reply_to)
+        _reply(_MSG_NO_SESSION, reply_to)
         return
     if not args.strip():
-        _reply("Usage: <code>forget &lt;id&gt;</code>", reply_to)
+        _reply(_MSG_USAGE_FORGET, reply_to)
         return
     try:
         kid = int(args.strip())
     except ValueError:
         _reply("ID must be a number.", reply_to)
         return
-    from hookline.memory.knowledge import KnowledgeManager
-    from hookline.memory.store import get_store
-    km = KnowledgeManager(get_store())
+    km = _km()
     if km.forget(project, kid):
         _reply(f"Deactivated memory entry <code>{kid}</code>.", reply_to)
     else:
@@ -306,10 +478,7 @@ def _cmd_forget(project: str, args: str, reply_to: int) -> None:
 
 
 def _schedule_disabled_reply(reply_to: int) -> None:
-    _reply(
-        "Scheduler is disabled. Set <code>schedule_enabled: true</code> in hookline.json",
-        reply_to,
-    )
+    _reply(_MSG_SCHEDULE_OFF, reply_to)
 
 
 @register("schedule")
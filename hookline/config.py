@@ -5,7 +5,8 @@ import json
 import os
 import sys
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Final
 
 # ── .env loader (stdlib, no dependencies) ────────────────────────────────────
 
@@ -27,6 +28,12 @@ def _load_dotenv() -> None:
 
 _load_dotenv()
 
+# hookline's own env vars, snapshotted once after .env is applied: the _cfg_*
+# readers look keys up in this frozen mapping rather than live os.environ.
+_ENV: MappingProxyType[str, str] = MappingProxyType({
+    k: v for k, v in os.environ.items() if k.startswith(("HOOKLINE_", "TELEGRAM_"))
+})
+
 # ── Paths ────────────────────────────────────────────────────────────────────
 
 CLAUDE_DIR = Path.home() / ".claude"
@@ -39,8 +46,8 @@ AUDIT_LOG = STATE_DIR / "audit.jsonl"
 
 # ── Credentials ──────────────────────────────────────────────────────────────
 
-BOT_TOKEN = os.environ.get("HOOKLINE_BOT_TOKEN") or os.environ.get("TELEGRAM_BOT_TOKEN", "")
-CHAT_ID = os.environ.get("HOOKLINE_CHAT_ID") or os.environ.get("TELEGRAM_CHAT_ID", "")
+BOT_TOKEN = _ENV.get("HOOKLINE_BOT_TOKEN") or _ENV.get("TELEGRAM_BOT_TOKEN", "")
+CHAT_ID = _ENV.get("HOOKLINE_CHAT_ID") or _ENV.get("TELEGRAM_CHAT_ID", "")
 
 
 def validate_credentials() -> list[str]:
@@ -70,7 +77,7 @@ def _load_config() -> dict[str, Any]:
 
 def _cfg_bool(env_key: str, config_key: str, default: bool) -> bool:
     """Read a boolean: env var ("1"/"0") → config file (true/false) → default."""
-    env = os.environ.get(env_key)
+    env = _ENV.get(env_key)
     if env is not None:
         return env == "1"
     val = _load_config().get(config_key)
@@ -81,7 +88,7 @@ def _cfg_bool(env_key: str, config_key: str, default: bool) -> bool:
 
 def _cfg_int(env_key: str, config_key: str, default: int) -> int:
     """Read an integer: env var → config file → default."""
-    env = os.environ.get(env_key)
+    env = _ENV.get(env_key)
     if env is not None:
         return int(env)
     val = _load_config().get(config_key)
@@ -92,7 +99,7 @@ def _cfg_int(env_key: str, config_key: str, default: int) -> int:
 
 def _cfg_str(env_key: str, config_key: str, default: str) -> str:
     """Read a string: env var → config file → default."""
-    env = os.environ.get(env_key)
+    env = _ENV.get(env_key)
     if env is not None:
         return env
     val = _load_config().get(config_key)
@@ -101,15 +108,15 @@ def _cfg_str(env_key: str, config_key: str, default: str) -> str:
     return default
 
 
-def _cfg_suppress(env_key: str, config_key: str) -> set[str]:
+def _cfg_suppress(env_key: str, config_key: str) -> frozenset[str]:
     """Read suppress list: env var (comma-separated) → config file (list) → empty set."""
-    env = os.environ.get(env_key)
+    env = _ENV.get(env_key)
     if env is not None:
-        return set(env.split(",")) - {""}
+        return frozenset(s for s in env.split(",") if s)
     val = _load_config().get(config_key)
     if isinstance(val, list):
-        return {str(v) for v in val if v}
-    return set()
+        return frozenset(str(v) for v in val if v)
+    return frozenset()
 
 
 # ── Preferences ──────────────────────────────────────────────────────────────
@@ -118,6 +125,7 @@ SUPPRESS = _cfg_suppress("HOOKLINE_SUPPRESS", "suppress")
 MIN_SESSION_AGE = _cfg_int("HOOKLINE_MIN_AGE", "min_session_age", 0)
 SHOW_BUTTONS = _cfg_bool("HOOKLINE_BUTTONS", "show_buttons", True)
 DEBOUNCE_WINDOW = _cfg_int("HOOKLINE_DEBOUNCE", "debounce_window", 30)
+REPLY_IMMEDIATE = _cfg_bool("HOOKLINE_REPLY_IMMEDIATE", "reply_immediate", False)
 
 # Tool approval settings
 APPROVAL_ENABLED = _cfg_bool("HOOKLINE_APPROVAL", "approval_enabled", False)
@@ -145,10 +153,10 @@ DRY_RUN = "--dry-run" in sys.argv
 
 # ── Constants ────────────────────────────────────────────────────────────────
 
-DEBOUNCE_EVENTS = {"SubagentStop", "TeammateIdle"}
-FULL_FORMAT_EVENTS = {"Stop", "TaskCompleted", "Notification"}
+DEBOUNCE_EVENTS = frozenset({"SubagentStop", "TeammateIdle"})
+FULL_FORMAT_EVENTS = frozenset({"Stop", "TaskCompleted", "Notification"})
 
-EMOJI: dict[str, str] = {
+EMOJI: Final[dict[str, str]] = {
     "Stop": "✅",
     "Notification": "⏳",
     "TeammateIdle": "💤",
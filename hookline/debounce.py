@@ -2,10 +2,9 @@
 from __future__ import annotations
 
 import time
-from datetime import datetime, timezone
 
 from hookline.config import DEBOUNCE_WINDOW, EMOJI
-from hookline.formatting import _esc
+from hookline.formatting import _esc, _hhmm_utc
 from hookline.project import _project_label
 from hookline.state import _locked_update, _read_state
 
@@ -14,20 +13,22 @@ def _debounce_accumulate(project: str, event: dict) -> None:
     """Add an event to the debounce batch."""
     event_name = event.get("hook_event_name", "Unknown")
     now = time.time()
-    now_utc = datetime.now(timezone.utc).strftime("%H:%M")
+    now_utc = _hhmm_utc(now)
 
     def updater(state: dict) -> dict:
         if not state:
             state = {"events": {}, "first_time": now, "first_utc": now_utc}
         events = state.get("events", {})
-        count = events.get(event_name, {}).get("count", 0)
-        names = set(events.get(event_name, {}).get("names", []))
+        entry = events.get(event_name)
+        if entry is None:
+            entry = events[event_name] = {"count": 0, "names": []}
+        entry["count"] = entry.get("count", 0) + 1
+        names: list[str] = entry.setdefault("names", [])
         if event_name == "TeammateIdle":
-            names.add(event.get("teammate_name", "unknown"))
-        events[event_name] = {
-            "count": count + 1,
-            "names": list(names),
-        }
+            # Few distinct teammates per batch: a list scan beats a set round-trip
+            name = event.get("teammate_name", "unknown")
+            if name not in names:
+                names.append(name)
         state["events"] = events
         state["last_time"] = now
         state["last_utc"] = now_utc
@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import re
-from datetime import datetime, timezone
+import time
+from collections.abc import Callable
 from typing import Any
 
 from hookline.config import EMOJI
@@ -14,6 +15,10 @@ from hookline.transcript import _extract_transcript_summary
 
 def _esc(text: str) -> str:
     """Escape HTML special characters."""
+    if "&" not in text and "<" not in text and ">" not in text:
+        return text
+    # Chained replace beats str.translate here: a translate table with
+    # multi-char values falls off CPython's fast path (~40x slower on long text)
     return (
         text.replace("&", "&amp;")
         .replace("<", "&lt;")
@@ -21,23 +26,40 @@ def _esc(text: str) -> str:
     )
 
 
+# (unix minute, "HH:MM") of the last formatted timestamp
+_ts_cache: tuple[int, str] = (-1, "")
+
+
+def _hhmm_utc(now: float | None = None) -> str:
+    """Current (or given) UTC time as HH:MM, formatted at most once per minute."""
+    global _ts_cache
+    minute = int(time.time() if now is None else now) // 60
+    if _ts_cache[0] != minute:
+        _ts_cache = (minute, time.strftime("%H:%M", time.gmtime(minute * 60)))
+    return _ts_cache[1]
+
+
 def _truncate(text: str, max_len: int = 200) -> str:
     """Truncate text with ellipsis."""
     text = text.replace("\n", " ").strip()
     return text[: max_len - 1] + "…" if len(text) > max_len else text
 
 
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
 def _strip_html(text: str) -> str:
     """Crude HTML tag stripper for plain text fallback."""
-    text = re.sub(r"<[^>]+>", "", text)
-    return text.replace("&amp;", "&").replace("&lt;", "<").replace("&gt;", ">")
+    text = _TAG_RE.sub("", text)
+    # &amp; last so an escaped entity like "&amp;lt;" decodes once, to "&lt;"
+    return text.replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
 
 
-def format_full(event_name: str, event: dict, project: str) -> str:
+def format_full(event_name: str, event: dict[str, Any], project: str) -> str:
     """Format a full event with box-drawing headers and blockquote body."""
     emoji = EMOJI.get(event_name, "🔔")
     label = _project_label(project)
-    ts = datetime.now(timezone.utc).strftime("%H:%M UTC")
+    ts = f"{_hhmm_utc()} UTC"
     duration = _session_duration(project)
 
     header = f"<b>┌─ {emoji} {_esc(event_name)} ─────── {_esc(label)}</b>"
@@ -51,11 +73,11 @@ def format_full(event_name: str, event: dict, project: str) -> str:
     return f"{header}\n{body}\n{footer}"
 
 
-def format_compact(event_name: str, event: dict, project: str) -> str:
+def format_compact(event_name: str, event: dict[str, Any], project: str) -> str:
     """Format a compact single-line event."""
     emoji = EMOJI.get(event_name, "🔔")
     label = _project_label(project)
-    ts = datetime.now(timezone.utc).strftime("%H:%M UTC")
+    ts = f"{_hhmm_utc()} UTC"
 
     if event_name == "TeammateIdle":
         name = event.get("teammate_name", "unknown")
@@ -64,55 +86,67 @@ def format_compact(event_name: str, event: dict, project: str) -> str:
     return f"{emoji} {_esc(event_name)} · {_esc(label)} · <i>{ts}</i>"
 
 
-def _format_body(event_name: str, event: dict, project: str) -> str:
+def _body_stop(event: dict[str, Any], project: str) -> str:
+    summary = _extract_transcript_summary(event)
+    stop_active = event.get("stop_hook_active", False)
+    lines: list[str] = []
+
+    msgs = summary.get("messages", [])
+    if msgs:
+        lines.append(_esc(_truncate(msgs[0], 250)))
+        for extra in msgs[1:]:
+            lines.append(f"<i>{_esc(_truncate(extra, 150))}</i>")
+
+    tool_sum = summary.get("tool_summary", "")
+    if tool_sum:
+        lines.append(f"🔧 {_esc(tool_sum)}")
+
+    errs = summary.get("errors", [])
+    if errs:
+        for err in errs:
+            lines.append(f"❗ {_esc(_truncate(err, 150))}")
+
+    if stop_active:
+        lines.append("⚠️ Stop hook was already active")
+    if not lines:
+        lines.append("Run complete.")
+    return "<blockquote>" + "\n".join(lines) + "</blockquote>"
+
+
+def _body_notification(event: dict[str, Any], project: str) -> str:
+    msg = event.get("message", "Needs your attention")
+    return f"<blockquote>💬 {_esc(msg)}</blockquote>"
+
+
+def _body_task_completed(event: dict[str, Any], project: str) -> str:
+    completed, total = _track_task(project, event)
+    desc = event.get("task_description", "")
+    task_id = event.get("task_id", "")
+
+    if total and total > 1:
+        progress = f"Task {completed}/{total}"
+    elif task_id:
+        progress = f"Task {_esc(str(task_id))}"
+    else:
+        progress = "Task completed"
+
+    body_lines = [f"<b>{progress}</b>"]
+    if desc:
+        body_lines.append(_esc(_truncate(desc, 180)))
+    return "<blockquote>" + "\n".join(body_lines) + "</blockquote>"
+
+
+# event_name -> body formatter: one dict lookup instead of a match cascade
+_BODY_HANDLERS: dict[str, Callable[[dict[str, Any], str], str]] = {
+    "Stop": _body_stop,
+    "Notification": _body_notification,
+    "TaskCompleted": _body_task_completed,
+}
+
+
+def _format_body(event_name: str, event: dict[str, Any], project: str) -> str:
     """Format the body section with blockquote."""
-    match event_name:
-        case "Stop":
-            summary = _extract_transcript_summary(event)
-            stop_active = event.get("stop_hook_active", False)
-            lines: list[str] = []
-
-            msgs = summary.get("messages", [])
-            if msgs:
-                lines.append(_esc(_truncate(msgs[0], 250)))
-                for extra in msgs[1:]:
-                    lines.append(f"<i>{_esc(_truncate(extra, 150))}</i>")
-
-            tool_sum = summary.get("tool_summary", "")
-            if tool_sum:
-                lines.append(f"🔧 {_esc(tool_sum)}")
-
-            errs = summary.get("errors", [])
-            if errs:
-                for err in errs:
-                    lines.append(f"❗ {_esc(_truncate(err, 150))}")
-
-            if stop_active:
-                lines.append("⚠️ Stop hook was already active")
-            if not lines:
-                lines.append("Run complete.")
-            return "<blockquote>" + "\n".join(lines) + "</blockquote>"
-
-        case "Notification":
-            msg = event.get("message", "Needs your attention")
-            return f"<blockquote>💬 {_esc(msg)}</blockquote>"
-
-        case "TaskCompleted":
-            completed, total = _track_task(project, event)
-            desc = event.get("task_description", "")
-            task_id = event.get("task_id", "")
-
-            if total and total > 1:
-                progress = f"Task {completed}/{total}"
-            elif task_id:
-                progress = f"Task {_esc(str(task_id))}"
-            else:
-                progress = "Task completed"
-
-            body_lines = [f"<b>{progress}</b>"]
-            if desc:
-                body_lines.append(_esc(_truncate(desc, 180)))
-            return "<blockquote>" + "\n".join(body_lines) + "</blockquote>"
-
-        case _:
-            return f"<blockquote>{_esc(event_name)}</blockquote>"
+    handler = _BODY_HANDLERS.get(event_name)
+    if handler is None:
+        return f"<blockquote>{_esc(event_name)}</blockquote>"
+    return handler(event, project)
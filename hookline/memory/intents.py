@@ -3,19 +3,47 @@ from __future__ import annotations
 
 import re
 
-# Pattern matches [REMEMBER], [GOAL], [DONE] with optional content after colon
+# Pattern matches [REMEMBER], [GOAL], [DONE] with optional content after colon.
+# Each tag has its own named group, so the intent is read off whichever matched
+# instead of upper-casing the tag and mapping it.
 _INTENT_PATTERN = re.compile(
-    r"\[(REMEMBER|GOAL|DONE)(?:\s*:\s*([^\]]*))?\]",
+    r"\[(?:(?P<remember>REMEMBER)|(?P<goal>GOAL)|(?P<done>DONE))"
+    r"(?:\s*:\s*(?P<content>[^\]]*))?\]",
     re.IGNORECASE,
 )
 
 _HASHTAG_PATTERN = re.compile(r"#(\w{2,})")
 
-_INTENT_MAP: dict[str, str] = {
-    "REMEMBER": "remember",
-    "GOAL": "goal",
-    "DONE": "done",
-}
+# Both of the above as one alternation, so parse_message scans text once
+_COMBINED_PATTERN = re.compile(
+    r"\[(?:(?P<remember>REMEMBER)|(?P<goal>GOAL)|(?P<done>DONE))"
+    r"(?:\s*:\s*(?P<content>[^\]]*))?\]|#(?P<hash>\w{2,})",
+    re.IGNORECASE,
+)
+
+
+def _intent_of(match: re.Match[str]) -> str:
+    """Name of the tag group that matched ("" for a hashtag match)."""
+    if match.group("remember") is not None:
+        return "remember"
+    if match.group("goal") is not None:
+        return "goal"
+    if match.group("done") is not None:
+        return "done"
+    return ""
+
+
+def _cut(text: str, start: int, end: int) -> str:
+    """text with [start:end) removed, stripped.
+
+    A tag that leads or ends the message (the usual case) needs a single
+    slice; only a tag in the middle pays for concatenating both sides.
+    """
+    if start == 0:
+        return text[end:].strip()
+    if end == len(text):
+        return text[:start].strip()
+    return (text[:start] + text[end:]).strip()
 
 
 def parse_intent(text: str) -> tuple[str, str, str]:
@@ -30,11 +58,9 @@ def parse_intent(text: str) -> tuple[str, str, str]:
     if not match:
         return "", "", text
 
-    tag_name = match.group(1).upper()
-    tag_content = (match.group(2) or "").strip()
-    intent = _INTENT_MAP.get(tag_name, "")
-    clean_text = text[:match.start()] + text[match.end():]
-    clean_text = clean_text.strip()
+    intent = _intent_of(match)
+    tag_content = (match.group("content") or "").strip()
+    clean_text = _cut(text, match.start(), match.end())
 
     return intent, tag_content, clean_text
 
@@ -42,3 +68,31 @@ def parse_intent(text: str) -> tuple[str, str, str]:
 def extract_tags(text: str) -> list[str]:
     """Extract all #hashtags from text."""
     return _HASHTAG_PATTERN.findall(text)
+
+
+def parse_message(text: str) -> tuple[str, str, str, list[str]]:
+    """parse_intent and extract_tags in a single regex pass.
+
+    Returns (intent, tag_content, clean_text, tags) with the same values
+    the two separate calls would produce.
+    """
+    first: re.Match[str] | None = None
+    tags: list[str] = []
+    for match in _COMBINED_PATTERN.finditer(text):
+        hashtag = match.group("hash")
+        if hashtag is not None:
+            tags.append(hashtag)
+            continue
+        content = match.group("content")
+        if content and "#" in content:
+            # Hashtags inside a tag's brackets still count as tags
+            tags.extend(_HASHTAG_PATTERN.findall(content))
+        if first is None:
+            first = match
+
+    if first is None:
+        return "", "", text, tags
+    intent = _intent_of(first)
+    tag_content = (first.group("content") or "").strip()
+    clean_text = _cut(text, first.start(), first.end())
+    return intent, tag_content, clean_text, tags
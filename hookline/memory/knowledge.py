@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from hookline.memory.intents import extract_tags, parse_intent
+from hookline.memory.intents import parse_message
 from hookline.memory.store import MemoryStore
 
 
@@ -23,8 +23,7 @@ class KnowledgeManager:
 
         Returns a dict describing the action taken, or None for plain messages.
         """
-        intent, tag_content, clean_text = parse_intent(text)
-        tags = extract_tags(text)
+        intent, tag_content, clean_text, tags = parse_message(text)
 
         msg_id = self._store.log_message(
             project=project,
@@ -45,12 +44,10 @@ class KnowledgeManager:
 
         if intent == "done":
             done_text = tag_content or clean_text
-            goals = self._store.get_knowledge(project, category="goal", active_only=True)
-            deactivated: list[int] = []
-            for goal in goals:
-                if done_text.lower() in goal["text"].lower():
-                    self._store.deactivate_knowledge(goal["id"])
-                    deactivated.append(goal["id"])
+            goals = self._store.find_active_goals_containing(project, done_text)
+            deactivated = [goal["id"] for goal in goals]
+            if deactivated:
+                self._store.deactivate_knowledge_many(deactivated)
             return {"action": "done", "deactivated": deactivated, "query": done_text, "tags": tags}
 
         return None
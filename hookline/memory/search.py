@@ -1,9 +1,11 @@
 """Pure-Python TF-IDF text similarity search."""
 from __future__ import annotations
 
+import heapq
 import math
 import re
 from collections import Counter
+from itertools import filterfalse
 
 STOPWORDS: frozenset[str] = frozenset({
     "a", "an", "the", "is", "are", "was", "were", "be", "been", "being",
@@ -22,22 +24,32 @@ STOPWORDS: frozenset[str] = frozenset({
     "while", "who", "whom", "why", "with", "you", "your",
 })
 
-_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+# {2,} drops single-character tokens inside the regex engine
+_WORD_PATTERN = re.compile(r"[a-z0-9]{2,}")
+_is_stopword = STOPWORDS.__contains__
 
 
 def tokenize(text: str) -> list[str]:
     """Lowercase, split on non-alphanumeric, remove stopwords and short tokens."""
-    words = _WORD_PATTERN.findall(text.lower())
-    return [w for w in words if len(w) >= 2 and w not in STOPWORDS]
+    return list(filterfalse(_is_stopword, _WORD_PATTERN.findall(text.lower())))
 
 
 class TfIdfSearcher:
-    """In-memory TF-IDF document index with cosine similarity search."""
+    """In-memory TF-IDF document index with cosine similarity search.
+
+    IDFs and an inverted index of L2-normalized document weights
+    (term -> postings) are rebuilt lazily on the first search after the
+    corpus changes, so a query only touches documents sharing a term with it.
+    """
 
     def __init__(self) -> None:
         self._docs: dict[int, Counter[str]] = {}
         self._doc_lengths: dict[int, int] = {}
         self._df: Counter[str] = Counter()
+        self._idf: dict[str, float] = {}
+        self._postings: dict[str, list[tuple[int, float]]] = {}
+        self._doc_pos: dict[int, int] = {}
+        self._dirty = False
 
     def add_document(self, doc_id: int, text: str) -> None:
         """Tokenize and index a document."""
@@ -47,63 +59,76 @@ class TfIdfSearcher:
         tf = Counter(tokens)
         self._docs[doc_id] = tf
         self._doc_lengths[doc_id] = len(tokens)
-        for term in tf:
-            self._df[term] += 1
+        self._df.update(tf.keys())
+        self._dirty = True
+
+    def _rebuild(self) -> None:
+        """Recompute IDFs and the L2-normalized TF-IDF postings of every document."""
+        n = len(self._docs)
+        # IDF depends only on df, which takes few distinct values: one log per value
+        idf_by_df = {df: math.log(n / (1 + df)) for df in set(self._df.values())}
+        idf = {term: idf_by_df[df] for term, df in self._df.items()}
+        postings: dict[str, list[tuple[int, float]]] = {}
+        for doc_id, doc_tf in self._docs.items():
+            doc_len = self._doc_lengths[doc_id]
+            weights = [(term, count / doc_len * idf[term]) for term, count in doc_tf.items()]
+            mag = math.sqrt(sum(w * w for _, w in weights))
+            if mag <= 0:
+                continue
+            for term, w in weights:
+                postings.setdefault(term, []).append((doc_id, w / mag))
+        self._idf = idf
+        self._postings = postings
+        self._doc_pos = {doc_id: pos for pos, doc_id in enumerate(self._docs)}
+        self._dirty = False
 
     def search(self, query: str, top_k: int = 10) -> list[tuple[int, float]]:
         """Search for documents similar to query. Returns (doc_id, score) pairs."""
         tokens = tokenize(query)
         if not tokens or not self._docs:
             return []
+        if self._dirty:
+            self._rebuild()
 
-        n = len(self._docs)
         query_tf = Counter(tokens)
         query_len = len(tokens)
 
         # Build query TF-IDF vector
         query_vec: dict[str, float] = {}
         for term, count in query_tf.items():
-            df = self._df.get(term, 0)
-            if df == 0:
+            idf = self._idf.get(term)
+            if idf is None:
                 continue
-            tf = count / query_len
-            idf = math.log(n / (1 + df))
-            query_vec[term] = tf * idf
+            query_vec[term] = count / query_len * idf
 
         if not query_vec:
             return []
 
-        # Score each document by cosine similarity
+        # Rows are unit length, so cosine is the dot product over the query
+        # terms' postings divided by the query magnitude alone
         query_mag = math.sqrt(sum(v * v for v in query_vec.values()))
-        scores: list[tuple[int, float]] = []
-
-        for doc_id, doc_tf in self._docs.items():
-            doc_len = self._doc_lengths[doc_id]
-            dot_product = 0.0
-            doc_mag_sq = 0.0
-
-            for term, count in doc_tf.items():
-                df = self._df.get(term, 0)
-                tf = count / doc_len
-                idf = math.log(n / (1 + df))
-                tfidf = tf * idf
-                doc_mag_sq += tfidf * tfidf
-
-                if term in query_vec:
-                    dot_product += query_vec[term] * tfidf
-
-            if dot_product <= 0 or doc_mag_sq <= 0:
-                continue
-
-            doc_mag = math.sqrt(doc_mag_sq)
-            similarity = dot_product / (query_mag * doc_mag)
-            scores.append((doc_id, similarity))
-
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[:top_k]
+        # Plain dict with a bound get beats defaultdict's += in this hot loop
+        dots: dict[int, float] = {}
+        dots_get = dots.get
+        postings = self._postings
+        for term, q_weight in query_vec.items():
+            for doc_id, weight in postings.get(term, ()):
+                dots[doc_id] = dots_get(doc_id, 0.0) + q_weight * weight
+
+        # Partial top-k selection; ties keep insertion order like a full scan
+        doc_pos = self._doc_pos
+        best = heapq.nsmallest(
+            top_k,
+            ((-dot, doc_pos[doc_id], doc_id) for doc_id, dot in dots.items() if dot > 0),
+        )
+        return [(doc_id, -neg / query_mag) for neg, _, doc_id in best]
 
     def clear(self) -> None:
         """Remove all indexed documents."""
         self._docs.clear()
         self._doc_lengths.clear()
         self._df.clear()
+        self._idf = {}
+        self._postings = {}
+        self._doc_pos = {}
+        self._dirty = False
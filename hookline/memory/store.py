@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
+from collections.abc import Iterable, Sequence
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -24,22 +26,82 @@ CREATE TABLE IF NOT EXISTS knowledge (
     ts TEXT NOT NULL,
     active INTEGER DEFAULT 1
 );
-CREATE INDEX IF NOT EXISTS idx_messages_project ON messages(project);
-CREATE INDEX IF NOT EXISTS idx_knowledge_project ON knowledge(project);
+-- Composite indexes end in id so "WHERE ... ORDER BY id DESC LIMIT n" walks
+-- the index backwards instead of sorting; they supersede the project-only ones.
+DROP INDEX IF EXISTS idx_messages_project;
+DROP INDEX IF EXISTS idx_knowledge_project;
+CREATE INDEX IF NOT EXISTS idx_messages_project_id ON messages(project, id);
+CREATE INDEX IF NOT EXISTS idx_messages_project_sender_id ON messages(project, sender, id);
 CREATE INDEX IF NOT EXISTS idx_knowledge_active ON knowledge(project, active);
+CREATE INDEX IF NOT EXISTS idx_knowledge_pca ON knowledge(project, category, active, id);
+"""
+
+# Full-text index over messages.text, kept in sync by triggers. Applied only
+# when the SQLite build ships FTS5; search_messages falls back to LIKE otherwise.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE messages_fts USING fts5(
+    text, content='messages', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF text ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
+END;
+INSERT INTO messages_fts(messages_fts) VALUES ('rebuild');
 """
 
 
 class MemoryStore:
-    """SQLite-backed store for messages and knowledge entries."""
+    """SQLite-backed store for messages and knowledge entries.
+
+    The connection is shared by the serve loop and its worker threads, so
+    every use of it, transactions included, holds self._lock.
+    """
 
     def __init__(self, db_path: str | Path) -> None:
         self._db_path = str(db_path)
+        self._lock = threading.RLock()
         self._conn: sqlite3.Connection = sqlite3.connect(
             self._db_path, check_same_thread=False,
         )
-        self._conn.row_factory = sqlite3.Row
+        # WAL lets the serve daemon read while a hook process writes; with WAL,
+        # synchronous=NORMAL fsyncs at checkpoints rather than on every commit
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
         self._conn.executescript(_SCHEMA)
+        self._fts = self._ensure_fts()
+        # Refreshes planner statistics only when they are stale (unlike ANALYZE)
+        self._conn.execute("PRAGMA optimize")
+
+    def _ensure_fts(self) -> bool:
+        """Create (and backfill) the FTS5 index once. Returns False without FTS5."""
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'",
+        ).fetchone()
+        if exists:
+            return True
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            return False
+        return True
+
+    def _query(self, sql: str, params: Sequence[Any]) -> list[dict[str, Any]]:
+        """Run a SELECT and return its rows as dicts.
+
+        Rows come back as plain tuples and are zipped with the column names
+        once, rather than building an sqlite3.Row and then copying it to a dict.
+        """
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            names = [col[0] for col in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
 
     def __enter__(self) -> MemoryStore:
         return self
@@ -48,7 +110,8 @@ class MemoryStore:
         self.close()
 
     def close(self) -> None:
-        self._conn.close()
+        with self._lock:
+            self._conn.close()
 
     def log_message(
         self,
@@ -61,11 +124,12 @@ class MemoryStore:
         """Insert a message and return its row ID."""
         if ts is None:
             ts = datetime.now(timezone.utc).isoformat()
-        cursor = self._conn.execute(
-            "INSERT INTO messages (project, sender, text, ts, intent) VALUES (?, ?, ?, ?, ?)",
-            (project, sender, text, ts, intent),
-        )
-        self._conn.commit()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO messages (project, sender, text, ts, intent) VALUES (?, ?, ?, ?, ?)",
+                (project, sender, text, ts, intent),
+            )
+            self._conn.commit()
         return cursor.lastrowid  # type: ignore[return-value]
 
     def get_messages(
@@ -76,16 +140,14 @@ class MemoryStore:
     ) -> list[dict[str, Any]]:
         """Retrieve messages for a project, newest first."""
         if sender:
-            rows = self._conn.execute(
+            return self._query(
                 "SELECT * FROM messages WHERE project = ? AND sender = ? ORDER BY id DESC LIMIT ?",
                 (project, sender, limit),
-            ).fetchall()
-        else:
-            rows = self._conn.execute(
-                "SELECT * FROM messages WHERE project = ? ORDER BY id DESC LIMIT ?",
-                (project, limit),
-            ).fetchall()
-        return [dict(row) for row in rows]
+            )
+        return self._query(
+            "SELECT * FROM messages WHERE project = ? ORDER BY id DESC LIMIT ?",
+            (project, limit),
+        )
 
     def log_knowledge(
         self,
@@ -96,11 +158,13 @@ class MemoryStore:
     ) -> int:
         """Insert a knowledge entry and return its row ID."""
         ts = datetime.now(timezone.utc).isoformat()
-        cursor = self._conn.execute(
-            "INSERT INTO knowledge (project, category, text, source_id, ts) VALUES (?, ?, ?, ?, ?)",
-            (project, category, text, source_id, ts),
-        )
-        self._conn.commit()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO knowledge (project, category, text, source_id, ts)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (project, category, text, source_id, ts),
+            )
+            self._conn.commit()
         return cursor.lastrowid  # type: ignore[return-value]
 
     def get_knowledge(
@@ -118,55 +182,102 @@ class MemoryStore:
         if active_only:
             conditions.append("active = 1")
         where = " AND ".join(conditions)
-        rows = self._conn.execute(
+        return self._query(
             f"SELECT * FROM knowledge WHERE {where} ORDER BY id DESC",
             params,
-        ).fetchall()
-        return [dict(row) for row in rows]
+        )
 
     def deactivate_knowledge(self, knowledge_id: int) -> bool:
         """Mark a knowledge entry as inactive. Returns True if a row was updated."""
-        cursor = self._conn.execute(
-            "UPDATE knowledge SET active = 0 WHERE id = ? AND active = 1",
-            (knowledge_id,),
-        )
-        self._conn.commit()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE knowledge SET active = 0 WHERE id = ? AND active = 1",
+                (knowledge_id,),
+            )
+            self._conn.commit()
         return cursor.rowcount > 0
 
+    def deactivate_knowledge_many(self, knowledge_ids: Iterable[int]) -> int:
+        """Mark several knowledge entries inactive in one transaction.
+
+        Returns the number of rows updated.
+        """
+        params = [(kid,) for kid in knowledge_ids]
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "UPDATE knowledge SET active = 0 WHERE id = ? AND active = 1", params,
+            )
+        return cursor.rowcount
+
+    def find_active_goals_containing(self, project: str, needle: str) -> list[dict[str, Any]]:
+        """Active goals whose text contains needle, case-insensitively, newest first."""
+        if not needle.isascii():
+            # SQLite's lower() only folds ASCII; match non-ASCII needles in Python
+            folded = needle.lower()
+            return [
+                goal for goal in self.get_knowledge(project, category="goal", active_only=True)
+                if folded in goal["text"].lower()
+            ]
+        return self._query(
+            "SELECT * FROM knowledge WHERE project = ? AND category = 'goal' AND active = 1"
+            " AND instr(lower(text), lower(?)) > 0 ORDER BY id DESC",
+            (project, needle),
+        )
+
     def search_messages(
         self,
         project: str,
         query: str,
         limit: int = 10,
     ) -> list[dict[str, Any]]:
-        """Search messages by text (SQL LIKE)."""
+        """Search messages by text, best BM25 match first (SQL LIKE without FTS5).
+
+        Every whitespace-separated word of the query must match, as a word
+        prefix after stemming.
+        """
+        match = _fts_query(query) if self._fts else ""
+        if match:
+            return self._query(
+                "SELECT m.* FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid"
+                " WHERE messages_fts MATCH ? AND m.project = ?"
+                " ORDER BY bm25(messages_fts), m.id DESC LIMIT ?",
+                (match, project, limit),
+            )
         pattern = f"%{query}%"
-        rows = self._conn.execute(
+        return self._query(
             "SELECT * FROM messages WHERE project = ? AND text LIKE ? ORDER BY id DESC LIMIT ?",
             (project, pattern, limit),
-        ).fetchall()
-        return [dict(row) for row in rows]
+        )
 
     def get_stats(self, project: str) -> dict[str, int]:
         """Return message and knowledge counts for a project."""
-        msg_count = self._conn.execute(
-            "SELECT COUNT(*) FROM messages WHERE project = ?", (project,),
-        ).fetchone()[0]
-        know_count = self._conn.execute(
-            "SELECT COUNT(*) FROM knowledge WHERE project = ? AND active = 1", (project,),
-        ).fetchone()[0]
+        with self._lock:
+            msg_count = self._conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE project = ?", (project,),
+            ).fetchone()[0]
+            know_count = self._conn.execute(
+                "SELECT COUNT(*) FROM knowledge WHERE project = ? AND active = 1", (project,),
+            ).fetchone()[0]
         return {"messages": msg_count, "knowledge": know_count}
 
 
+def _fts_query(query: str) -> str:
+    """Quote each word of a user query as an FTS5 prefix phrase ("" if none)."""
+    words = [w.replace('"', '""') for w in query.split() if any(c.isalnum() for c in w)]
+    return " ".join(f'"{w}"*' for w in words)
+
+
 _store_instance: MemoryStore | None = None
+_store_lock = threading.Lock()
 
 
 def get_store() -> MemoryStore:
     """Get or create the singleton MemoryStore using configured path."""
     global _store_instance
-    if _store_instance is None:
-        from hookline.config import MEMORY_DB_PATH, STATE_DIR
-        db_path = MEMORY_DB_PATH if MEMORY_DB_PATH else str(STATE_DIR / "memory.db")
-        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-        _store_instance = MemoryStore(db_path)
-    return _store_instance
+    with _store_lock:
+        if _store_instance is None:
+            from hookline.config import MEMORY_DB_PATH, STATE_DIR
+            db_path = MEMORY_DB_PATH if MEMORY_DB_PATH else str(STATE_DIR / "memory.db")
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            _store_instance = MemoryStore(db_path)
+        return _store_instance
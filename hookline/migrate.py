@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import json
+import os
 import shutil
 from pathlib import Path
 from typing import Any
@@ -31,11 +32,37 @@ def _migrate_dir(old: Path, new: Path) -> bool:
     if new.exists():
         print(f"  skip  {new.name}  (already exists)")
         return False
-    shutil.copytree(old, new)
+    shutil.copytree(old, new, copy_function=_clone_file)
     print(f"  copy  {old.name} -> {new.name}")
     return True
 
 
+def _clone_file(src: str, dst: str) -> str:
+    """copy2 via copy_file_range where available.
+
+    The kernel can satisfy copy_file_range with a reflink (btrfs, XFS) or an
+    in-kernel copy, so file data never passes through userspace. Hardlinks
+    are avoided on purpose: memory.db is updated in place and would change
+    the old tree too.
+    """
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is None:
+        return shutil.copy2(src, dst)
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = copy_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except OSError:
+        # Unsupported on this filesystem pair (EXDEV, EINVAL, ...): plain copy
+        return shutil.copy2(src, dst)
+    shutil.copystat(src, dst)
+    return dst
+
+
 def _migrate_file(old: Path, new: Path) -> bool:
     """Copy file from old to new. Returns True if action was taken."""
     if not old.exists():
@@ -68,14 +95,18 @@ def _migrate_settings() -> bool:
     if not _SETTINGS.exists():
         return False
 
-    raw = _SETTINGS.read_text(encoding="utf-8")
+    data = _SETTINGS.read_bytes()
     old_cmd = "python3 -m notify"
     new_cmd = "python3 -m hookline"
 
-    if old_cmd not in raw:
+    # Common no-op path: probe the raw bytes, skipping the UTF-8 decode
+    if old_cmd.encode() not in data:
         return False
 
-    updated = raw.replace(old_cmd, new_cmd)
+    # One scan yields both the substituted text and the occurrence count
+    parts = data.decode("utf-8").split(old_cmd)
+    count = len(parts) - 1
+    updated = new_cmd.join(parts)
 
     # Validate JSON is still well-formed before writing
     try:
@@ -85,7 +116,6 @@ def _migrate_settings() -> bool:
         return False
 
     _SETTINGS.write_text(updated, encoding="utf-8")
-    count = raw.count(old_cmd)
     print(f"  update  settings.json  ({count} hook command{'s' if count != 1 else ''} updated)")
     return True
 
@@ -1,7 +1,7 @@
 """Proactive feature handlers: briefing, digest, check-in."""
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import os
 
 from hookline._log import log
 from hookline.config import (
@@ -13,7 +13,8 @@ from hookline.config import (
     RELAY_ENABLED,
     SCHEDULE_ENABLED,
 )
-from hookline.formatting import _esc, _truncate
+from hookline.formatting import _esc, _hhmm_utc, _truncate
+from hookline.relay import list_active_sessions
 from hookline.telegram import _telegram_api
 
 
@@ -36,6 +37,10 @@ def setup_proactive() -> None:
     if CHECKIN_INTERVAL and CHECKIN_INTERVAL > 0:
         register_task("checkin", send_checkin, interval_minutes=CHECKIN_INTERVAL)
 
+    if RELAY_ENABLED:
+        from hookline.relay import compact_inboxes
+        register_task("inbox-compact", compact_inboxes, interval_minutes=60)
+
 
 def send_briefing() -> None:
     """Send a morning briefing with goals, active sessions, and pending items."""
@@ -43,7 +48,6 @@ def send_briefing() -> None:
 
     # Active sessions
     if RELAY_ENABLED:
-        from hookline.relay import list_active_sessions
         sessions = list_active_sessions()
         if sessions:
             lines.append(f"<b>Sessions</b> ({len(sessions)} active):")
@@ -88,7 +92,6 @@ def send_digest() -> None:
 
     # Session summary
     if RELAY_ENABLED:
-        from hookline.relay import list_active_sessions
         sessions = list_active_sessions()
         if sessions:
             lines.append(f"<b>Sessions</b>: {len(sessions)} active")
@@ -136,7 +139,6 @@ def send_checkin() -> None:
     if not RELAY_ENABLED:
         return
 
-    from hookline.relay import list_active_sessions
     sessions = list_active_sessions()
     if not sessions:
         return
@@ -182,7 +184,7 @@ def send_checkin() -> None:
 
 def _now_label() -> str:
     """Return a short UTC time label for message headers."""
-    return datetime.now(timezone.utc).strftime("%H:%M UTC")
+    return f"{_hhmm_utc()} UTC"
 
 
 def _append_pending_approvals(lines: list[str]) -> None:
@@ -193,18 +195,20 @@ def _append_pending_approvals(lines: list[str]) -> None:
         return
 
     try:
-        approvals_dir = STATE_DIR
+        # DirEntry.is_dir() uses the d_type from the directory read: one
+        # stat per project (the approval.json probe) instead of three
         count = 0
-        if approvals_dir.exists():
-            for project_dir in approvals_dir.iterdir():
-                if not project_dir.is_dir():
-                    continue
-                approval_file = project_dir / "approval.json"
-                if approval_file.exists():
+        with os.scandir(STATE_DIR) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False) and os.path.exists(
+                    os.path.join(entry.path, "approval.json"),
+                ):
                     count += 1
         if count:
             lines.append("")
             lines.append(f"<b>Pending Approvals</b>: {count}")
+    except FileNotFoundError:
+        return
     except Exception as e:
         log(f"Approval check error: {e}")
 
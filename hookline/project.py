@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import json
-from pathlib import Path
+from functools import lru_cache
 
 from hookline.config import PROJECT_CONFIG_PATH
 
@@ -25,8 +25,16 @@ def _project_emoji(project: str) -> str:
     return _get_project_config().get(project, "")
 
 
+def _reload_project_config() -> None:
+    """Forget the loaded project config and every label derived from it."""
+    global _project_config
+    _project_config = None
+    _project_label.cache_clear()
+
+
+@lru_cache(maxsize=256)
 def _project_label(project: str) -> str:
-    """Format project name with optional emoji."""
+    """Format project name with optional emoji (memoized; see _reload_project_config)."""
     emoji = _project_emoji(project)
     if emoji:
         return f"{emoji} {project}"
@@ -2,32 +2,100 @@
 from __future__ import annotations
 
 import fcntl
-import json
-import uuid
+import os
+import re
+import secrets
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import IO, BinaryIO
 
+from hookline import _json
 from hookline._log import log
 from hookline.config import STATE_DIR
 
+# write_inbox emits entries with "id" first and "read" last, so an unread entry
+# always ends in `"read":false}` (`"read": false}` in files written before the
+# switch to compact JSON). compact_inbox flips that literal in place to the
+# same-width `"read":true }` instead of rewriting the file.
+_UNREAD = re.compile(rb'"read": ?false')
+_UNREAD_LINE = re.compile(rb'^\{"id": ?"([^"]*)",.*"read": ?(false)\}$', re.MULTILINE)
+# Line endings of an entry already flagged read (written read, flipped by
+# compact_inbox, or legacy spaced JSON): unread-only scans skip these unparsed.
+_READ_TAILS = (b'"read":true }', b'"read":true}', b'"read": true}')
+
+
+# Parsed scan_inbox results per inbox path, valid while the inbox and its
+# tombstone file keep the stat stamp they had when parsed:
+# path -> (stamp, {(unread_only, tail): (count, messages)})
+_inbox_cache: dict[
+    Path, tuple[tuple[int, ...], dict[tuple[bool, int | None], tuple[int, list[dict]]]]
+] = {}
+
+
+# Project dirs this process has already created, so the path helpers skip the
+# mkdir syscall after the first call. A dir removed behind our back (hookline
+# remove) is recreated by _open_creating when a write hits FileNotFoundError.
+_dirs_created: set[Path] = set()
+
+
+def _ensure_dir(d: Path) -> Path:
+    """mkdir -p once per process."""
+    if d not in _dirs_created:
+        d.mkdir(parents=True, exist_ok=True)
+        _dirs_created.add(d)
+    return d
+
+
+def _open_creating(path: Path, mode: str) -> IO[bytes]:
+    """Open path for writing, recreating its project dir if it has vanished."""
+    try:
+        return path.open(mode)
+    except FileNotFoundError:
+        _dirs_created.discard(path.parent)
+        _ensure_dir(path.parent)
+        return path.open(mode)
+
 
 def _inbox_path(project: str) -> Path:
     """Get the inbox JSONL path for a project."""
-    d = STATE_DIR / (project or "_global")
-    d.mkdir(parents=True, exist_ok=True)
-    return d / "inbox.jsonl"
+    return _ensure_dir(STATE_DIR / (project or "_global")) / "inbox.jsonl"
+
+
+def _read_ids_path(project: str) -> Path:
+    """Get the read-tombstone path for a project (one message ID per line)."""
+    return _inbox_path(project).with_name("inbox.read")
+
+
+def _read_ids(inbox: Path) -> frozenset[str]:
+    """IDs marked read since the inbox at this path was last compacted."""
+    try:
+        return frozenset(inbox.with_name("inbox.read").read_text().split())
+    except OSError:
+        return frozenset()
+
+
+def _inbox_stamp(path: Path) -> tuple[int, ...] | None:
+    """(mtime_ns, size) of an inbox and its tombstones; None if there is no inbox."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    try:
+        tomb = path.with_name("inbox.read").stat()
+    except OSError:
+        return (st.st_mtime_ns, st.st_size, 0, -1)
+    return (st.st_mtime_ns, st.st_size, tomb.st_mtime_ns, tomb.st_size)
 
 
 def _relay_state_path(project: str) -> Path:
     """Get the relay state path for a project."""
-    d = STATE_DIR / (project or "_global")
-    d.mkdir(parents=True, exist_ok=True)
-    return d / "relay.json"
+    return _ensure_dir(STATE_DIR / (project or "_global")) / "relay.json"
 
 
 def write_inbox(project: str, sender: str, text: str) -> str:
     """Append a message to a project's inbox. Returns the message ID."""
-    msg_id = uuid.uuid4().hex[:12]
+    msg_id = secrets.token_hex(6)
     entry = {
         "id": msg_id,
         "sender": sender,
@@ -36,11 +104,12 @@ def write_inbox(project: str, sender: str, text: str) -> str:
         "read": False,
     }
     path = _inbox_path(project)
+    _inbox_cache.pop(path, None)
     try:
-        with path.open("a") as f:
+        with _open_creating(path, "ab") as f:
             fcntl.flock(f, fcntl.LOCK_EX)
             try:
-                f.write(json.dumps(entry) + "\n")
+                f.write(_json.dumps(entry) + b"\n")
             finally:
                 fcntl.flock(f, fcntl.LOCK_UN)
     except OSError as e:
@@ -49,64 +118,123 @@ def write_inbox(project: str, sender: str, text: str) -> str:
     return msg_id
 
 
-def read_inbox(project: str, unread_only: bool = True) -> list[dict]:
-    """Read messages from a project's inbox."""
-    path = _inbox_path(project)
-    if not path.exists():
-        return []
-    messages: list[dict] = []
+def read_inbox(project: str, unread_only: bool = True, tail: int | None = None) -> list[dict]:
+    """Read messages from a project's inbox (only the last `tail` when given)."""
+    return scan_inbox(project, unread_only, tail)[1]
+
+
+def scan_inbox(
+    project: str, unread_only: bool = True, tail: int | None = None,
+) -> tuple[int, list[dict]]:
+    """Stream a project's inbox: (matching message count, last `tail` matches).
+
+    Only the last `tail` messages are kept in memory, so counting a large
+    inbox (tail=0) or showing its newest entries stays O(tail). Results are
+    cached until the inbox or its tombstones change, so polling an idle
+    inbox costs two stat calls.
+    """
+    return _scan_inbox_at(_inbox_path(project), unread_only, tail)
+
+
+def _scan_inbox_at(
+    path: Path, unread_only: bool, tail: int | None,
+) -> tuple[int, list[dict]]:
+    """scan_inbox for an inbox path (which need not exist)."""
+    stamp = _inbox_stamp(path)
+    if stamp is None:
+        return 0, []
+    cached = _inbox_cache.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, {})
+        _inbox_cache[path] = cached
+    hit = cached[1].get((unread_only, tail))
+    if hit is not None:
+        return hit[0], list(hit[1])
+
+    read_ids = _read_ids(path)
+    messages: deque[dict] = deque(maxlen=tail)
+    count = 0
     try:
-        with path.open("r") as f:
+        with path.open("rb") as f:
             fcntl.flock(f, fcntl.LOCK_SH)
             try:
+                if unread_only and tail == 0:
+                    fast = _count_unread(f.read(), read_ids)
+                    if fast is not None:
+                        cached[1][(unread_only, tail)] = (fast, [])
+                        return fast, []
+                    f.seek(0)
                 for line in f:
                     line = line.strip()
-                    if not line:
+                    if not line or unread_only and line.endswith(_READ_TAILS):
                         continue
                     try:
-                        msg = json.loads(line)
+                        msg = _json.loads(line)
+                        if read_ids and msg.get("id") in read_ids:
+                            msg["read"] = True
                         if unread_only and msg.get("read", False):
                             continue
                         messages.append(msg)
-                    except json.JSONDecodeError:
+                        count += 1
+                    except _json.JSONDecodeError:
                         continue
             finally:
                 fcntl.flock(f, fcntl.LOCK_UN)
     except OSError as e:
         log(f"Inbox read error: {e}")
-    return messages
+        return count, list(messages)
+    cached[1][(unread_only, tail)] = (count, list(messages))
+    return count, list(messages)
+
+
+def _count_unread(buf: bytes, read_ids: frozenset[str]) -> int | None:
+    """Unread entry count read straight off write_inbox's fixed layout.
+
+    Each canonical unread entry is one regex hit carrying its ID, so the
+    count needs no JSON decoding. None when some unread entry is in another
+    layout and the caller has to parse.
+    """
+    hits = _UNREAD_LINE.findall(buf)
+    if len(hits) != len(_UNREAD.findall(buf)):
+        return None
+    if not read_ids:
+        return len(hits)
+    return sum(1 for mid, _ in hits if mid.decode() not in read_ids)
 
 
 def mark_read(project: str, message_ids: list[str] | None = None) -> int:
     """Mark inbox messages as read. If message_ids is None, marks all as read.
 
+    The IDs are appended to the project's inbox.read tombstone file; the
+    inbox itself is only scanned, never rewritten (see compact_inbox).
     Returns the count of messages marked.
     """
     path = _inbox_path(project)
     if not path.exists():
         return 0
+    _inbox_cache.pop(path, None)
 
+    wanted = None if message_ids is None else set(message_ids)
     marked = 0
     try:
-        with path.open("r+") as f:
-            fcntl.flock(f, fcntl.LOCK_EX)
+        with path.open("rb") as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
             try:
-                lines = f.readlines()
-                f.seek(0)
-                f.truncate()
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
+                unread = _unread_ids(f.read())
+                with _read_ids_path(project).open("a+b") as tomb:
+                    fcntl.flock(tomb, fcntl.LOCK_EX)
                     try:
-                        msg = json.loads(line)
-                        if not msg.get("read", False):
-                            if message_ids is None or msg.get("id") in message_ids:
-                                msg["read"] = True
-                                marked += 1
-                        f.write(json.dumps(msg) + "\n")
-                    except json.JSONDecodeError:
-                        f.write(line + "\n")
+                        tomb.seek(0)
+                        done = set(tomb.read().decode().split())
+                        new = [
+                            mid for mid in dict.fromkeys(unread)
+                            if mid not in done and (wanted is None or mid in wanted)
+                        ]
+                        if new:
+                            tomb.write("".join(f"{mid}\n" for mid in new).encode())
+                        marked = len(new)
+                    finally:
+                        fcntl.flock(tomb, fcntl.LOCK_UN)
             finally:
                 fcntl.flock(f, fcntl.LOCK_UN)
     except OSError as e:
@@ -114,10 +242,117 @@ def mark_read(project: str, message_ids: list[str] | None = None) -> int:
     return marked
 
 
+def _unread_ids(buf: bytes) -> list[str]:
+    """IDs of the entries not flagged read in the inbox itself."""
+    hits = _UNREAD_LINE.findall(buf)
+    if len(hits) == len(_UNREAD.findall(buf)):
+        return [mid.decode() for mid, _ in hits]
+    # Some unread entry is not in write_inbox's layout: parse every line
+    ids: list[str] = []
+    for line in buf.splitlines():
+        try:
+            msg = _json.loads(line)
+        except _json.JSONDecodeError:
+            continue
+        if not msg.get("read", False) and msg.get("id"):
+            ids.append(msg["id"])
+    return ids
+
+
+def compact_inbox(project: str) -> int:
+    """Fold a project's read tombstones into the inbox and empty inbox.read.
+
+    Canonical entries are flipped in place; if any tombstoned entry is in
+    another layout the inbox is re-serialized. Returns the entries updated.
+    """
+    path = _inbox_path(project)
+    tomb_path = _read_ids_path(project)
+    if not path.exists() or not tomb_path.exists():
+        return 0
+    _inbox_cache.pop(path, None)
+
+    marked = 0
+    try:
+        with path.open("r+b") as f, tomb_path.open("r+b") as tomb:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            fcntl.flock(tomb, fcntl.LOCK_EX)
+            try:
+                done = set(tomb.read().split())
+                if not done:
+                    return 0
+                buf = f.read()
+                hits = list(_UNREAD_LINE.finditer(buf))
+                if len(hits) != len(_UNREAD.findall(buf)):
+                    marked = _rewrite_marked(f, buf, {mid.decode() for mid in done})
+                else:
+                    for match in hits:
+                        if match.group(1) in done:
+                            f.seek(match.start(2))
+                            f.write(b"true ")
+                            marked += 1
+                tomb.truncate(0)
+            finally:
+                fcntl.flock(tomb, fcntl.LOCK_UN)
+                fcntl.flock(f, fcntl.LOCK_UN)
+    except OSError as e:
+        log(f"Inbox compact error: {e}")
+    return marked
+
+
+def compact_inboxes() -> None:
+    """Compact every project inbox with pending read tombstones (scheduled task)."""
+    if not STATE_DIR.exists():
+        return
+    for project_dir in STATE_DIR.iterdir():
+        tomb = project_dir / "inbox.read"
+        try:
+            if tomb.stat().st_size == 0:
+                continue
+        except OSError:
+            continue
+        compact_inbox(project_dir.name)
+
+
+def _rewrite_marked(f: BinaryIO, buf: bytes, message_ids: set[str]) -> int:
+    """Rewrite the inbox in place, marking the given IDs read.
+
+    Only lines containing one of the IDs are parsed and re-serialized; the
+    rest are copied verbatim, and the new contents go out in a single write.
+    The rewrite truncates the locked file rather than renaming a temp file
+    over it, which would strand writers already waiting on the old inode's lock.
+    """
+    needles = [mid.encode() for mid in message_ids]
+    out: list[bytes] = []
+    marked = 0
+    for line in buf.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if any(needle in line for needle in needles):
+            try:
+                msg = _json.loads(line)
+            except _json.JSONDecodeError:
+                msg = None
+            if (
+                isinstance(msg, dict) and not msg.get("read", False)
+                and msg.get("id") in message_ids
+            ):
+                msg["read"] = True
+                marked += 1
+                line = _json.dumps(msg)
+        out.append(line + b"\n")
+    f.seek(0)
+    f.truncate()
+    f.write(b"".join(out))
+    return marked
+
+
 def clear_inbox(project: str) -> None:
     """Remove all messages from a project's inbox."""
     path = _inbox_path(project)
+    _inbox_cache.pop(path, None)
     path.unlink(missing_ok=True)
+    _read_ids_path(project).unlink(missing_ok=True)
 
 
 def set_paused(project: str, paused: bool, by: str = "") -> None:
@@ -129,46 +364,54 @@ def set_paused(project: str, paused: bool, by: str = "") -> None:
             "paused_at": datetime.now(timezone.utc).isoformat(),
             "paused_by": by,
         }
-        path.write_text(json.dumps(data))
+        with _open_creating(path, "wb") as f:
+            f.write(_json.dumps(data))
     else:
         path.unlink(missing_ok=True)
 
 
 def is_paused(project: str) -> bool:
     """Check if a project's session is paused."""
-    path = _relay_state_path(project)
-    if not path.exists():
-        return False
+    return _paused_at(_relay_state_path(project))
+
+
+def _paused_at(path: Path) -> bool:
+    """Pause flag from a relay.json path (False when missing or unreadable)."""
     try:
-        data = json.loads(path.read_text())
+        data = _json.loads(path.read_bytes())
         return data.get("paused", False)
-    except (OSError, json.JSONDecodeError):
+    except (OSError, _json.JSONDecodeError):
         return False
 
 
 def list_active_sessions() -> list[dict]:
-    """List all projects with active thread state (proxy for active sessions)."""
+    """List all projects with active thread state (proxy for active sessions).
+
+    Walks STATE_DIR with os.scandir and reads each project's files by path,
+    without the existence checks and directory creation the per-project
+    helpers do; inbox counts come from the scan_inbox cache.
+    """
     sessions: list[dict] = []
-    if not STATE_DIR.exists():
+    try:
+        entries = os.scandir(STATE_DIR)
+    except OSError:
         return sessions
-    for project_dir in STATE_DIR.iterdir():
-        if not project_dir.is_dir():
-            continue
-        if project_dir.name.startswith("_"):
-            continue
-        thread_file = project_dir / "thread.json"
-        if not thread_file.exists():
-            continue
-        try:
-            data = json.loads(thread_file.read_text())
-            inbox_count = len(read_inbox(project_dir.name, unread_only=True))
-            paused = is_paused(project_dir.name)
+    with entries:
+        for entry in entries:
+            if entry.name.startswith("_") or not entry.is_dir():
+                continue
+            project_dir = Path(entry.path)
+            try:
+                data = _json.loads((project_dir / "thread.json").read_bytes())
+            except (OSError, _json.JSONDecodeError):
+                continue
+            inbox_count, _ = _scan_inbox_at(
+                project_dir / "inbox.jsonl", unread_only=True, tail=0,
+            )
             sessions.append({
-                "project": project_dir.name,
+                "project": entry.name,
                 "session": data.get("session", ""),
-                "paused": paused,
+                "paused": _paused_at(project_dir / "relay.json"),
                 "unread_inbox": inbox_count,
             })
-        except (OSError, json.JSONDecodeError):
-            continue
     return sessions
@@ -1,11 +1,12 @@
 """Cron-like task scheduler for proactive features."""
 from __future__ import annotations
 
-import json
+import math
 import time
 from collections.abc import Callable
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
+from hookline import _json
 from hookline._log import log
 from hookline.config import STATE_DIR
 
@@ -14,6 +15,15 @@ _SCHEDULE_STATE_FILE = STATE_DIR / "scheduler.json"
 # Registry of scheduled tasks
 _tasks: dict[str, ScheduledTask] = {}
 
+# Last-run timestamps, read from _SCHEDULE_STATE_FILE once and written back
+# only when a task has run (or at exit if that write failed)
+_state_cache: dict[str, float] | None = None
+_state_dirty = False
+_atexit_registered = False
+
+# How far next_after() searches; covers Feb 29 and other rare dates
+_NEXT_FIRE_HORIZON = timedelta(days=5 * 366)
+
 
 class CronExpr:
     """Simple 5-field cron expression parser.
@@ -27,18 +37,19 @@ class CronExpr:
         parts = expr.strip().split()
         if len(parts) != 5:
             raise ValueError(f"Cron expression requires 5 fields, got {len(parts)}: {expr!r}")
-        self.minute = self._parse_field(parts[0], 0, 59)
-        self.hour = self._parse_field(parts[1], 0, 23)
-        self.dom = self._parse_field(parts[2], 1, 31)
-        self.month = self._parse_field(parts[3], 1, 12)
-        self.dow = self._parse_field(parts[4], 0, 6)
+        # Each field is a bitmask with bit v set when value v matches
+        self.minute_mask = self._parse_field(parts[0], 0, 59)
+        self.hour_mask = self._parse_field(parts[1], 0, 23)
+        self.dom_mask = self._parse_field(parts[2], 1, 31)
+        self.month_mask = self._parse_field(parts[3], 1, 12)
+        self.dow_mask = self._parse_field(parts[4], 0, 6)
 
     @staticmethod
-    def _parse_field(field: str, min_val: int, max_val: int) -> set[int] | None:
-        """Parse a single cron field. Returns None for '*' (match any)."""
+    def _parse_field(field: str, min_val: int, max_val: int) -> int:
+        """Parse a single cron field into a bitmask of matching values ('*' sets all)."""
         if field == "*":
-            return None
-        values: set[int] = set()
+            return (1 << (max_val + 1)) - 1
+        mask = 0
         for part in field.split(","):
             if "/" in part:
                 base, step_str = part.split("/", 1)
@@ -47,34 +58,57 @@ class CronExpr:
                 if step <= 0:
                     raise ValueError(f"Step must be positive: {field!r}")
                 for v in range(start, max_val + 1, step):
-                    values.add(v)
+                    mask |= 1 << v
             elif "-" in part:
                 lo, hi = part.split("-", 1)
                 lo_int, hi_int = int(lo), int(hi)
                 if lo_int > hi_int:
                     raise ValueError(f"Invalid range: {field!r}")
                 for v in range(lo_int, hi_int + 1):
-                    values.add(v)
+                    mask |= 1 << v
             else:
                 val = int(part)
                 if val < min_val or val > max_val:
                     raise ValueError(f"Value {val} out of range [{min_val}, {max_val}]")
-                values.add(val)
-        return values
+                mask |= 1 << val
+        return mask
 
     def matches(self, dt: datetime) -> bool:
         """Check if a datetime matches this cron expression."""
-        if self.minute is not None and dt.minute not in self.minute:
-            return False
-        if self.hour is not None and dt.hour not in self.hour:
-            return False
-        if self.dom is not None and dt.day not in self.dom:
-            return False
-        if self.month is not None and dt.month not in self.month:
-            return False
-        if self.dow is not None and dt.weekday() not in self.dow:
-            return False
-        return True
+        return bool(
+            (self.minute_mask >> dt.minute)
+            & (self.hour_mask >> dt.hour)
+            & (self.dom_mask >> dt.day)
+            & (self.month_mask >> dt.month)
+            & (self.dow_mask >> dt.weekday())
+            & 1
+        )
+
+    def next_after(self, ts: float) -> float:
+        """Timestamp of the first matching minute after the one containing ts.
+
+        Skips whole days and hours that cannot match, so even rare schedules
+        take a few thousand steps. Returns math.inf if nothing matches within
+        the search horizon.
+        """
+        start = datetime.fromtimestamp(ts, tz=timezone.utc).replace(second=0, microsecond=0)
+        dt = start + timedelta(minutes=1)
+        limit = start + _NEXT_FIRE_HORIZON
+        while dt <= limit:
+            if not (
+                (self.dom_mask >> dt.day)
+                & (self.month_mask >> dt.month)
+                & (self.dow_mask >> dt.weekday())
+                & 1
+            ):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif not (self.hour_mask >> dt.hour) & 1:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif not (self.minute_mask >> dt.minute) & 1:
+                dt += timedelta(minutes=1)
+            else:
+                return dt.timestamp()
+        return math.inf
 
 
 class ScheduledTask:
@@ -93,6 +127,8 @@ class ScheduledTask:
         self.cron_expr = CronExpr(cron) if cron else None
         self.interval_seconds = interval_minutes * 60 if interval_minutes else None
         self.last_run: float = 0.0
+        # tick() skips the task until this time; 0 means "evaluate on next tick"
+        self.next_fire_ts: float = 0.0
 
         if not self.cron_expr and not self.interval_seconds:
             raise ValueError(f"Task {name!r} requires either cron or interval_minutes")
@@ -102,24 +138,22 @@ class ScheduledTask:
         if self.cron_expr:
             if not self.cron_expr.matches(now):
                 return False
-            # Prevent re-running within the same minute
-            if self.last_run > 0:
-                last_dt = datetime.fromtimestamp(self.last_run, tz=timezone.utc)
-                if (
-                    last_dt.year == now.year
-                    and last_dt.month == now.month
-                    and last_dt.day == now.day
-                    and last_dt.hour == now.hour
-                    and last_dt.minute == now.minute
-                ):
-                    return False
-            return True
+            # Prevent re-running within the same minute. POSIX time has no leap
+            # seconds, so UTC minutes are exact 60 s buckets of the timestamp.
+            return self.last_run <= 0 or self.last_run // 60 != now_ts // 60
 
         if self.interval_seconds:
             return (now_ts - self.last_run) >= self.interval_seconds
 
         return False
 
+    def advance(self, now_ts: float) -> None:
+        """Set next_fire_ts to the earliest time the task could be due after now_ts."""
+        if self.cron_expr:
+            self.next_fire_ts = self.cron_expr.next_after(now_ts)
+        elif self.interval_seconds:
+            self.next_fire_ts = self.last_run + self.interval_seconds
+
 
 def register_task(
     name: str,
@@ -138,48 +172,79 @@ def unregister_all() -> None:
 
 
 def _load_state() -> dict[str, float]:
-    """Load last-run timestamps from persistent state."""
-    try:
-        return json.loads(_SCHEDULE_STATE_FILE.read_text())
-    except (OSError, json.JSONDecodeError):
-        return {}
+    """Last-run timestamps: read from disk on first use, then served from memory."""
+    global _state_cache
+    if _state_cache is None:
+        try:
+            _state_cache = _json.loads(_SCHEDULE_STATE_FILE.read_bytes())
+        except (OSError, _json.JSONDecodeError):
+            _state_cache = {}
+    return _state_cache
 
 
 def _save_state(state: dict[str, float]) -> None:
-    """Save last-run timestamps to persistent state."""
-    STATE_DIR.mkdir(parents=True, exist_ok=True)
-    _SCHEDULE_STATE_FILE.write_text(json.dumps(state))
+    """Save last-run timestamps to persistent state atomically."""
+    global _state_dirty
+    tmp = _SCHEDULE_STATE_FILE.with_suffix(".tmp")
+    try:
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(_json.dumps(state))
+        tmp.replace(_SCHEDULE_STATE_FILE)
+    except OSError as e:
+        log(f"Scheduler state write error: {e}")
+        return
+    _state_dirty = False
+
+
+def _flush_state() -> None:
+    """Write the cached state if it has unsaved changes (registered atexit)."""
+    if _state_dirty and _state_cache is not None:
+        _save_state(_state_cache)
 
 
 def tick() -> None:
     """Check all registered tasks and run those that are due.
 
-    Called from the serve daemon polling loop on each iteration.
+    Called from the serve daemon polling loop on each iteration. Until some
+    task reaches its next_fire_ts this is one comparison per task: no clock
+    formatting, no state file access. State is read from disk once and
+    written back only after a task has run.
     """
+    global _state_dirty, _atexit_registered
     if not _tasks:
         return
 
-    now = datetime.now(timezone.utc)
     now_ts = time.time()
+    if all(now_ts < task.next_fire_ts for task in _tasks.values()):
+        return
+    now = datetime.fromtimestamp(now_ts, tz=timezone.utc)
 
     state = _load_state()
     for name, task in _tasks.items():
         if name in state:
             task.last_run = state[name]
 
-    ran_any = False
     for name, task in _tasks.items():
+        if now_ts < task.next_fire_ts:
+            continue
         if task.should_run(now, now_ts):
             try:
                 task.handler()
                 task.last_run = now_ts
                 state[name] = now_ts
-                ran_any = True
+                _state_dirty = True
                 log(f"Scheduler: ran {name}")
             except Exception as e:
+                # Not advanced: retried on the next tick
                 log(f"Scheduler error ({name}): {e}")
-
-    if ran_any:
+                continue
+        task.advance(now_ts)
+
+    if _state_dirty:
+        if not _atexit_registered:
+            import atexit
+            atexit.register(_flush_state)
+            _atexit_registered = True
         _save_state(state)
 
 
@@ -4,6 +4,8 @@ from __future__ import annotations
 import os
 import sys
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 
 from hookline._log import log, setup_serve_logging
 from hookline.approval import _handle_approval_callback
@@ -16,16 +18,26 @@ from hookline.config import (
     SENTINEL_DIR,
     STATE_DIR,
 )
-from hookline.state import _clear_state, _write_state
-from hookline.tasks import _clear_tasks
-from hookline.telegram import _answer_callback, _telegram_api
-from hookline.threads import _clear_thread
+from hookline.state import _clear_state, _clear_states, _write_state
+from hookline.telegram import (
+    _answer_callback,
+    _send_async,
+    _start_send_pool,
+    _stop_send_pool,
+    _telegram_api,
+)
 
 SERVE_PID_FILE = STATE_DIR / "serve.pid"
 
+# Memory ingestion (intent parsing, SQLite writes) runs on one background
+# worker while serve() runs so it stays off the update loop. Commands still
+# use the store from other threads; MemoryStore serializes them with a lock.
+_memory_pool: ThreadPoolExecutor | None = None
+
 
 def serve() -> None:
     """Run the Telegram update handler (blocking long-poll loop)."""
+    global _memory_pool
     if not BOT_TOKEN:
         print("Error: TELEGRAM_BOT_TOKEN not set", file=sys.stderr)
         sys.exit(1)
@@ -45,6 +57,9 @@ def serve() -> None:
     print("[hookline-serve] Press Ctrl+C to stop.\n")
 
     offset = 0
+    _start_send_pool()
+    if MEMORY_ENABLED:
+        _memory_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hookline-memory")
     try:
         while True:
             try:
@@ -78,6 +93,10 @@ def serve() -> None:
     except KeyboardInterrupt:
         print("\n[hookline-serve] Stopped.")
     finally:
+        _stop_send_pool()
+        if _memory_pool is not None:
+            _memory_pool.shutdown(wait=True)
+            _memory_pool = None
         SERVE_PID_FILE.unlink(missing_ok=True)
 
 
@@ -165,7 +184,7 @@ def _handle_freestanding_message(message: dict, text: str) -> None:
         if len(sessions) == 1:
             project = sessions[0]["project"]
             write_inbox(project, "telegram", text)
-            _telegram_api("sendMessage", {
+            _send_async(_telegram_api, "sendMessage", {
                 "chat_id": CHAT_ID,
                 "text": f"Queued to <b>{project}</b>",
                 "parse_mode": "HTML",
@@ -174,7 +193,7 @@ def _handle_freestanding_message(message: dict, text: str) -> None:
         elif len(sessions) > 1:
             from hookline.formatting import _esc
             names = ", ".join(_esc(s["project"]) for s in sessions)
-            _telegram_api("sendMessage", {
+            _send_async(_telegram_api, "sendMessage", {
                 "chat_id": CHAT_ID,
                 "text": (
                     f"Multiple sessions active: {names}\n"
@@ -185,6 +204,54 @@ def _handle_freestanding_message(message: dict, text: str) -> None:
             })
 
 
+def _mute_30(project: str, callback_id: str, user: str) -> None:
+    """Mute a project's notifications for 30 minutes."""
+    until = time.time() + 1800
+    _write_state(project, "mute.json", {"until": until})
+    _send_async(_answer_callback, callback_id, f"🔇 {project} muted for 30 minutes")
+    print(f"[hookline-serve] {user} muted {project} for 30m")
+
+
+def _mute_project(project: str, callback_id: str, user: str) -> None:
+    """Disable a project's notifications until re-enabled."""
+    sentinel = SENTINEL_DIR / f"notify-enabled.{project}"
+    sentinel.unlink(missing_ok=True)
+    _clear_state(project, "mute.json")
+    _send_async(_answer_callback, callback_id, f"🔕 {project} notifications disabled")
+    print(f"[hookline-serve] {user} disabled {project} notifications")
+
+
+def _reset_thread(project: str, callback_id: str, user: str) -> None:
+    """Start a fresh Telegram thread for a project's next message."""
+    # Thread, task and debounce state in one sweep over the project dir
+    _clear_states(project, "thread.json", "tasks.json", "debounce.json")
+    _send_async(_answer_callback, callback_id, "📌 Thread reset — next message starts fresh")
+    print(f"[hookline-serve] {user} reset thread for {project}")
+
+
+# Callback data is "<action>_<project>"; each action maps to
+# handler(project, callback_id, user). approve_/block_ presses are handled by
+# the approval module instead.
+_BUTTON_ACTIONS: dict[str, Callable[[str, str, str], None]] = {
+    "mute_30": _mute_30,
+    "mute_proj": _mute_project,
+    "reset": _reset_thread,
+}
+
+
+def _button_action(data: str) -> tuple[str, str]:
+    """Split callback data into (action, project); ("", "") if malformed.
+
+    Project names may contain underscores, so only the leading verb (two
+    words for mute_*) is split off.
+    """
+    action, sep, rest = data.partition("_")
+    if action == "mute":
+        sub, sep, rest = rest.partition("_")
+        action = f"mute_{sub}"
+    return (action, rest) if sep else ("", "")
+
+
 def _handle_button(callback: dict) -> None:
     """Handle an inline button press from Telegram."""
     data = callback.get("data", "")
@@ -193,44 +260,35 @@ def _handle_button(callback: dict) -> None:
 
     sender_id = str(callback.get("from", {}).get("id", ""))
     if sender_id != CHAT_ID:
-        _answer_callback(callback_id, "Unauthorized")
+        _send_async(_answer_callback, callback_id, "Unauthorized")
         log(f"Rejected button press from {sender_id} (expected {CHAT_ID})")
         return
 
-    if data.startswith("mute_30_"):
-        project = data[8:]
-        until = time.time() + 1800
-        _write_state(project, "mute.json", {"until": until})
-        _answer_callback(callback_id, f"🔇 {project} muted for 30 minutes")
-        print(f"[hookline-serve] {user} muted {project} for 30m")
-
-    elif data.startswith("mute_proj_"):
-        project = data[10:]
-        sentinel = SENTINEL_DIR / f"notify-enabled.{project}"
-        sentinel.unlink(missing_ok=True)
-        _clear_state(project, "mute.json")
-        _answer_callback(callback_id, f"🔕 {project} notifications disabled")
-        print(f"[hookline-serve] {user} disabled {project} notifications")
-
-    elif data.startswith("reset_"):
-        project = data[6:]
-        _clear_thread(project)
-        _clear_tasks(project)
-        _clear_state(project, "debounce.json")
-        _answer_callback(callback_id, "📌 Thread reset — next message starts fresh")
-        print(f"[hookline-serve] {user} reset thread for {project}")
-
-    elif data.startswith("approve_") or data.startswith("block_"):
+    action, project = _button_action(data)
+    handler = _BUTTON_ACTIONS.get(action)
+    if handler is not None:
+        handler(project, callback_id, user)
+    elif action in ("approve", "block"):
         _handle_approval_callback(callback)
-
     else:
-        _answer_callback(callback_id, "Unknown action")
+        _send_async(_answer_callback, callback_id, "Unknown action")
 
 
 def _log_to_memory(project: str, sender: str, text: str) -> None:
-    """Log a message to memory store if memory is enabled."""
+    """Log a message to memory store if memory is enabled.
+
+    Queued on the memory worker while serve() runs, inline otherwise.
+    """
     if not MEMORY_ENABLED or not project or not text:
         return
+    if _memory_pool is None:
+        _ingest(project, sender, text)
+    else:
+        _memory_pool.submit(_ingest, project, sender, text)
+
+
+def _ingest(project: str, sender: str, text: str) -> None:
+    """Run a message through the knowledge manager, logging any failure."""
     try:
         from hookline.memory.knowledge import KnowledgeManager
         from hookline.memory.store import get_store
@@ -1,6 +1,7 @@
 """Session management: sentinel detection, age, duration, mute, enabled check."""
 from __future__ import annotations
 
+import os
 import time
 from datetime import datetime, timezone
 from pathlib import Path
@@ -8,38 +9,67 @@ from pathlib import Path
 from hookline.config import SENTINEL_DIR
 from hookline.state import _clear_state, _read_state
 
+# Sentinel contents per path, valid while the file keeps the stat stamp
+# (inode, mtime_ns, size) it had when read: path -> (stamp, text, parsed start)
+_sentinel_cache: dict[Path, tuple[tuple[int, int, int], str, datetime | None]] = {}
+
+
+def _sentinel_entry(project: str) -> tuple[Path, str | None, datetime | None] | None:
+    """Active sentinel as (path, stripped contents, parsed timestamp).
+
+    One stat per candidate path; the file is read and parsed again only when
+    its stamp changes (the CLI replaces it atomically, giving a new inode).
+    Contents are None if the file exists but cannot be read.
+    """
+    candidates = [SENTINEL_DIR / "hookline-enabled"]
+    if project:
+        candidates.insert(0, SENTINEL_DIR / f"hookline-enabled.{project}")
+    for path in candidates:
+        try:
+            st = os.stat(path)
+        except OSError:
+            _sentinel_cache.pop(path, None)
+            continue
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached = _sentinel_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return path, cached[1], cached[2]
+        try:
+            text = path.read_text().strip()
+        except OSError:
+            return path, None, None
+        started = _parse_sentinel(text)
+        _sentinel_cache[path] = (stamp, text, started)
+        return path, text, started
+    return None
+
+
+def _parse_sentinel(text: str) -> datetime | None:
+    """Parse a sentinel's ISO timestamp. Returns None if it is not one."""
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
 
 def _sentinel_path(project: str) -> Path | None:
     """Find the active sentinel file (project-scoped or global)."""
-    if project:
-        p = SENTINEL_DIR / f"hookline-enabled.{project}"
-        if p.exists():
-            return p
-    g = SENTINEL_DIR / "hookline-enabled"
-    return g if g.exists() else None
+    entry = _sentinel_entry(project)
+    return entry[0] if entry else None
 
 
 def _session_key(project: str) -> str:
     """Unique key for the current session (sentinel creation timestamp)."""
-    sentinel = _sentinel_path(project)
-    if sentinel:
-        try:
-            return sentinel.read_text().strip()
-        except OSError:
-            pass
+    entry = _sentinel_entry(project)
+    if entry and entry[1] is not None:
+        return entry[1]
     return "unknown"
 
 
 def _sentinel_timestamp(project: str) -> datetime | None:
     """Parse the sentinel file's ISO timestamp. Returns None if unavailable."""
-    sentinel = _sentinel_path(project)
-    if not sentinel:
-        return None
-    try:
-        ts_str = sentinel.read_text().strip()
-        return datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-    except (OSError, ValueError):
-        return None
+    entry = _sentinel_entry(project)
+    return entry[2] if entry else None
 
 
 def _session_age_seconds(project: str) -> int | None:
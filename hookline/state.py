@@ -2,11 +2,11 @@
 from __future__ import annotations
 
 import fcntl
-import json
 import os
 from collections.abc import Callable
 from pathlib import Path
 
+from hookline import _json
 from hookline._log import log
 from hookline.config import SERVE_PID_FILE, STATE_DIR
 
@@ -21,8 +21,8 @@ def _state_dir(project: str) -> Path:
 def _read_state(project: str, filename: str) -> dict:
     """Read a JSON state file. Returns {} on any error."""
     try:
-        return json.loads((_state_dir(project) / filename).read_text())
-    except (OSError, json.JSONDecodeError):
+        return _json.loads((_state_dir(project) / filename).read_bytes())
+    except (OSError, _json.JSONDecodeError):
         return {}
 
 
@@ -31,7 +31,7 @@ def _write_state(project: str, filename: str, data: dict) -> None:
     path = _state_dir(project) / filename
     tmp = path.with_suffix(".tmp")
     try:
-        tmp.write_text(json.dumps(data))
+        tmp.write_bytes(_json.dumps(data))
         tmp.replace(path)
     except OSError as e:
         log(f"State write error: {e}")
@@ -39,10 +39,17 @@ def _write_state(project: str, filename: str, data: dict) -> None:
 
 def _clear_state(project: str, filename: str) -> None:
     """Remove a state file."""
-    try:
-        (_state_dir(project) / filename).unlink(missing_ok=True)
-    except OSError:
-        pass
+    _clear_states(project, filename)
+
+
+def _clear_states(project: str, *filenames: str) -> None:
+    """Remove several state files of one project, resolving its directory once."""
+    d = _state_dir(project)
+    for filename in filenames:
+        try:
+            (d / filename).unlink(missing_ok=True)
+        except OSError:
+            pass
 
 
 def _locked_update(project: str, filename: str, updater: Callable[[dict], dict | None]) -> dict | None:
@@ -54,15 +61,15 @@ def _locked_update(project: str, filename: str, updater: Callable[[dict], dict |
     try:
         fcntl.flock(fd, fcntl.LOCK_EX)
         try:
-            data = json.loads(path.read_text())
-        except (OSError, json.JSONDecodeError):
+            data = _json.loads(path.read_bytes())
+        except (OSError, _json.JSONDecodeError):
             data = {}
         result = updater(data)
         if result is None:
             path.unlink(missing_ok=True)
         else:
             tmp = path.with_suffix(".tmp")
-            tmp.write_text(json.dumps(result))
+            tmp.write_bytes(_json.dumps(result))
             tmp.replace(path)
         return result
     finally:
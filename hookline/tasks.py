@@ -6,18 +6,27 @@ from hookline.state import _clear_state, _read_state, _write_state
 
 
 def _track_task(project: str, event: dict) -> tuple[int, int | None]:
-    """Record a completed task. Returns (completed_count, total_or_None)."""
+    """Record a completed task. Returns (completed_count, total_or_None).
+
+    tasks.json is only rewritten when the event changes it; a repeated
+    task_id from the same session costs just the read.
+    """
     state = _read_state(project, "tasks.json")
     session = _session_key(project)
 
+    changed = False
     if state.get("session") != session:
         state = {"session": session, "completed": [], "total": None}
+        changed = True
 
     task_id = str(event.get("task_id", ""))
-    completed = state.get("completed", [])
+    if "completed" not in state:
+        state["completed"] = []
+        changed = True
+    completed = state["completed"]
     if task_id and task_id not in completed:
         completed.append(task_id)
-    state["completed"] = completed
+        changed = True
 
     total = state.get("total")
     try:
@@ -25,10 +34,12 @@ def _track_task(project: str, event: dict) -> tuple[int, int | None]:
         if total is None or num > total:
             state["total"] = num
             total = num
+            changed = True
     except (ValueError, TypeError):
         pass
 
-    _write_state(project, "tasks.json", state)
+    if changed:
+        _write_state(project, "tasks.json", state)
     return len(completed), total
 
 
@@ -1,38 +1,220 @@
 """Telegram Bot API transport: send messages, documents, remove buttons."""
 from __future__ import annotations
 
-import json
-import urllib.error
-import urllib.request
-import uuid
-from typing import Any
+import http.client
+import itertools
+import mimetypes
+import secrets
+import select
+import socket
+import threading
+import time
+from collections.abc import Callable
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
+from hookline import _json
 from hookline._log import log
 from hookline.buttons import _build_buttons, _clear_last_button_msg, _get_last_button_msg, _set_last_button_msg
 from hookline.config import BOT_TOKEN, CHAT_ID, DRY_RUN, SHOW_BUTTONS
 from hookline.formatting import _strip_html
 
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+
+_API_HOST = "api.telegram.org"
+
+# multipart/form-data boilerplate for _send_document, filled in with % per part
+_MP_FIELD = b'--%b\r\nContent-Disposition: form-data; name="%b"\r\n\r\n%b\r\n'
+_MP_FILE = (
+    b'--%b\r\nContent-Disposition: form-data; name="document"; filename="%b"\r\n'
+    b"Content-Type: %b\r\n\r\n"
+)
+_MP_END = b"\r\n--%b--"
+
+# Boundaries are a per-process random salt plus a counter; a fresh random one
+# is drawn only if the file happens to contain the candidate
+_BOUNDARY_SALT = secrets.token_hex(12).encode()
+_boundary_counter = itertools.count()
+
+# Longest flood-control wait _telegram_api sits out before retrying; a longer
+# retry_after drops the call rather than stall a hook for that long.
+_RETRY_AFTER_CAP = 5
+
+# One keep-alive HTTPS connection per thread: successive calls reuse the TCP
+# and TLS session instead of paying a fresh handshake each time.
+_conn_local = threading.local()
+
+
+@lru_cache(maxsize=1)
+def _https_proxy() -> tuple[str, int | None, dict[str, str]] | None:
+    """(host, port, CONNECT headers) of the HTTPS proxy urllib would use, if any.
+
+    Honours HTTPS_PROXY/https_proxy and NO_PROXY the same way urlopen does.
+    """
+    import urllib.parse
+    import urllib.request
+
+    url = urllib.request.getproxies().get("https")
+    if not url or urllib.request.proxy_bypass(_API_HOST):
+        return None
+    if "://" not in url:
+        url = f"http://{url}"
+    parts = urllib.parse.urlsplit(url)
+    if not parts.hostname:
+        return None
+    headers: dict[str, str] = {}
+    if parts.username:
+        import base64
+        user = urllib.parse.unquote(parts.username)
+        cred = f"{user}:{urllib.parse.unquote(parts.password or '')}"
+        headers["Proxy-Authorization"] = f"Basic {base64.b64encode(cred.encode()).decode()}"
+    return parts.hostname, parts.port, headers
+
+
+def _connection_dropped(sock: socket.socket) -> bool:
+    """True if the peer closed (or wrote to) an idle keep-alive socket.
+
+    An idle connection has nothing to read, so readability means EOF or
+    unsolicited bytes; either way the socket cannot carry another request.
+    """
+    try:
+        if hasattr(select, "poll"):
+            poller = select.poll()
+            poller.register(sock, select.POLLIN)
+            return bool(poller.poll(0))
+        return bool(select.select([sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+def _get_connection(timeout: float) -> http.client.HTTPSConnection:
+    conn: http.client.HTTPSConnection | None = getattr(_conn_local, "conn", None)
+    if conn is not None and conn.sock is not None and _connection_dropped(conn.sock):
+        # Closed by Telegram or a proxy while idle: reconnect before writing,
+        # since a request sent into it would fail only after being written
+        _drop_connection()
+        conn = None
+    if conn is None:
+        proxy = _https_proxy()
+        if proxy is None:
+            conn = http.client.HTTPSConnection(_API_HOST, timeout=timeout)
+        else:
+            host, port, headers = proxy
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout)
+            conn.set_tunnel(_API_HOST, headers=headers)
+        _conn_local.conn = conn
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn
+
+
+def _drop_connection() -> None:
+    conn: http.client.HTTPSConnection | None = getattr(_conn_local, "conn", None)
+    _conn_local.conn = None
+    if conn is not None:
+        conn.close()
+
+
+def _api_post(
+    path: str, body: bytes | list[bytes], content_type: str, timeout: float,
+) -> tuple[int, str, bytes]:
+    """POST over the pooled connection; retry once if a reused connection went stale.
+
+    A connection the server closed while idle is replaced before use (see
+    _connection_dropped). Beyond that, only a failure while writing the
+    request is retried: once it has been sent, Telegram may already have
+    acted on it (e.g. posted a message), so an error reading the response
+    is raised rather than risk a duplicate.
+    A list body is sent part by part under an explicit Content-Length, so
+    large uploads are never joined into one buffer.
+    """
+    headers = {"Content-Type": content_type}
+    if not isinstance(body, bytes):
+        headers["Content-Length"] = str(sum(len(part) for part in body))
+    conn = _get_connection(timeout)
+    reused = conn.sock is not None
+    try:
+        _send_request(conn, path, body, headers)
+    except (OSError, http.client.HTTPException):
+        if not reused:
+            raise
+        conn = _get_connection(timeout)
+        _send_request(conn, path, body, headers)
+    try:
+        resp = conn.getresponse()
+        data = resp.read()
+    except (OSError, http.client.HTTPException):
+        _drop_connection()
+        raise
+    if resp.will_close:
+        _drop_connection()
+    return resp.status, resp.reason, data
+
+
+def _send_request(
+    conn: http.client.HTTPSConnection, path: str, body: bytes | list[bytes],
+    headers: dict[str, str],
+) -> None:
+    try:
+        conn.request("POST", path, body=body, headers=headers)
+    except (OSError, http.client.HTTPException):
+        _drop_connection()
+        raise
+
 
 def _telegram_api(method: str, payload: dict, timeout: int = 10) -> dict | None:
-    """Call a Telegram Bot API method. Returns parsed JSON or None."""
+    """Call a Telegram Bot API method. Returns parsed JSON or None.
+
+    An HTTP error whose body is Telegram's JSON error ({"ok": false,
+    "error_code": ..., "description": ...}) is returned as parsed, so
+    callers can tell a rejected request from one that got no answer (None).
+    A 429 (flood control) is retried once after the retry_after Telegram
+    asks for, provided that is at most _RETRY_AFTER_CAP seconds.
+    """
     if not BOT_TOKEN:
         log("TELEGRAM_BOT_TOKEN not set")
         return None
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/{method}"
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
-        url, data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
+    data = _json.dumps(payload)
+    path = f"/bot{BOT_TOKEN}/{method}"
+    for attempt in range(2):
+        try:
+            status, reason, body = _api_post(path, data, "application/json", timeout)
+        except (OSError, http.client.HTTPException) as e:
+            log(f"Telegram API [{method}]: {e}")
+            return None
+        if status == 429 and attempt == 0:
+            delay = _retry_after(body)
+            if delay is not None and delay <= _RETRY_AFTER_CAP:
+                log(f"Telegram API [{method}]: rate limited, retrying in {delay}s")
+                time.sleep(delay)
+                continue
+        break
+    if status >= 400:
+        log(f"Telegram API [{method}]: HTTP Error {status}: {reason}")
+        try:
+            error = _json.loads(body)
+        except _json.JSONDecodeError:
+            return None
+        return error if isinstance(error, dict) and error.get("ok") is False else None
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            return json.loads(resp.read())
-    except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError) as e:
+        return _json.loads(body)
+    except _json.JSONDecodeError as e:
         log(f"Telegram API [{method}]: {e}")
         return None
 
 
+def _retry_after(body: bytes) -> float | None:
+    """retry_after seconds from a 429 response body, if it carries one."""
+    try:
+        delay = _json.loads(body).get("parameters", {}).get("retry_after")
+    except (_json.JSONDecodeError, AttributeError):
+        return None
+    return float(delay) if isinstance(delay, (int, float)) else None
+
+
 def _remove_buttons(message_id: int) -> None:
     """Remove inline buttons from a previously sent message."""
     _telegram_api("editMessageReplyMarkup", {
@@ -58,50 +240,86 @@ def send_message(
         log("TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID not set")
         return None
 
-    if SHOW_BUTTONS and project:
+    use_buttons = SHOW_BUTTONS and bool(project)
+    # Stripping the previous message's buttons does not depend on the send, so
+    # its round trip runs on a helper thread alongside sendMessage
+    remover: threading.Thread | None = None
+    if use_buttons:
         prev_msg = _get_last_button_msg(project)
         if prev_msg:
-            _remove_buttons(prev_msg)
+            remover = threading.Thread(target=_remove_buttons, args=(prev_msg,), daemon=True)
+            remover.start()
+    try:
+        return _send_html(text, project if use_buttons else "", reply_to, is_final)
+    finally:
+        if remover is not None:
+            remover.join()
+
+
+def _send_html(
+    text: str, button_project: str, reply_to: int | None, is_final: bool,
+) -> int | None:
+    """sendMessage as HTML, falling back to plain text. Returns message_id or None.
 
+    button_project is the project whose buttons to attach and track, or ""
+    for a message without buttons.
+    """
+    reply: dict[str, Any] = (
+        {"reply_to_message_id": reply_to, "allow_sending_without_reply": True}
+        if reply_to else {}
+    )
     payload: dict[str, Any] = {
         "chat_id": CHAT_ID,
         "text": text,
         "parse_mode": "HTML",
+        **reply,
     }
-    if reply_to:
-        payload["reply_to_message_id"] = reply_to
-        payload["allow_sending_without_reply"] = True
+    if button_project:
+        payload["reply_markup"] = _build_buttons(button_project, is_final)
 
-    if SHOW_BUTTONS and project:
-        payload["reply_markup"] = _build_buttons(project, is_final)
-
-    result = _telegram_api("sendMessage", payload)
-    if result and result.get("ok"):
-        msg_id = result["result"]["message_id"]
-        if SHOW_BUTTONS and project:
-            _set_last_button_msg(project, msg_id)
+    msg_id, result = _send_tracked(payload, button_project)
+    if msg_id is not None:
         return msg_id
 
-    # Fallback: strip HTML and send plain text
-    log("HTML send failed, trying plain text fallback")
-    plain = _strip_html(text)
+    # Fallback: strip HTML and send plain text. Only worth a second request
+    # when Telegram rejected the HTML (400: usually unparsable entities); a
+    # send that got no answer or was refused for another reason would fail
+    # the same way.
+    if not result or result.get("error_code") != 400:
+        log("HTML send failed")
+        return None
+    log(f"HTML send rejected ({result.get('description', '')}), trying plain text fallback")
     fallback_payload: dict[str, Any] = {
         "chat_id": CHAT_ID,
-        "text": plain,
+        "text": _strip_html(text),
+        **reply,
     }
-    if reply_to:
-        fallback_payload["reply_to_message_id"] = reply_to
-        fallback_payload["allow_sending_without_reply"] = True
-
-    result = _telegram_api("sendMessage", fallback_payload)
-    if result and result.get("ok"):
-        msg_id = result["result"]["message_id"]
-        if SHOW_BUTTONS and project:
-            _set_last_button_msg(project, msg_id)
-        return msg_id
+    msg_id, _ = _send_tracked(fallback_payload, button_project)
+    if msg_id is None:
+        log("Plain text fallback also failed")
+    return msg_id
 
-    log("Plain text fallback also failed")
-    return None
+
+def _send_tracked(
+    payload: dict[str, Any], button_project: str,
+) -> tuple[int | None, dict | None]:
+    """sendMessage, recording a sent message as button_project's latest (if any).
+
+    Returns (message_id or None, raw API result).
+    """
+    result = _telegram_api("sendMessage", payload)
+    if not (result and result.get("ok")):
+        return None, result
+    msg_id = result["result"]["message_id"]
+    if button_project:
+        _set_last_button_msg(button_project, msg_id)
+    return msg_id, result
+
+
+@lru_cache(maxsize=64)
+def _mime_for(filename: str) -> bytes:
+    """Content-Type for an uploaded file, guessed from its name."""
+    return (mimetypes.guess_type(filename)[0] or "application/octet-stream").encode()
 
 
 def _send_document(
@@ -111,41 +329,39 @@ def _send_document(
     reply_to: int | None = None,
 ) -> None:
     """Send a file as a Telegram document using multipart/form-data."""
-    boundary = uuid.uuid4().hex
-    body_parts: list[bytes] = []
-
-    body_parts.append(
-        f"--{boundary}\r\nContent-Disposition: form-data; name=\"chat_id\"\r\n\r\n{CHAT_ID}".encode()
-    )
+    boundary = b"%s%08x" % (_BOUNDARY_SALT, next(_boundary_counter))
+    if boundary in file_bytes:
+        boundary = secrets.token_hex(16).encode()
+    fields = [(b"chat_id", CHAT_ID)]
     if caption:
-        body_parts.append(
-            f"--{boundary}\r\nContent-Disposition: form-data; name=\"caption\"\r\n\r\n{caption}".encode()
-        )
+        fields.append((b"caption", caption))
     if reply_to:
-        body_parts.append(
-            f"--{boundary}\r\nContent-Disposition: form-data; name=\"reply_to_message_id\"\r\n\r\n{reply_to}".encode()
-        )
+        fields.append((b"reply_to_message_id", str(reply_to)))
 
-    body_parts.append(
-        f"--{boundary}\r\nContent-Disposition: form-data; name=\"document\"; filename=\"{filename}\"\r\n"
-        f"Content-Type: text/plain\r\n\r\n".encode() + file_bytes
-    )
-    body_parts.append(f"--{boundary}--".encode())
-    body = b"\r\n".join(body_parts)
-
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendDocument"
-    req = urllib.request.Request(
-        url, data=body,
-        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
-        method="POST",
-    )
+    # Sent part by part: file_bytes goes to the socket as-is, not copied into
+    # a joined body
+    head = b"".join(_MP_FIELD % (boundary, name, value.encode()) for name, value in fields)
+    head += _MP_FILE % (boundary, filename.encode(), _mime_for(filename))
+    body = [head, file_bytes, _MP_END % boundary]
+
+    try:
+        status, reason, data = _api_post(
+            f"/bot{BOT_TOKEN}/sendDocument", body,
+            f"multipart/form-data; boundary={boundary.decode()}", 30,
+        )
+    except (OSError, http.client.HTTPException) as e:
+        log(f"sendDocument error: {e}")
+        return
+    if status >= 400:
+        log(f"sendDocument error: HTTP Error {status}: {reason}")
+        return
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            result = json.loads(resp.read())
-            if not result.get("ok"):
-                log(f"sendDocument failed: {result}")
-    except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError) as e:
+        result = _json.loads(data)
+    except _json.JSONDecodeError as e:
         log(f"sendDocument error: {e}")
+        return
+    if not result.get("ok"):
+        log(f"sendDocument failed: {result}")
 
 
 def _answer_callback(callback_id: str, text: str) -> None:
@@ -155,3 +371,33 @@ def _answer_callback(callback_id: str, text: str) -> None:
         "text": text,
         "show_alert": False,
     })
+
+
+# Replies and callback acks that nothing waits on go through this pool while
+# serve runs, so one update's HTTP round-trip does not hold up the rest of the
+# getUpdates batch. Each worker thread keeps its own keep-alive connection.
+_SEND_WORKERS = 4
+_send_pool: ThreadPoolExecutor | None = None
+
+
+def _start_send_pool() -> None:
+    """Create the send pool (serve calls this on startup)."""
+    global _send_pool
+    from concurrent.futures import ThreadPoolExecutor
+    _send_pool = ThreadPoolExecutor(max_workers=_SEND_WORKERS, thread_name_prefix="hookline-send")
+
+
+def _stop_send_pool() -> None:
+    """Finish queued sends and drop the pool (serve calls this on shutdown)."""
+    global _send_pool
+    pool, _send_pool = _send_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _send_async(fn: Callable[..., object], *args: object) -> None:
+    """Run a fire-and-forget call on the send pool (inline without one)."""
+    if _send_pool is None:
+        fn(*args)
+    else:
+        _send_pool.submit(fn, *args)
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 from typing import Any
 
@@ -15,19 +16,18 @@ def _read_transcript_tail(transcript_path: str, tail_bytes: int = 32768) -> list
     """Read and parse the last N bytes of a JSONL transcript."""
     if not transcript_path:
         return []
-    path = Path(transcript_path)
-    if not path.exists():
-        return []
     try:
-        size = path.stat().st_size
+        st = os.stat(transcript_path)
+        size = st.st_size
         if size > 10 * 1024 * 1024:
             log(f"Transcript too large ({size} bytes), skipping extraction")
             return []
+        if size == 0:
+            return []
         read_size = min(size, tail_bytes)
-        with path.open("rb") as f:
-            if size > read_size:
-                f.seek(-read_size, 2)
-            raw = f.read().decode("utf-8", errors="replace")
+        with open(transcript_path, "rb") as f:
+            f.seek(size - read_size)
+            raw = f.read(read_size).decode("utf-8", errors="replace")
         lines = raw.split("\n")
         if size > read_size:
             lines = lines[1:]
@@ -40,7 +40,7 @@ def _read_transcript_tail(transcript_path: str, tail_bytes: int = 32768) -> list
             except (json.JSONDecodeError, AttributeError):
                 continue
         return entries
-    except (OSError, PermissionError):
+    except OSError:
         return []
 
 
@@ -80,7 +80,11 @@ def hookline(_add_project_root: None, monkeypatch: pytest.MonkeyPatch, tmp_path:
     # Clear caches
     monkeypatch.setattr(_config, "_hookline_config", None)
     monkeypatch.setattr(_project, "_project_config", None)
+    _project._project_label.cache_clear()
     monkeypatch.setattr(_transcript, "_transcript_cache", {})
+    monkeypatch.setattr(_relay, "_inbox_cache", {})
+    monkeypatch.setattr(_relay, "_dirs_created", set())
+    monkeypatch.setattr(_session, "_sentinel_cache", {})
 
     # Reset memory store singleton
     _memory_store = _submod("memory.store")
@@ -89,6 +93,8 @@ def hookline(_add_project_root: None, monkeypatch: pytest.MonkeyPatch, tmp_path:
     # Reset scheduler registry
     _scheduler = _submod("scheduler")
     monkeypatch.setattr(_scheduler, "_tasks", {})
+    monkeypatch.setattr(_scheduler, "_state_cache", None)
+    monkeypatch.setattr(_scheduler, "_state_dirty", False)
     monkeypatch.setattr(_scheduler, "_SCHEDULE_STATE_FILE", state_dir / "scheduler.json")
 
     # Patch the re-exports on the package itself for direct access
@@ -0,0 +1,150 @@
+"""Tests for the CLI argument parser and subcommand dispatch."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+
+class TestParseArgs:
+    """Test _parse_args single-pass argv handling."""
+
+    def test_empty(self, hookline: Any) -> None:
+        from hookline.cli import _parse_args
+        assert _parse_args([]) == (None, None, None, False)
+
+    def test_subcommand_with_positional(self, hookline: Any) -> None:
+        from hookline.cli import _parse_args
+        assert _parse_args(["on", "myproj"]) == ("on", None, "myproj", True)
+
+    def test_project_flag_and_alias(self, hookline: Any) -> None:
+        from hookline.cli import _parse_args
+        assert _parse_args(["--reset", "--project", "p1"]) == ("reset", "p1", None, True)
+
+    def test_dry_run_skipped(self, hookline: Any) -> None:
+        from hookline.cli import _parse_args
+        assert _parse_args(["--dry-run"]) == (None, None, None, False)
+
+    def test_version_short_flag(self, hookline: Any) -> None:
+        from hookline.cli import _parse_args
+        cmd, _, _, has_sub = _parse_args(["status", "-V"])
+        assert cmd == "version"
+        assert has_sub is True
+
+    def test_unknown_command_is_not_subcommand(self, hookline: Any) -> None:
+        from hookline.cli import _parse_args
+        assert _parse_args(["bogus"]) == ("bogus", None, None, False)
+
+
+class TestNowIso:
+    """Test _now_iso sentinel timestamp format."""
+
+    def test_matches_strftime_format(self, hookline: Any) -> None:
+        from datetime import datetime
+
+        from hookline.cli import _now_iso
+        ts = _now_iso()
+        assert len(ts) == 20
+        assert datetime.strptime(ts, "%Y-%m-%dT%H:%M:%SZ")
+
+
+class TestStatus:
+    """Test _do_status sentinel listing."""
+
+    def test_lists_project_sentinels(
+        self, hookline: Any, tmp_path: Any, capsys: Any,
+    ) -> None:
+        from hookline.cli import _do_status
+        (tmp_path / "hookline-enabled.beta").write_text("2026-01-02T00:00:00Z")
+        (tmp_path / "hookline-enabled.alpha").write_text("2026-01-01T00:00:00Z")
+        _do_status()
+        out = capsys.readouterr().out
+        assert out.index("alpha") < out.index("beta")
+        assert "since 2026-01-01T00:00:00Z" in out
+        assert "global     OFF" in out
+
+    def test_unreadable_sentinel_still_on(
+        self, hookline: Any, tmp_path: Any, capsys: Any,
+    ) -> None:
+        from hookline.cli import _do_status
+        (tmp_path / "hookline-enabled.gamma").mkdir()
+        _do_status()
+        out = capsys.readouterr().out
+        assert "gamma" in out
+        assert "all notifications disabled" not in out
+
+
+class TestReset:
+    """Test _do_reset state clearing."""
+
+    @pytest.mark.parametrize("count", [2, 6])
+    def test_reset_all_clears_every_project(
+        self, hookline: Any, count: int, capsys: Any,
+    ) -> None:
+        from hookline.cli import _do_reset
+        from hookline.state import _state_dir
+        for i in range(count):
+            for fname in ("thread.json", "tasks.json", "debounce.json", "mute.json"):
+                (_state_dir(f"p{i}") / fname).write_text("{}")
+        _do_reset("all")
+        for i in range(count):
+            assert not any(_state_dir(f"p{i}").glob("*.json"))
+        assert f"reset state for {count} project(s)" in capsys.readouterr().out
+
+
+class TestOn:
+    """Test _do_on sentinel writes."""
+
+    def test_writes_timestamp(self, hookline: Any, tmp_path: Any) -> None:
+        from hookline.cli import _do_on
+        _do_on("all")
+        assert (tmp_path / "hookline-enabled").read_text().endswith("Z")
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_recent_sentinel_only_touched(
+        self, hookline: Any, tmp_path: Any, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        from hookline.cli import _do_on
+        sentinel = tmp_path / "hookline-enabled.proj"
+        sentinel.write_text("2026-01-01T00:00:00Z")
+        _do_on("proj")
+        assert sentinel.read_text() == "2026-01-01T00:00:00Z"
+        assert "2026-01-01T00:00:00Z" in capsys.readouterr().out
+
+    def test_stale_sentinel_rewritten(self, hookline: Any, tmp_path: Any) -> None:
+        import os
+
+        from hookline.cli import _do_on
+        sentinel = tmp_path / "hookline-enabled.proj"
+        sentinel.write_text("2026-01-01T00:00:00Z")
+        os.utime(sentinel, (0, 0))
+        _do_on("proj")
+        assert sentinel.read_text() != "2026-01-01T00:00:00Z"
+
+
+class TestDispatch:
+    """Test cli_main subcommand dispatch."""
+
+    def test_every_subcommand_has_handler(self, hookline: Any) -> None:
+        from hookline.cli import _DISPATCH, _FLAG_MAP, _SUBCOMMANDS
+        assert set(_DISPATCH) == _SUBCOMMANDS
+        assert set(_FLAG_MAP.values()) <= set(_DISPATCH)
+
+    def test_unknown_command_exits(
+        self, hookline: Any, monkeypatch: pytest.MonkeyPatch, capsys: Any,
+    ) -> None:
+        from hookline.cli import cli_main
+        monkeypatch.setattr("sys.argv", ["hookline", "bogus"])
+        monkeypatch.setattr("sys.stdin", type("Tty", (), {"isatty": lambda self: True})())
+        with pytest.raises(SystemExit) as exc:
+            cli_main()
+        assert exc.value.code == 1
+        assert "unknown command 'bogus'" in capsys.readouterr().err
+
+    def test_routes_project_argument(
+        self, hookline: Any, monkeypatch: pytest.MonkeyPatch, tmp_path: Any,
+    ) -> None:
+        from hookline.cli import cli_main
+        monkeypatch.setattr("sys.argv", ["hookline", "on", "myproj"])
+        cli_main()
+        assert (tmp_path / "hookline-enabled.myproj").exists()
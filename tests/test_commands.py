@@ -29,6 +29,20 @@ class TestCommandRegistry:
         # Cleanup registry
         _registry.pop("testcmd", None)
 
+    def test_duplicate_name_rejected(self, hookline: Any) -> None:
+        from hookline.commands import register
+
+        with pytest.raises(ValueError, match="'sessions' is already registered"):
+            @register("sessions")
+            def _other(project: str, args: str, reply_to: int) -> None:
+                pass
+
+    def test_same_handler_reregistered(self, hookline: Any) -> None:
+        from hookline.commands import _registry, register
+        handler = _registry["sessions"]
+        assert register("sessions")(handler) is handler
+        assert _registry["sessions"] is handler
+
     def test_dispatch_unknown_returns_false(self, hookline: Any) -> None:
         from hookline.commands import dispatch
         assert dispatch("nonexistent_cmd_xyz", "proj", "", 1) is False
@@ -47,6 +61,85 @@ class TestCommandRegistry:
         _registry.pop("failcmd", None)
 
 
+class TestReplyBatching:
+    """Test replies issued during dispatch are coalesced."""
+
+    def test_multiple_replies_sent_once(self, hookline: Any, mock_telegram: list) -> None:
+        from hookline.commands import _registry, _reply, dispatch, register
+
+        @register("chatty")
+        def _handler(project: str, args: str, reply_to: int) -> None:
+            _reply("one", reply_to)
+            _reply("two", reply_to)
+            _reply("other thread", reply_to + 1)
+
+        dispatch("chatty", "proj", "", 7)
+        assert [(c[1]["text"], c[1]["reply_to_message_id"]) for c in mock_telegram] == [
+            ("one\n\ntwo", 7), ("other thread", 8),
+        ]
+        _registry.pop("chatty", None)
+
+    def test_oversized_reply_split_on_newline(self, hookline: Any, mock_telegram: list) -> None:
+        from hookline.commands import _REPLY_LIMIT, _registry, _reply, dispatch, register
+        line = "x" * 99
+        text = "\n".join([line] * 60)
+
+        @register("longcmd")
+        def _handler(project: str, args: str, reply_to: int) -> None:
+            _reply(text, reply_to)
+
+        dispatch("longcmd", "proj", "", 1)
+        sent = [c[1]["text"] for c in mock_telegram]
+        assert len(sent) == 2
+        assert all(len(t) <= _REPLY_LIMIT for t in sent)
+        assert "\n".join(sent) == text
+        _registry.pop("longcmd", None)
+
+    def test_hard_split_keeps_html_intact(self, hookline: Any) -> None:
+        from hookline.commands import _REPLY_LIMIT, _split_reply
+        tag_text = "x" * (_REPLY_LIMIT - 2) + "<b>bold</b>"
+        assert _split_reply(tag_text) == ["x" * (_REPLY_LIMIT - 2), "<b>bold</b>"]
+        entity_text = "y" * (_REPLY_LIMIT - 2) + "&amp;z"
+        assert _split_reply(entity_text) == ["y" * (_REPLY_LIMIT - 2), "&amp;z"]
+
+    def test_reply_outside_dispatch_sends_immediately(
+        self, hookline: Any, mock_telegram: list,
+    ) -> None:
+        from hookline.commands import _reply
+        _reply("direct", 3)
+        assert [c[1]["text"] for c in mock_telegram] == ["direct"]
+
+    def test_deferred_placeholder_follows_buffered_replies(
+        self, hookline: Any, mock_telegram: list,
+    ) -> None:
+        from hookline.commands import _registry, _reply, _reply_deferred, dispatch, register
+
+        @register("slowcmd")
+        def _handler(project: str, args: str, reply_to: int) -> None:
+            _reply_deferred(reply_to, lambda: "result")
+            _reply("note", reply_to)
+
+        dispatch("slowcmd", "proj", "", 4)
+        assert [(c[0], c[1]["text"]) for c in mock_telegram] == [
+            ("sendMessage", "note"), ("sendMessage", "🔎 Searching…"),
+            ("editMessageText", "result"),
+        ]
+        assert mock_telegram[2][1]["message_id"] == 2
+        _registry.pop("slowcmd", None)
+
+    def test_deferred_overflow_sent_as_followups(
+        self, hookline: Any, mock_telegram: list,
+    ) -> None:
+        from hookline.commands import _REPLY_LIMIT, _reply_deferred
+        text = "\n".join(["y" * 99] * 60)
+        _reply_deferred(5, lambda: text)
+        assert [c[0] for c in mock_telegram] == ["sendMessage", "editMessageText", "sendMessage"]
+        assert mock_telegram[2][1]["reply_to_message_id"] == 5
+        parts = [mock_telegram[1][1]["text"], mock_telegram[2][1]["text"]]
+        assert all(len(t) <= _REPLY_LIMIT for t in parts)
+        assert "\n".join(parts) == text
+
+
 class TestRelayCommands:
     """Test built-in relay commands."""
 
@@ -125,6 +218,17 @@ class TestRelayCommands:
         dispatch("inbox", "proj", "", 1)
         assert any("test message" in c[1].get("text", "") for c in mock_telegram)
 
+    def test_inbox_escapes_and_limits(self, hookline: Any, mock_telegram: list) -> None:
+        from hookline.commands import dispatch
+        from hookline.relay import write_inbox
+        for i in range(12):
+            write_inbox("proj", "<bot>", f"msg {i}")
+        dispatch("inbox", "proj", "", 1)
+        text = mock_telegram[0][1]["text"]
+        assert "(12 unread)" in text
+        assert "] msg 1 " not in text and "] msg 2 " in text and "] msg 11 " in text
+        assert "[&lt;bot&gt;]" in text
+
     def test_clear_removes_inbox(self, hookline: Any, mock_telegram: list) -> None:
         from hookline.commands import dispatch
         from hookline.relay import read_inbox, write_inbox
@@ -166,3 +270,105 @@ class TestServeMessageRouting:
         _handle_threaded_message(msg, "help", 100)
         help_calls = [c for c in mock_telegram if "Reply commands" in c[1].get("text", "")]
         assert len(help_calls) >= 1
+
+    def test_freestanding_text_queued_and_acknowledged(
+        self, hookline: Any, mock_telegram: list, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _serve = sys.modules["hookline.serve"]
+        monkeypatch.setattr(_serve, "RELAY_ENABLED", True)
+        from hookline.relay import read_inbox
+        from hookline.state import _write_state
+        _write_state("proj", "thread.json", {"session": "s1", "message_id": 100})
+
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hookline-send")
+        monkeypatch.setattr(sys.modules["hookline.telegram"], "_send_pool", pool)
+        _serve._handle_freestanding_message({"message_id": 7}, "please rerun ci")
+        pool.shutdown(wait=True)
+        assert [m["text"] for m in read_inbox("proj")] == ["please rerun ci"]
+        assert [c[1]["text"] for c in mock_telegram] == ["Queued to <b>proj</b>"]
+
+    def test_send_async_runs_on_pool(self, hookline: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        _telegram = sys.modules["hookline.telegram"]
+        names: list[str] = []
+        _telegram._send_async(lambda: names.append(threading.current_thread().name))
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hookline-send")
+        monkeypatch.setattr(_telegram, "_send_pool", pool)
+        _telegram._send_async(lambda: names.append(threading.current_thread().name))
+        pool.shutdown(wait=True)
+        assert names[0] == threading.current_thread().name
+        assert names[1].startswith("hookline-send")
+
+    def test_memory_log_runs_on_memory_worker(
+        self, hookline: Any, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        _serve = sys.modules["hookline.serve"]
+        monkeypatch.setattr(_serve, "MEMORY_ENABLED", True)
+        names: list[str] = []
+        monkeypatch.setattr(
+            _serve, "_ingest", lambda *a: names.append(threading.current_thread().name),
+        )
+        _serve._log_to_memory("proj", "user", "inline")
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hookline-memory")
+        monkeypatch.setattr(_serve, "_memory_pool", pool)
+        _serve._log_to_memory("proj", "user", "queued")
+        pool.shutdown(wait=True)
+        assert names[0] == threading.current_thread().name
+        assert names[1].startswith("hookline-memory")
+
+    def test_button_action_parsing(self, hookline: Any) -> None:
+        _serve = sys.modules["hookline.serve"]
+        assert _serve._button_action("mute_30_my_proj") == ("mute_30", "my_proj")
+        assert _serve._button_action("mute_proj_x") == ("mute_proj", "x")
+        assert _serve._button_action("reset_a_b") == ("reset", "a_b")
+        assert _serve._button_action("approve_0123") == ("approve", "0123")
+        assert _serve._button_action("mute_30") == ("", "")
+        assert _serve._button_action("reset") == ("", "")
+
+    def test_button_dispatch(self, hookline: Any, mock_telegram: list) -> None:
+        from hookline.state import _read_state, _write_state
+
+        _serve = sys.modules["hookline.serve"]
+        sender = {"id": 12345, "first_name": "Ann"}
+        _serve._handle_button({"id": "c1", "data": "mute_30_my_proj", "from": sender})
+        assert _read_state("my_proj", "mute.json")["until"] > 0
+        _write_state("my_proj", "thread.json", {"message_id": 1})
+        _serve._handle_button({"id": "c2", "data": "reset_my_proj", "from": sender})
+        assert _read_state("my_proj", "thread.json") == {}
+        _serve._handle_button({"id": "c3", "data": "bogus_x", "from": sender})
+        acks = [c[1]["text"] for c in mock_telegram if c[0] == "answerCallbackQuery"]
+        assert acks[0] == "🔇 my_proj muted for 30 minutes"
+        assert acks[2] == "Unknown action"
+
+    def test_approval_acks_go_through_send_pool(
+        self, hookline: Any, mock_telegram: list, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        _serve = sys.modules["hookline.serve"]
+        _approval = sys.modules["hookline.approval"]
+        monkeypatch.setattr(_approval, "APPROVAL_USER", "12345")
+        threads: list[str] = []
+        real_answer = _approval._answer_callback
+
+        def answer(callback_id: str, text: str) -> None:
+            threads.append(threading.current_thread().name)
+            real_answer(callback_id, text)
+
+        monkeypatch.setattr(_approval, "_answer_callback", answer)
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hookline-send")
+        monkeypatch.setattr(sys.modules["hookline.telegram"], "_send_pool", pool)
+        _serve._handle_button(
+            {"id": "c1", "data": "approve_missing", "from": {"id": 12345, "first_name": "A"}},
+        )
+        pool.shutdown(wait=True)
+        assert [c[1]["text"] for c in mock_telegram] == ["Approval expired or already handled"]
+        assert threads[0].startswith("hookline-send")
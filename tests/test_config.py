@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 import pytest
@@ -13,15 +14,20 @@ def _config_mod() -> Any:
     return sys.modules["hookline.config"]
 
 
+def _set_env(monkeypatch: pytest.MonkeyPatch, **env: str) -> None:
+    """Replace the config module's env snapshot for the duration of a test."""
+    monkeypatch.setattr(_config_mod(), "_ENV", MappingProxyType(env))
+
+
 class TestCfgBool:
     """Test _cfg_bool: env var -> config file -> default."""
 
     def test_env_var_1_is_true(self, hookline: Any, monkeypatch: pytest.MonkeyPatch) -> None:
-        monkeypatch.setenv("TEST_BOOL", "1")
+        _set_env(monkeypatch, TEST_BOOL="1")
         assert hookline._cfg_bool("TEST_BOOL", "test_bool", False) is True
 
     def test_env_var_0_is_false(self, hookline: Any, monkeypatch: pytest.MonkeyPatch) -> None:
-        monkeypatch.setenv("TEST_BOOL", "0")
+        _set_env(monkeypatch, TEST_BOOL="0")
         assert hookline._cfg_bool("TEST_BOOL", "test_bool", True) is False
 
     def test_config_file_bool(self, hookline: Any, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
@@ -44,7 +50,7 @@ class TestCfgBool:
         config.write_text('{"test_bool": true}')
         monkeypatch.setattr(cfg, "NOTIFY_CONFIG_PATH", config)
         monkeypatch.setattr(cfg, "_hookline_config", None)
-        monkeypatch.setenv("TEST_BOOL", "0")
+        _set_env(monkeypatch, TEST_BOOL="0")
         assert hookline._cfg_bool("TEST_BOOL", "test_bool", True) is False
 
 
@@ -52,7 +58,7 @@ class TestCfgInt:
     """Test _cfg_int: env var -> config file -> default."""
 
     def test_env_var_int(self, hookline: Any, monkeypatch: pytest.MonkeyPatch) -> None:
-        monkeypatch.setenv("TEST_INT", "42")
+        _set_env(monkeypatch, TEST_INT="42")
         assert hookline._cfg_int("TEST_INT", "test_int", 0) == 42
 
     def test_config_file_int(self, hookline: Any, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
@@ -73,7 +79,7 @@ class TestCfgStr:
     """Test _cfg_str: env var -> config file -> default."""
 
     def test_env_var_str(self, hookline: Any, monkeypatch: pytest.MonkeyPatch) -> None:
-        monkeypatch.setenv("TEST_STR", "hello")
+        _set_env(monkeypatch, TEST_STR="hello")
         assert hookline._cfg_str("TEST_STR", "test_str", "default") == "hello"
 
     def test_default(self, hookline: Any, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -85,7 +91,7 @@ class TestCfgSuppress:
     """Test _cfg_suppress: env var (comma-separated) -> config file (list) -> empty set."""
 
     def test_env_var_comma_separated(self, hookline: Any, monkeypatch: pytest.MonkeyPatch) -> None:
-        monkeypatch.setenv("TEST_SUP", "Stop,Notification")
+        _set_env(monkeypatch, TEST_SUP="Stop,Notification")
         result = hookline._cfg_suppress("TEST_SUP", "suppress")
         assert result == {"Stop", "Notification"}
 
@@ -103,3 +109,24 @@ class TestCfgSuppress:
         monkeypatch.delenv("TEST_SUP", raising=False)
         result = hookline._cfg_suppress("TEST_SUP", "missing")
         assert result == set()
+
+    def test_env_skips_empty_entries(self, hookline: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+        _set_env(monkeypatch, TEST_SUP=",Stop,,")
+        result = hookline._cfg_suppress("TEST_SUP", "suppress")
+        assert result == {"Stop"}
+        assert isinstance(result, frozenset)
+
+
+class TestEnvSnapshot:
+    """Test the import-time env snapshot read by the _cfg_* helpers."""
+
+    def test_only_hookline_keys_snapshotted(self, hookline: Any) -> None:
+        cfg = _config_mod()
+        assert all(k.startswith(("HOOKLINE_", "TELEGRAM_")) for k in cfg._ENV)
+
+    def test_later_env_changes_ignored(
+        self, hookline: Any, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        _set_env(monkeypatch)
+        monkeypatch.setenv("HOOKLINE_TEST_LATE", "late")
+        assert hookline._cfg_str("HOOKLINE_TEST_LATE", "missing", "fallback") == "fallback"
@@ -32,6 +32,14 @@ class TestDebounceAccumulate:
         names = set(state["events"]["TeammateIdle"]["names"])
         assert names == {"researcher", "tester"}
 
+    def test_repeated_teammate_kept_once_in_order(self, hookline: Any) -> None:
+        for name in ("tester", "researcher", "tester", "tester"):
+            hookline._debounce_accumulate(
+                "proj", {"hook_event_name": "TeammateIdle", "teammate_name": name},
+            )
+        state = hookline._read_state("proj", "debounce.json")
+        assert state["events"]["TeammateIdle"] == {"count": 4, "names": ["tester", "researcher"]}
+
 
 class TestDebounceFlush:
     """Test _debounce_flush output."""
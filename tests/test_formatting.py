@@ -22,6 +22,30 @@ class TestEsc:
     def test_combined_escaping(self, hookline: Any) -> None:
         assert hookline._esc("a & b < c > d") == "a &amp; b &lt; c &gt; d"
 
+    def test_existing_entity_escaped_once(self, hookline: Any) -> None:
+        assert hookline._esc("&lt;") == "&amp;lt;"
+
+    def test_non_ascii_passthrough(self, hookline: Any) -> None:
+        assert hookline._esc("héllo ✓") == "héllo ✓"
+
+    def test_clean_text_returned_without_copy(self, hookline: Any) -> None:
+        text = "".join(["14:32", ":15"])
+        assert hookline._esc(text) is text
+
+
+class TestHhmmUtc:
+    """Test the per-minute cached UTC timestamp."""
+
+    def test_formats_given_time(self, hookline: Any) -> None:
+        from hookline.formatting import _hhmm_utc
+        assert _hhmm_utc(3600 * 13 + 60 * 7 + 59) == "13:07"
+
+    def test_same_minute_reuses_string(self, hookline: Any) -> None:
+        from hookline.formatting import _hhmm_utc
+        first = _hhmm_utc(120.0)
+        assert _hhmm_utc(179.9) is first
+        assert _hhmm_utc(180.0) == "00:03"
+
 
 class TestTruncate:
     """Test text truncation."""
@@ -63,6 +87,9 @@ class TestStripHtml:
     def test_empty_string(self, hookline: Any) -> None:
         assert hookline._strip_html("") == ""
 
+    def test_round_trips_escaped_entity(self, hookline: Any) -> None:
+        assert hookline._strip_html(hookline._esc("literal &lt; text")) == "literal &lt; text"
+
 
 class TestFormatFull:
     """Test full event formatting with box-drawing."""
@@ -125,3 +152,21 @@ class TestFormatBody:
         result = hookline._format_body("TaskCompleted", event, "proj")
         assert "Task" in result
         assert "Do stuff" in result
+
+    def test_unknown_event_falls_back_to_name(self, hookline: Any) -> None:
+        result = hookline._format_body("<Custom>", {}, "proj")
+        assert result == "<blockquote>&lt;Custom&gt;</blockquote>"
+
+
+class TestProjectLabel:
+    """Test memoized project labels."""
+
+    def test_label_cached_until_reload(self, hookline: Any, monkeypatch: Any) -> None:
+        import hookline.project as _project
+        monkeypatch.setattr(_project, "_project_config", {"proj": "🚀"})
+        assert _project._project_label("proj") == "🚀 proj"
+        monkeypatch.setattr(_project, "_project_config", {"proj": "🐢"})
+        assert _project._project_label("proj") == "🚀 proj"
+        _project._reload_project_config()
+        monkeypatch.setattr(_project, "_project_config", {"proj": "🐢"})
+        assert _project._project_label("proj") == "🐢 proj"
@@ -19,7 +19,8 @@ class TestMainEventRouting:
         main()
 
     def test_stop_event_sends_message(
-        self, hookline: Any, mock_telegram: list, enable_notifications: Path, monkeypatch: pytest.MonkeyPatch,
+        self, hookline: Any, mock_telegram: list, enable_notifications: Path,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         event = {"hook_event_name": "Stop", "cwd": "/test/demo-project", "stop_hook_active": False}
         self._run_main(event, monkeypatch)
@@ -27,7 +28,8 @@ class TestMainEventRouting:
         assert len(send_calls) >= 1
 
     def test_notification_event_sends_message(
-        self, hookline: Any, mock_telegram: list, enable_notifications: Path, monkeypatch: pytest.MonkeyPatch,
+        self, hookline: Any, mock_telegram: list, enable_notifications: Path,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         event = {"hook_event_name": "Notification", "cwd": "/test/proj", "message": "Hello"}
         self._run_main(event, monkeypatch)
@@ -44,7 +46,8 @@ class TestMainEventRouting:
         assert len(mock_telegram) == 0
 
     def test_suppressed_event_sends_nothing(
-        self, hookline: Any, mock_telegram: list, enable_notifications: Path, monkeypatch: pytest.MonkeyPatch,
+        self, hookline: Any, mock_telegram: list, enable_notifications: Path,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         from hookline import __main__ as _main_mod
         monkeypatch.setattr(_main_mod, "SUPPRESS", {"Stop"})
@@ -69,14 +72,97 @@ class TestMainEventRouting:
         main()
         assert len(mock_telegram) == 0
 
+    def test_reads_binary_stdin_buffer(
+        self, hookline: Any, mock_telegram: list, enable_notifications: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        from io import BytesIO, TextIOWrapper
+
+        from hookline.__main__ import main
+        event = {"hook_event_name": "Notification", "cwd": "/test/proj", "message": "héllo"}
+        stdin = TextIOWrapper(BytesIO(json.dumps(event, ensure_ascii=False).encode()))
+        monkeypatch.setattr("sys.stdin", stdin)
+        main()
+        send_calls = [c for c in mock_telegram if c[0] == "sendMessage"]
+        assert len(send_calls) == 1
+
+    def test_invalid_utf8_does_nothing(
+        self, hookline: Any, mock_telegram: list, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        from io import BytesIO, TextIOWrapper
+
+        from hookline.__main__ import main
+        monkeypatch.setattr("sys.stdin", TextIOWrapper(BytesIO(b'{"a": "\xff"}')))
+        main()
+        assert len(mock_telegram) == 0
+
     def test_debounce_event_accumulates(
-        self, hookline: Any, mock_telegram: list, enable_notifications: Path, monkeypatch: pytest.MonkeyPatch,
+        self, hookline: Any, mock_telegram: list, enable_notifications: Path,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         event = {"hook_event_name": "SubagentStop", "cwd": "/test/proj"}
         self._run_main(event, monkeypatch)
         assert len(mock_telegram) == 0
 
 
+class TestMessageBatch:
+    """Test coalescing of the notifications one event produces."""
+
+    def test_notification_and_inbox_digest_sent_together(
+        self, hookline: Any, mock_telegram: list, enable_notifications: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        from hookline import __main__ as _main_mod
+        from hookline.relay import read_inbox, write_inbox
+        monkeypatch.setattr(_main_mod, "RELAY_ENABLED", True)
+        write_inbox("proj", "telegram", "run the tests")
+        event = {"hook_event_name": "Notification", "cwd": "/test/proj", "message": "Hello"}
+        monkeypatch.setattr("sys.stdin", StringIO(json.dumps(event)))
+        _main_mod.main()
+        send_calls = [c for c in mock_telegram if c[0] == "sendMessage"]
+        assert len(send_calls) == 1
+        assert "run the tests" in send_calls[0][1]["text"]
+        assert read_inbox("proj", unread_only=True) == []
+
+    def test_oversized_pieces_split(self, hookline: Any, mock_telegram: list) -> None:
+        from hookline.__main__ import _MessageBatch
+        batch = _MessageBatch("proj", "")
+        batch.add("a" * 3000)
+        batch.add("b" * 3000)
+        batch.flush()
+        send_calls = [c for c in mock_telegram if c[0] == "sendMessage"]
+        assert [len(c[1]["text"]) for c in send_calls] == [3000, 3000]
+
+    def test_small_pieces_joined(self, hookline: Any, mock_telegram: list) -> None:
+        from hookline.__main__ import _MessageBatch
+        batch = _MessageBatch("proj", "")
+        batch.add("first")
+        batch.add("second", is_final=True)
+        batch.flush()
+        send_calls = [c for c in mock_telegram if c[0] == "sendMessage"]
+        assert [c[1]["text"] for c in send_calls] == ["first\n\nsecond"]
+
+
+class TestBackgroundMemoryLog:
+    """Test the Stop-event memory write runs off the hook's main thread."""
+
+    def test_stop_logs_to_memory_in_background(
+        self, hookline: Any, mock_telegram: list, enable_notifications: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        from hookline import __main__ as _main_mod
+        from hookline.memory.store import get_store
+        monkeypatch.setattr(_main_mod, "MEMORY_ENABLED", True)
+        monkeypatch.setattr(_main_mod, "_executor", None)
+        event = {"hook_event_name": "Stop", "cwd": "/test/proj", "stop_hook_active": False}
+        monkeypatch.setattr("sys.stdin", StringIO(json.dumps(event)))
+        _main_mod.main()
+        assert _main_mod._executor is not None
+        _main_mod._executor.shutdown(wait=True)
+        messages = get_store().get_messages("proj")
+        assert [m["text"] for m in messages] == ["[stop] Session ended"]
+
+
 class TestDryRun:
     """Test --dry-run mode."""
 
@@ -102,3 +188,80 @@ class TestVersion:
         assert hasattr(hookline, "__version__")
         assert isinstance(hookline.__version__, str)
         assert "." in hookline.__version__
+
+
+class TestStateFileScan:
+    """Test the health check's corrupt state file scan."""
+
+    def test_detects_corrupt_file(self, hookline: Any) -> None:
+        from hookline.__main__ import _scan_state_files
+        from hookline.state import _write_state
+        _write_state("proj", "thread.json", {"message_id": 1})
+        bad = hookline.STATE_DIR / "proj" / "tasks.json"
+        bad.write_text("{not json")
+        assert _scan_state_files() == ["proj/tasks.json"]
+
+    def test_cache_written_and_reused(self, hookline: Any) -> None:
+        from hookline.__main__ import _HEALTH_CACHE, _scan_state_files
+        from hookline.state import _write_state
+        _write_state("proj", "thread.json", {"message_id": 1})
+        assert _scan_state_files() == []
+        cache = json.loads((hookline.STATE_DIR / _HEALTH_CACHE).read_text())
+        assert cache["proj/thread.json"][2] is True
+        assert _scan_state_files() == []
+
+    def test_rewritten_identical_content_skips_parse(
+        self, hookline: Any, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        import os
+
+        from hookline import _json
+        from hookline.__main__ import _scan_state_files
+        from hookline.state import _write_state
+        _write_state("proj", "thread.json", {"message_id": 1})
+        assert _scan_state_files() == []
+        path = hookline.STATE_DIR / "proj" / "thread.json"
+        os.utime(path, ns=(1, 1))
+        monkeypatch.setattr(_json, "loads", lambda _d: pytest.fail("parsed unchanged file"))
+        assert _scan_state_files() == []
+
+    def test_truncated_file_rejected(self, hookline: Any) -> None:
+        from hookline.__main__ import _scan_state_files
+        (hookline.STATE_DIR / "proj").mkdir(parents=True, exist_ok=True)
+        (hookline.STATE_DIR / "proj" / "tasks.json").write_text('{"a": 1')
+        assert _scan_state_files() == ["proj/tasks.json"]
+
+    def test_scalar_json_accepted(self, hookline: Any) -> None:
+        from hookline.__main__ import _scan_state_files
+        (hookline.STATE_DIR / "proj").mkdir(parents=True, exist_ok=True)
+        (hookline.STATE_DIR / "proj" / "count.json").write_text("42")
+        assert _scan_state_files() == []
+
+
+class TestJsonCodec:
+    """Test the stdlib fallback of the optional-orjson codec."""
+
+    def test_stdlib_dumps_compact_and_strict_keys(
+        self, hookline: Any, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        from hookline import _json
+        monkeypatch.setattr(_json, "_orjson", None)
+        assert _json.dumps({"a": ["é", 1]}) == '{"a":["é",1]}'.encode()
+        with pytest.raises(TypeError):
+            _json.dumps({"ok": [{1: "x"}]})
+
+
+class TestHealthCheck:
+    """Test health_check diagnostics output."""
+
+    def test_telegram_probes_reported(
+        self, hookline: Any, mock_telegram: list, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        from hookline.__main__ import health_check
+        with pytest.raises(SystemExit):
+            health_check()
+        out = capsys.readouterr().out
+        assert f"✅ {'Bot valid':16s} @test_bot" in out
+        assert f"✅ {'Chat reachable':16s} OK" in out
+        assert f"❌ {'Serve daemon':16s} not running" in out
+        assert {c[0] for c in mock_telegram} == {"getMe", "sendChatAction"}
@@ -27,6 +27,12 @@ class TestMemoryStore:
             assert isinstance(mid, int)
             assert mid >= 1
 
+    def test_wal_with_normal_sync(self, hookline: Any, tmp_path: Path) -> None:
+        from hookline.memory.store import MemoryStore
+        with MemoryStore(tmp_path / "test.db") as store:
+            assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert store._conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
     def test_get_messages_filters_by_project(self, hookline: Any, tmp_path: Path) -> None:
         from hookline.memory.store import MemoryStore
         with MemoryStore(tmp_path / "test.db") as store:
@@ -36,6 +42,17 @@ class TestMemoryStore:
             assert len(msgs) == 1
             assert msgs[0]["text"] == "msg a"
 
+    def test_rows_are_plain_dicts(self, hookline: Any, tmp_path: Path) -> None:
+        from hookline.memory.store import MemoryStore
+        with MemoryStore(tmp_path / "test.db") as store:
+            msg_id = store.log_message("proj", "user", "hello", intent="note", ts="t0")
+            [msg] = store.get_messages("proj")
+            assert type(msg) is dict
+            assert msg == {
+                "id": msg_id, "project": "proj", "sender": "user",
+                "text": "hello", "ts": "t0", "intent": "note",
+            }
+
     def test_get_messages_with_limit(self, hookline: Any, tmp_path: Path) -> None:
         from hookline.memory.store import MemoryStore
         with MemoryStore(tmp_path / "test.db") as store:
@@ -86,6 +103,60 @@ class TestMemoryStore:
             assert len(results) == 1
             assert "quick" in results[0]["text"]
 
+    def test_search_messages_full_text(self, hookline: Any, tmp_path: Path) -> None:
+        from hookline.memory.store import MemoryStore
+        with MemoryStore(tmp_path / "test.db") as store:
+            store.log_message("proj", "user", "deploying the service tonight")
+            store.log_message("proj", "user", "deploy deploy deploy the fix")
+            store.log_message("other", "user", "deploy elsewhere")
+            texts = [m["text"] for m in store.search_messages("proj", "deploys")]
+            assert texts == ["deploy deploy deploy the fix", "deploying the service tonight"]
+            assert store.search_messages("proj", "serv") != []
+            assert store.search_messages("proj", 'tonight" OR "x') == []
+
+    def test_search_index_backfilled_and_synced(
+        self, hookline: Any, tmp_path: Path,
+    ) -> None:
+        import sqlite3
+
+        from hookline.memory.store import _SCHEMA, MemoryStore
+        db = tmp_path / "legacy.db"
+        conn = sqlite3.connect(db)
+        conn.executescript(_SCHEMA)
+        conn.execute(
+            "INSERT INTO messages (project, sender, text, ts) VALUES (?, ?, ?, ?)",
+            ("proj", "u", "old note", "t"),
+        )
+        conn.commit()
+        conn.close()
+        with MemoryStore(db) as store:
+            assert [m["text"] for m in store.search_messages("proj", "note")] == ["old note"]
+            store._conn.execute("UPDATE messages SET text = 'new memo'")
+            assert store.search_messages("proj", "note") == []
+            assert len(store.search_messages("proj", "memo")) == 1
+
+    def test_hot_queries_avoid_sorting(self, hookline: Any, tmp_path: Path) -> None:
+        from hookline.memory.store import MemoryStore
+        queries = [
+            ("SELECT * FROM messages WHERE project = ? ORDER BY id DESC LIMIT ?", ("p", 5)),
+            (
+                "SELECT * FROM messages WHERE project = ? AND sender = ? ORDER BY id DESC LIMIT ?",
+                ("p", "u", 5),
+            ),
+            (
+                "SELECT * FROM knowledge WHERE project = ? AND category = ? AND active = 1"
+                " ORDER BY id DESC",
+                ("p", "goal"),
+            ),
+        ]
+        with MemoryStore(tmp_path / "test.db") as store:
+            for sql, params in queries:
+                plan = " ".join(
+                    row[-1] for row in store._conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                )
+                assert "USING INDEX" in plan
+                assert "TEMP B-TREE" not in plan
+
     def test_get_stats(self, hookline: Any, tmp_path: Path) -> None:
         from hookline.memory.store import MemoryStore
         with MemoryStore(tmp_path / "test.db") as store:
@@ -115,6 +186,22 @@ class TestMemoryStore:
         s1.close()
         monkeypatch.setattr(store_mod, "_store_instance", None)
 
+    def test_connection_use_serialized_across_threads(
+        self, hookline: Any, tmp_path: Path,
+    ) -> None:
+        import threading
+
+        from hookline.memory.store import MemoryStore
+        with MemoryStore(tmp_path / "test.db") as store:
+            writer = threading.Thread(target=store.log_message, args=("p", "u", "x"))
+            with store._lock:
+                writer.start()
+                writer.join(0.1)
+                assert writer.is_alive()  # blocked until the holder's work is done
+                assert store.get_stats("p")["messages"] == 0
+            writer.join()
+            assert store.get_stats("p")["messages"] == 1
+
 
 # ── Intents Tests ────────────────────────────────────────────────────────────
 
@@ -162,6 +249,18 @@ class TestIntents:
         intent2, _, _ = parse_intent("[Goal] something else")
         assert intent2 == "goal"
 
+    def test_clean_text_tag_position(self, hookline: Any) -> None:
+        from hookline.memory.intents import parse_intent
+        assert parse_intent("  [GOAL]  lead ")[2] == "lead"
+        assert parse_intent(" trail [GOAL]  ")[2] == "trail"
+        assert parse_intent("mid [GOAL] dle")[2] == "mid  dle"
+        assert parse_intent("[GOAL]")[2] == ""
+
+    def test_mixed_case_tag_with_content(self, hookline: Any) -> None:
+        from hookline.memory.intents import parse_intent, parse_message
+        assert parse_intent("[dOnE: ship it] today") == ("done", "ship it", "today")
+        assert parse_message("[dOnE: ship it] #ops") == ("done", "ship it", "#ops", ["ops"])
+
     def test_extract_hashtags(self, hookline: Any) -> None:
         from hookline.memory.intents import extract_tags
         tags = extract_tags("working on #auth and #security features")
@@ -175,6 +274,16 @@ class TestIntents:
         assert "ab" in tags
         assert "abc" in tags
 
+    def test_parse_message_matches_separate_calls(self, hookline: Any) -> None:
+        from hookline.memory.intents import extract_tags, parse_intent, parse_message
+        for text in (
+            "plain #ops note",
+            "[REMEMBER: use #uv always] for #py",
+            "#pre [GOAL] ship it [DONE] #post",
+        ):
+            assert parse_message(text) == (*parse_intent(text), extract_tags(text))
+        assert parse_message("[GOAL: x #ab] #cd") == ("goal", "x #ab", "#cd", ["ab", "cd"])
+
 
 # ── TF-IDF Search Tests ─────────────────────────────────────────────────────
 
@@ -217,6 +326,35 @@ class TestTfIdfSearcher:
         results = searcher.search("xylophone")
         assert results == []
 
+    def test_index_rebuilt_after_add(self, hookline: Any) -> None:
+        from hookline.memory.search import TfIdfSearcher
+        searcher = TfIdfSearcher()
+        searcher.add_document(1, "python programming")
+        searcher.add_document(2, "javascript web")
+        assert searcher.search("rust") == []
+        searcher.add_document(3, "rust systems")
+        assert [doc_id for doc_id, _ in searcher.search("rust")] == [3]
+
+    def test_equal_scores_keep_insertion_order(self, hookline: Any) -> None:
+        from hookline.memory.search import TfIdfSearcher
+        searcher = TfIdfSearcher()
+        for doc_id in (5, 2, 9):
+            searcher.add_document(doc_id, "shared term")
+        searcher.add_document(1, "other words here")
+        searcher.add_document(4, "more filler text")
+        assert [doc_id for doc_id, _ in searcher.search("shared")] == [5, 2, 9]
+
+    def test_top_k_returns_best_scores(self, hookline: Any) -> None:
+        from hookline.memory.search import TfIdfSearcher
+        searcher = TfIdfSearcher()
+        searcher.add_document(1, "alpha beta gamma delta")
+        searcher.add_document(2, "alpha alpha alpha")
+        searcher.add_document(3, "alpha beta")
+        searcher.add_document(4, "unrelated words entirely")
+        full = searcher.search("alpha", top_k=10)
+        assert searcher.search("alpha", top_k=2) == full[:2]
+        assert [score for _, score in full] == sorted((s for _, s in full), reverse=True)
+
     def test_tokenize_strips_punctuation(self, hookline: Any) -> None:
         from hookline.memory.search import tokenize
         tokens = tokenize("Hello, World! This is a test.")
@@ -224,6 +362,10 @@ class TestTfIdfSearcher:
         assert "world" in tokens
         assert "test" in tokens
 
+    def test_tokenize_drops_single_characters(self, hookline: Any) -> None:
+        from hookline.memory.search import tokenize
+        assert tokenize("x y 2nd B12 z") == ["2nd", "b12"]
+
     def test_stopwords_filtered(self, hookline: Any) -> None:
         from hookline.memory.search import tokenize
         tokens = tokenize("the quick brown fox is very fast")
@@ -294,6 +436,24 @@ class TestKnowledgeManager:
             active_goals = store.get_knowledge("proj", category="goal", active_only=True)
             assert len(active_goals) == 0
 
+    def test_process_done_matches_case_insensitively(
+        self, hookline: Any, tmp_path: Path,
+    ) -> None:
+        from hookline.memory.knowledge import KnowledgeManager
+        from hookline.memory.store import MemoryStore
+        with MemoryStore(tmp_path / "test.db") as store:
+            km = KnowledgeManager(store)
+            auth = store.log_knowledge("proj", "goal", "Finish AUTH module")
+            store.log_knowledge("proj", "goal", "write docs")
+            umlaut = store.log_knowledge("proj", "goal", "ÜBER refactor")
+            store.log_knowledge("other", "goal", "auth module elsewhere")
+            result = km.process_message("proj", "user", "[DONE] auth Module")
+            assert result is not None and result["deactivated"] == [auth]
+            result = km.process_message("proj", "user", "[DONE] über")
+            assert result is not None and result["deactivated"] == [umlaut]
+            remaining = store.get_knowledge("proj", category="goal", active_only=True)
+            assert [g["text"] for g in remaining] == ["write docs"]
+
     def test_get_context_includes_all_categories(self, hookline: Any, tmp_path: Path) -> None:
         from hookline.memory.knowledge import KnowledgeManager
         from hookline.memory.store import MemoryStore
@@ -393,8 +553,11 @@ class TestMemoryCommands:
 
         monkeypatch.setattr(store_mod, "_store_instance", None)
         assert dispatch("recall", "test-proj", "python", 1)
-        assert len(mock_telegram) == 1
-        assert "Recall" in mock_telegram[0][1]["text"]
+        # Placeholder reply first, then edited in place with the result
+        assert [c[0] for c in mock_telegram] == ["sendMessage", "editMessageText"]
+        assert "Searching" in mock_telegram[0][1]["text"]
+        assert mock_telegram[1][1]["message_id"] == 1
+        assert "Recall" in mock_telegram[1][1]["text"]
 
     def test_goals_command(
         self,
@@ -448,8 +611,11 @@ class TestMemoryCommands:
 
         monkeypatch.setattr(store_mod, "_store_instance", None)
         assert dispatch("context", "test-proj", "", 1)
-        assert len(mock_telegram) == 1
-        assert "Context" in mock_telegram[0][1]["text"]
+        # Placeholder reply first, then edited in place with the result
+        assert [c[0] for c in mock_telegram] == ["sendMessage", "editMessageText"]
+        assert "Searching" in mock_telegram[0][1]["text"]
+        assert mock_telegram[1][1]["message_id"] == 1
+        assert "Context" in mock_telegram[1][1]["text"]
 
     def test_forget_command(
         self,
@@ -516,3 +682,20 @@ class TestMemoryCommands:
 
         assert dispatch("remember", "proj", "", 1)
         assert "Usage" in mock_telegram[0][1]["text"]
+
+    def test_knowledge_manager_cached_per_store(
+        self, hookline: Any, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        from hookline.commands import _km
+        from hookline.memory import store as store_mod
+        monkeypatch.setattr(store_mod, "_store_instance", None)
+        km1 = _km()
+        assert _km() is km1
+        monkeypatch.setattr(store_mod, "_store_instance", None)
+        assert _km() is not km1
+
+    def test_store_uses_wal(self, hookline: Any, tmp_path: Path) -> None:
+        from hookline.memory.store import MemoryStore
+        with MemoryStore(tmp_path / "wal.db") as store:
+            mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
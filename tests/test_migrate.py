@@ -0,0 +1,70 @@
+"""Tests for the notify -> hookline migration steps."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+
+@pytest.fixture()
+def migrate_mod(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Any:
+    import hookline.migrate as migrate
+    monkeypatch.setattr(migrate, "_SETTINGS", tmp_path / "settings.json")
+    return migrate
+
+
+class TestMigrateSettings:
+    """Test _migrate_settings hook command substitution."""
+
+    def test_missing_file(self, migrate_mod: Any) -> None:
+        assert migrate_mod._migrate_settings() is False
+
+    def test_no_old_command_leaves_file(self, migrate_mod: Any) -> None:
+        migrate_mod._SETTINGS.write_text('{"hooks": "python3 -m hookline"}')
+        assert migrate_mod._migrate_settings() is False
+        assert migrate_mod._SETTINGS.read_text() == '{"hooks": "python3 -m hookline"}'
+
+    def test_replaces_and_counts(
+        self, migrate_mod: Any, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        settings = {"hooks": ["python3 -m notify", "python3 -m notify --x", "✅ other"]}
+        migrate_mod._SETTINGS.write_text(json.dumps(settings, ensure_ascii=False))
+        assert migrate_mod._migrate_settings() is True
+        assert json.loads(migrate_mod._SETTINGS.read_text())["hooks"] == [
+            "python3 -m hookline", "python3 -m hookline --x", "✅ other",
+        ]
+        assert "(2 hook commands updated)" in capsys.readouterr().out
+
+
+class TestMigrateDir:
+    """Test _migrate_dir tree copy."""
+
+    def test_copies_tree_contents_and_mode(self, migrate_mod: Any, tmp_path: Path) -> None:
+        old = tmp_path / "notify-state"
+        (old / "proj").mkdir(parents=True)
+        payload = bytes(range(256)) * 4096
+        (old / "proj" / "memory.db").write_bytes(payload)
+        (old / "proj" / "empty.json").write_bytes(b"")
+        (old / "proj" / "memory.db").chmod(0o600)
+        new = tmp_path / "hookline-state"
+        assert migrate_mod._migrate_dir(old, new) is True
+        copied = new / "proj" / "memory.db"
+        assert copied.read_bytes() == payload
+        assert (new / "proj" / "empty.json").read_bytes() == b""
+        assert copied.stat().st_mode & 0o777 == 0o600
+        assert copied.stat().st_ino != (old / "proj" / "memory.db").stat().st_ino
+
+    def test_falls_back_when_clone_unsupported(
+        self, migrate_mod: Any, monkeypatch: pytest.MonkeyPatch, tmp_path: Path,
+    ) -> None:
+        def refuse(*args: Any) -> int:
+            raise OSError(18, "Invalid cross-device link")
+
+        monkeypatch.setattr(migrate_mod.os, "copy_file_range", refuse, raising=False)
+        src = tmp_path / "a.txt"
+        src.write_text("hello")
+        dst = tmp_path / "b.txt"
+        migrate_mod._clone_file(str(src), str(dst))
+        assert dst.read_text() == "hello"
@@ -78,6 +78,17 @@ class TestCronExpr:
         assert not expr.matches(datetime(2025, 1, 2, 0, 0, tzinfo=timezone.utc))
         assert not expr.matches(datetime(2025, 2, 1, 0, 0, tzinfo=timezone.utc))
 
+    def test_fields_parsed_to_bitmasks(self) -> None:
+        from hookline.scheduler import CronExpr
+        expr = CronExpr("*/20 9-11 * * 0,6")
+        assert expr.minute_mask == (1 << 0) | (1 << 20) | (1 << 40)
+        assert expr.hour_mask == (1 << 9) | (1 << 10) | (1 << 11)
+        assert expr.dom_mask == (1 << 32) - 1
+        assert expr.dow_mask == (1 << 0) | (1 << 6)
+        # 2025-06-15 is a Sunday (weekday=6)
+        assert expr.matches(datetime(2025, 6, 15, 10, 40, tzinfo=timezone.utc))
+        assert not expr.matches(datetime(2025, 6, 15, 12, 40, tzinfo=timezone.utc))
+
 
 # ── ScheduledTask Tests ──────────────────────────────────────────────────────
 
@@ -105,6 +116,7 @@ class TestScheduledTask:
         now_ts = now.timestamp()
         task.last_run = now_ts  # Already ran this minute
         assert not task.should_run(now, now_ts + 5)
+        assert task.should_run(now, now_ts + 60)
 
     def test_interval_task_fires(self) -> None:
         from hookline.scheduler import ScheduledTask
@@ -211,6 +223,67 @@ class TestSchedulerTick:
         # Should not raise
         sched.tick()
 
+    def test_tick_idle_until_next_fire(
+        self,
+        hookline: Any,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        import hookline.scheduler as sched
+
+        monkeypatch.setattr(sched, "_SCHEDULE_STATE_FILE", tmp_path / "scheduler.json")
+        called: list[str] = []
+        sched.register_task("hourly", lambda: called.append("ran"), interval_minutes=60)
+        sched.tick()
+        task = sched._tasks["hourly"]
+        assert called == ["ran"]
+        assert task.next_fire_ts == task.last_run + 3600
+
+        def no_load() -> dict[str, float]:
+            raise AssertionError("state loaded while idle")
+
+        monkeypatch.setattr(sched, "_load_state", no_load)
+        sched.tick()
+        assert called == ["ran"]
+
+    def test_state_read_once_and_flushed_when_dirty(
+        self,
+        hookline: Any,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        import hookline.scheduler as sched
+
+        state_file = tmp_path / "scheduler.json"
+        state_file.write_text(json.dumps({"other": 1.0}))
+        monkeypatch.setattr(sched, "_SCHEDULE_STATE_FILE", state_file)
+        assert sched._load_state() == {"other": 1.0}
+        state_file.unlink()
+        assert sched._load_state() is sched._load_state()
+
+        monkeypatch.setattr(sched, "_SCHEDULE_STATE_FILE", tmp_path / "missing" / "s.json")
+        monkeypatch.setattr(sched, "STATE_DIR", tmp_path / "blocker")
+        (tmp_path / "blocker").write_text("")  # mkdir fails: write is deferred
+        sched.register_task("job", lambda: None, cron="* * * * *")
+        sched.tick()
+        assert sched._state_dirty is True
+
+        monkeypatch.setattr(sched, "_SCHEDULE_STATE_FILE", state_file)
+        monkeypatch.setattr(sched, "STATE_DIR", tmp_path)
+        sched._flush_state()
+        assert sched._state_dirty is False
+        assert set(json.loads(state_file.read_text())) == {"other", "job"}
+
+    def test_cron_next_after(self) -> None:
+        from hookline.scheduler import CronExpr
+        ts = datetime(2025, 6, 15, 9, 30, 12, tzinfo=timezone.utc).timestamp()
+        expected = datetime(2025, 6, 16, 9, 0, tzinfo=timezone.utc).timestamp()
+        assert CronExpr("0 9 * * 0-4").next_after(ts) == expected
+        assert CronExpr("* * * * *").next_after(ts) == ts - 12 + 60
+        leap = datetime(2028, 2, 29, 0, 0, tzinfo=timezone.utc).timestamp()
+        assert CronExpr("0 0 29 2 *").next_after(ts) == leap
+        assert CronExpr("0 0 31 2 *").next_after(ts) == float("inf")
+
     def test_get_status(
         self,
         hookline: Any,
@@ -285,6 +358,47 @@ class TestProactiveBriefing:
         assert len(sent) >= 1
 
 
+class TestNowLabel:
+    """Test the shared per-minute header timestamp."""
+
+    def test_label_format(self) -> None:
+        import re
+
+        import hookline.proactive as proactive
+        assert re.fullmatch(r"\d{2}:\d{2} UTC", proactive._now_label())
+
+
+class TestPendingApprovals:
+    """Test the pending approval count in briefings."""
+
+    def test_counts_project_dirs_with_approval(
+        self, hookline: Any, monkeypatch: pytest.MonkeyPatch, tmp_path: Path,
+    ) -> None:
+        import hookline.config as config
+        import hookline.proactive as proactive
+        monkeypatch.setattr(config, "APPROVAL_ENABLED", True)
+        state = config.STATE_DIR
+        for name in ("a", "b", "c"):
+            (state / name).mkdir(parents=True)
+        (state / "a" / "approval.json").write_text("{}")
+        (state / "c" / "approval.json").write_text("{}")
+        (state / "approval.json").write_text("{}")
+        lines: list[str] = []
+        proactive._append_pending_approvals(lines)
+        assert lines == ["", "<b>Pending Approvals</b>: 2"]
+
+    def test_missing_state_dir_is_silent(
+        self, hookline: Any, monkeypatch: pytest.MonkeyPatch, tmp_path: Path,
+    ) -> None:
+        import hookline.config as config
+        import hookline.proactive as proactive
+        monkeypatch.setattr(config, "APPROVAL_ENABLED", True)
+        monkeypatch.setattr(config, "STATE_DIR", tmp_path / "missing")
+        lines: list[str] = []
+        proactive._append_pending_approvals(lines)
+        assert lines == []
+
+
 class TestProactiveDigest:
     """Test daily digest handler."""
 
@@ -359,6 +473,7 @@ class TestSetupProactive:
         monkeypatch.setattr(proactive, "BRIEFING_CRON", "0 9 * * *")
         monkeypatch.setattr(proactive, "DIGEST_CRON", "0 18 * * *")
         monkeypatch.setattr(proactive, "CHECKIN_INTERVAL", 60)
+        monkeypatch.setattr(proactive, "RELAY_ENABLED", True)
 
         proactive.setup_proactive()
 
@@ -367,6 +482,7 @@ class TestSetupProactive:
         assert "briefing" in names
         assert "digest" in names
         assert "checkin" in names
+        assert "inbox-compact" in names
 
     def test_setup_disabled_registers_nothing(
         self,
@@ -37,6 +37,18 @@ class TestWriteInbox:
         assert entry["read"] is False
         assert "ts" in entry
 
+    def test_project_dir_recreated_after_removal(self, hookline: Any) -> None:
+        import shutil
+
+        from hookline.relay import _inbox_path, is_paused, read_inbox, set_paused, write_inbox
+        write_inbox("proj", "a", "first")
+        shutil.rmtree(_inbox_path("proj").parent)
+        write_inbox("proj", "a", "second")
+        assert [m["text"] for m in read_inbox("proj")] == ["second"]
+        shutil.rmtree(_inbox_path("proj").parent)
+        set_paused("proj", paused=True)
+        assert is_paused("proj") is True
+
 
 class TestReadInbox:
     """Test read_inbox retrieves messages."""
@@ -62,6 +74,82 @@ class TestReadInbox:
         all_msgs = read_inbox("proj", unread_only=False)
         assert len(all_msgs) == 2
 
+    def test_read_tail(self, hookline: Any) -> None:
+        from hookline.relay import read_inbox, write_inbox
+        for i in range(8):
+            write_inbox("proj", "a", f"msg{i}")
+        tail = read_inbox("proj", tail=3)
+        assert [m["text"] for m in tail] == ["msg5", "msg6", "msg7"]
+
+    def test_scan_counts_beyond_tail(self, hookline: Any) -> None:
+        from hookline.relay import mark_read, scan_inbox, write_inbox
+        first = write_inbox("proj", "a", "msg0")
+        for i in range(1, 7):
+            write_inbox("proj", "a", f"msg{i}")
+        mark_read("proj", [first])
+        total, shown = scan_inbox("proj", unread_only=True, tail=5)
+        assert total == 6
+        assert [m["text"] for m in shown] == [f"msg{i}" for i in range(2, 7)]
+        assert scan_inbox("proj", tail=0) == (6, [])
+
+    def test_scan_cached_until_inbox_changes(
+        self, hookline: Any, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        import hookline.relay as relay
+        relay.write_inbox("proj", "a", "msg0")
+        assert relay.scan_inbox("proj", tail=0) == (1, [])
+
+        def no_parse(data: bytes) -> dict:
+            raise AssertionError("inbox re-parsed")
+
+        with monkeypatch.context() as m:
+            m.setattr(relay._json, "loads", no_parse)
+            assert relay.scan_inbox("proj", tail=0) == (1, [])
+        # An append from another process changes the stamp
+        with relay._inbox_path("proj").open("ab") as f:
+            f.write(b'{"id":"0123456789ab","text":"x","read":false}\n')
+        assert relay.scan_inbox("proj", tail=0) == (2, [])
+        relay.mark_read("proj", ["0123456789ab"])
+        assert relay.scan_inbox("proj", tail=0) == (1, [])
+
+
+    def test_unread_scan_skips_read_lines_unparsed(
+        self, hookline: Any, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        import hookline.relay as relay
+        first = relay.write_inbox("proj", "a", "old")
+        relay.write_inbox("proj", "a", "new")
+        relay.mark_read("proj", [first])
+        relay.compact_inbox("proj")
+        parsed: list[bytes] = []
+        loads = relay._json.loads
+
+        def spy(data: bytes) -> dict:
+            parsed.append(data)
+            return loads(data)
+
+        monkeypatch.setattr(relay._json, "loads", spy)
+        assert [m["text"] for m in relay.read_inbox("proj")] == ["new"]
+        assert len(parsed) == 1
+        assert len(relay.read_inbox("proj", unread_only=False)) == 2
+
+    def test_unread_count_needs_no_parse(
+        self, hookline: Any, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        import hookline.relay as relay
+        first = relay.write_inbox("proj", "a", 'quoted "read": false} text')
+        relay.write_inbox("proj", "a", "two")
+        relay.mark_read("proj", [first])
+
+        def no_parse(data: bytes) -> dict:
+            raise AssertionError("inbox parsed")
+
+        with monkeypatch.context() as m:
+            m.setattr(relay._json, "loads", no_parse)
+            assert relay.scan_inbox("proj", tail=0) == (1, [])
+        with relay._inbox_path("proj").open("ab") as f:
+            f.write(b'{"read": false, "id": "legacy"}\n')
+        assert relay.scan_inbox("proj", tail=0) == (2, [])
 
 class TestMarkRead:
     """Test mark_read updates message state."""
@@ -88,6 +176,80 @@ class TestMarkRead:
         from hookline.relay import mark_read
         assert mark_read("nonexistent") == 0
 
+    def test_appends_tombstones_without_touching_inbox(self, hookline: Any) -> None:
+        from hookline.relay import _inbox_path, _read_ids_path, mark_read, read_inbox, write_inbox
+        write_inbox("proj", "a", 'tricky "read": false} text')
+        id2 = write_inbox("proj", "b", "msg2")
+        before = _inbox_path("proj").read_bytes()
+        assert mark_read("proj", [id2]) == 1
+        assert _inbox_path("proj").read_bytes() == before
+        assert _read_ids_path("proj").read_text() == f"{id2}\n"
+        assert [m["text"] for m in read_inbox("proj")] == ['tricky "read": false} text']
+        assert [m["read"] for m in read_inbox("proj", unread_only=False)] == [False, True]
+        assert mark_read("proj", [id2]) == 0
+        assert mark_read("proj", ["unknown"]) == 0
+
+    def test_compact_folds_tombstones_in_place(self, hookline: Any) -> None:
+        from hookline.relay import (
+            _inbox_path,
+            _read_ids_path,
+            compact_inboxes,
+            mark_read,
+            read_inbox,
+            write_inbox,
+        )
+        write_inbox("proj", "a", 'tricky "read": false} text')
+        id2 = write_inbox("proj", "b", "msg2")
+        mark_read("proj", [id2])
+        size = _inbox_path("proj").stat().st_size
+        compact_inboxes()
+        assert _inbox_path("proj").stat().st_size == size
+        assert _inbox_path("proj").read_bytes().count(b'"read":false}') == 1
+        assert _read_ids_path("proj").read_bytes() == b""
+        assert [m["text"] for m in read_inbox("proj")] == ['tricky "read": false} text']
+        assert mark_read("proj", [id2]) == 0
+
+    def test_rewrite_keeps_unrelated_lines_verbatim(self, hookline: Any) -> None:
+        from hookline.relay import _inbox_path, compact_inbox, mark_read, write_inbox
+        path = _inbox_path("proj")
+        path.write_text(
+            '{ "read" : false, "id": "foreign",  "text": "keep" }\n'
+            '{"read": false, "id": "target", "text": "flip"}\n',
+        )
+        write_inbox("proj", "a", "new")
+        assert mark_read("proj", ["target"]) == 1
+        assert compact_inbox("proj") == 1
+        lines = path.read_text().splitlines()
+        assert lines[0] == '{ "read" : false, "id": "foreign",  "text": "keep" }'
+        assert '"read":true' in lines[1]
+        assert '"read":false}' in lines[2]
+
+    def test_spaced_legacy_entries_patched_in_place(self, hookline: Any) -> None:
+        import json
+
+        from hookline.relay import _inbox_path, compact_inbox, mark_read, read_inbox, write_inbox
+        path = _inbox_path("proj")
+        legacy = {"id": "0123456789ab", "sender": "a", "text": "old", "ts": "t", "read": False}
+        path.write_text(json.dumps(legacy) + "\n")
+        write_inbox("proj", "b", "new")
+        assert mark_read("proj") == 2
+        size = path.stat().st_size
+        assert compact_inbox("proj") == 2
+        assert path.stat().st_size == size
+        assert read_inbox("proj") == []
+
+    def test_non_canonical_entries_rewritten(self, hookline: Any) -> None:
+        from hookline.relay import _inbox_path, compact_inbox, mark_read, read_inbox, write_inbox
+        write_inbox("proj", "a", "msg1")
+        path = _inbox_path("proj")
+        with path.open("a") as f:
+            f.write('{"read": false, "id": "legacy", "text": "old"}\nnot json\n')
+        assert mark_read("proj") == 2
+        assert read_inbox("proj") == []
+        assert compact_inbox("proj") == 2
+        assert read_inbox("proj") == []
+        assert path.read_text().splitlines()[-1] == "not json"
+
 
 class TestClearInbox:
     """Test clear_inbox removes all messages."""
@@ -152,3 +314,17 @@ class TestListActiveSessions:
         from hookline.state import _write_state
         _write_state("_approvals", "thread.json", {"session": "s1", "message_id": 1})
         assert list_active_sessions() == []
+
+    def test_reads_without_creating_files(self, hookline: Any) -> None:
+        import hookline.relay as relay
+        from hookline.state import _write_state
+        _write_state("proj", "thread.json", {"session": "s1", "message_id": 1})
+        relay.set_paused("proj", paused=True)
+        (relay.STATE_DIR / "stray.txt").write_text("not a project")
+        (relay.STATE_DIR / "idle").mkdir()
+        before = sorted(p.name for p in relay.STATE_DIR.rglob("*"))
+        sessions = relay.list_active_sessions()
+        assert sessions == [
+            {"project": "proj", "session": "s1", "paused": True, "unread_inbox": 0},
+        ]
+        assert sorted(p.name for p in relay.STATE_DIR.rglob("*")) == before
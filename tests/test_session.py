@@ -6,6 +6,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import pytest
+
 
 class TestSentinel:
     """Test sentinel file detection and parsing."""
@@ -52,6 +54,26 @@ class TestSentinelTimestamp:
         assert hookline._sentinel_timestamp("proj") is None
 
 
+    def test_reread_only_when_sentinel_changes(
+        self, hookline: Any, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        sentinel = tmp_path / "hookline-enabled"
+        sentinel.write_text("2025-01-01T00:00:00Z")
+        assert hookline._sentinel_timestamp("p").year == 2025
+
+        def no_read(self: Path) -> str:
+            raise AssertionError("sentinel re-read")
+
+        with monkeypatch.context() as m:
+            m.setattr(Path, "read_text", no_read)
+            assert hookline._session_key("p") == "2025-01-01T00:00:00Z"
+        tmp = tmp_path / ".hookline-enabled.tmp"
+        tmp.write_text("2026-02-03T04:05:06Z")
+        tmp.replace(sentinel)
+        assert hookline._sentinel_timestamp("p").year == 2026
+        sentinel.unlink()
+        assert hookline._sentinel_timestamp("p") is None
+
 class TestSessionKey:
     """Test _session_key."""
 
@@ -3,6 +3,8 @@ from __future__ import annotations
 
 from typing import Any
 
+import pytest
+
 
 class TestReadWriteState:
     """Test _read_state and _write_state."""
@@ -21,6 +23,13 @@ class TestReadWriteState:
         hookline._clear_state("proj", "test.json")
         assert hookline._read_state("proj", "test.json") == {}
 
+    def test_clear_states_removes_each_file(self, hookline: Any) -> None:
+        hookline._write_state("proj", "a.json", {"a": 1})
+        hookline._write_state("proj", "b.json", {"b": 1})
+        hookline._clear_states("proj", "a.json", "b.json", "missing.json")
+        assert hookline._read_state("proj", "a.json") == {}
+        assert hookline._read_state("proj", "b.json") == {}
+
     def test_state_dir_created_automatically(self, hookline: Any) -> None:
         d = hookline._state_dir("new-project")
         assert d.exists()
@@ -60,3 +69,25 @@ class TestLockedUpdate:
 
         hookline._locked_update("proj", "temp.json", updater)
         assert hookline._read_state("proj", "temp.json") == {}
+
+
+class TestTrackTask:
+    """Test _track_task progress bookkeeping."""
+
+    def test_counts_tasks_and_total(self, hookline: Any) -> None:
+        assert hookline._track_task("proj", {"task_id": "2"}) == (1, 2)
+        assert hookline._track_task("proj", {"task_id": "5"}) == (2, 5)
+
+    def test_duplicate_task_skips_write(
+        self, hookline: Any, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        import sys
+
+        hookline._track_task("proj", {"task_id": "3"})
+        tasks = sys.modules["hookline.tasks"]
+
+        def no_write(*args: Any) -> None:
+            raise AssertionError("tasks.json rewritten")
+
+        monkeypatch.setattr(tasks, "_write_state", no_write)
+        assert hookline._track_task("proj", {"task_id": "3"}) == (1, 3)
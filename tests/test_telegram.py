@@ -0,0 +1,300 @@
+"""Tests for the Telegram transport's pooled connection handling."""
+from __future__ import annotations
+
+import json
+import socket
+import sys
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+
+class _FakeResponse:
+    def __init__(self, status: int, body: dict[str, Any], will_close: bool = False) -> None:
+        self.status = status
+        self.reason = "OK" if status < 400 else "Bad Request"
+        self.will_close = will_close
+        self._body = json.dumps(body).encode()
+
+    def read(self) -> bytes:
+        return self._body
+
+
+class _FakeConnection:
+    """Stands in for HTTPSConnection; replays scripted responses or errors."""
+
+    instances: list[_FakeConnection] = []
+    script: list[Any] = []
+    request_errors: list[BaseException] = []
+
+    def __init__(self, host: str, port: int | None = None, timeout: float = 10) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.tunnel: tuple[str, dict[str, str]] | None = None
+        self.sock: socket.socket | None = None
+        self.peer: socket.socket | None = None
+        self.requests: list[tuple[str, str]] = []
+        self.bodies: list[bytes] = []
+        self.headers: list[dict[str, str]] = []
+        self.closed = False
+        _FakeConnection.instances.append(self)
+
+    def request(
+        self, method: str, path: str, body: bytes | list[bytes], headers: dict[str, str],
+    ) -> None:
+        if _FakeConnection.request_errors:
+            raise _FakeConnection.request_errors.pop(0)
+        self.requests.append((method, path))
+        self.bodies.append(body if isinstance(body, bytes) else b"".join(body))
+        self.headers.append(headers)
+        if self.sock is None:
+            # A real socket pair, so the idle-drop check can poll it; closing
+            # peer simulates the server hanging up a keep-alive connection
+            self.sock, self.peer = socket.socketpair()
+
+    def getresponse(self) -> _FakeResponse:
+        step = _FakeConnection.script.pop(0)
+        if isinstance(step, BaseException):
+            raise step
+        return step
+
+    def set_tunnel(self, host: str, headers: dict[str, str]) -> None:
+        self.tunnel = (host, headers)
+
+    def close(self) -> None:
+        self.closed = True
+        for sock in (self.sock, self.peer):
+            if sock is not None:
+                sock.close()
+        self.sock = self.peer = None
+
+
+@pytest.fixture()
+def fake_http(
+    hookline: Any, monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[type[_FakeConnection]]:
+    _telegram = sys.modules["hookline.telegram"]
+    _FakeConnection.instances = []
+    _FakeConnection.script = []
+    _FakeConnection.request_errors = []
+    monkeypatch.setattr(_telegram.http.client, "HTTPSConnection", _FakeConnection)
+    monkeypatch.setattr(_telegram, "_conn_local", type(_telegram._conn_local)())
+    for var in ("HTTPS_PROXY", "https_proxy", "NO_PROXY", "no_proxy"):
+        monkeypatch.delenv(var, raising=False)
+    _telegram._https_proxy.cache_clear()
+    yield _FakeConnection
+    for conn in _FakeConnection.instances:
+        conn.close()
+    _telegram._https_proxy.cache_clear()
+
+
+class TestTelegramApi:
+    """Test _telegram_api over a reused keep-alive connection."""
+
+    def test_connection_reused(self, fake_http: type[_FakeConnection]) -> None:
+        from hookline.telegram import _telegram_api
+        fake_http.script = [
+            _FakeResponse(200, {"ok": True, "result": 1}),
+            _FakeResponse(200, {"ok": True, "result": 2}),
+        ]
+        assert _telegram_api("getMe", {}) == {"ok": True, "result": 1}
+        assert _telegram_api("getMe", {}) == {"ok": True, "result": 2}
+        assert len(fake_http.instances) == 1
+        assert fake_http.instances[0].requests == [
+            ("POST", "/bottest-token/getMe"), ("POST", "/bottest-token/getMe"),
+        ]
+
+    def test_body_is_compact_utf8_json(self, fake_http: type[_FakeConnection]) -> None:
+        from hookline.telegram import _telegram_api
+        fake_http.script = [_FakeResponse(200, {"ok": True})]
+        _telegram_api("sendMessage", {"chat_id": "1", "text": "✅ done"})
+        assert fake_http.instances[0].bodies == [
+            '{"chat_id":"1","text":"✅ done"}'.encode(),
+        ]
+
+    def test_stale_connection_retried_once(self, fake_http: type[_FakeConnection]) -> None:
+        from hookline.telegram import _telegram_api
+        fake_http.script = [
+            _FakeResponse(200, {"ok": True}),
+            _FakeResponse(200, {"ok": True, "result": "retried"}),
+        ]
+        _telegram_api("getMe", {})
+        fake_http.request_errors = [BrokenPipeError("stale")]
+        assert _telegram_api("getMe", {}) == {"ok": True, "result": "retried"}
+        assert len(fake_http.instances) == 2
+        assert fake_http.instances[0].closed
+
+    def test_idle_closed_connection_replaced(self, fake_http: type[_FakeConnection]) -> None:
+        from hookline.telegram import _telegram_api
+        fake_http.script = [
+            _FakeResponse(200, {"ok": True}),
+            _FakeResponse(200, {"ok": True, "result": "fresh"}),
+        ]
+        _telegram_api("sendMessage", {})
+        stale = fake_http.instances[0]
+        assert stale.peer is not None
+        stale.peer.close()  # server hangs up while the connection idles
+        assert _telegram_api("sendMessage", {}) == {"ok": True, "result": "fresh"}
+        assert stale.closed and len(stale.requests) == 1
+        assert len(fake_http.instances) == 2
+
+    def test_https_proxy_tunnels(
+        self, fake_http: type[_FakeConnection], monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        from hookline.telegram import _https_proxy, _telegram_api
+        monkeypatch.setenv("HTTPS_PROXY", "http://user:pw@proxy.local:3128")
+        _https_proxy.cache_clear()
+        fake_http.script = [_FakeResponse(200, {"ok": True})]
+        _telegram_api("getMe", {})
+        conn = fake_http.instances[0]
+        assert (conn.host, conn.port) == ("proxy.local", 3128)
+        assert conn.tunnel == (
+            "api.telegram.org", {"Proxy-Authorization": "Basic dXNlcjpwdw=="},
+        )
+
+    def test_no_proxy_bypasses(
+        self, fake_http: type[_FakeConnection], monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        from hookline.telegram import _https_proxy, _telegram_api
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.local:3128")
+        monkeypatch.setenv("NO_PROXY", "api.telegram.org")
+        _https_proxy.cache_clear()
+        fake_http.script = [_FakeResponse(200, {"ok": True})]
+        _telegram_api("getMe", {})
+        assert fake_http.instances[0].host == "api.telegram.org"
+        assert fake_http.instances[0].tunnel is None
+
+    def test_http_error_returns_error_body(self, fake_http: type[_FakeConnection]) -> None:
+        from hookline.telegram import _telegram_api
+        error = {"ok": False, "error_code": 400, "description": "Bad Request"}
+        fake_http.script = [_FakeResponse(400, error), _FakeResponse(502, {"html": "oops"})]
+        assert _telegram_api("sendMessage", {}) == error
+        assert _telegram_api("sendMessage", {}) is None
+
+    def test_network_error_returns_none(self, fake_http: type[_FakeConnection]) -> None:
+        from hookline.telegram import _telegram_api
+        fake_http.script = [TimeoutError("timed out")]
+        assert _telegram_api("sendMessage", {}) is None
+        assert fake_http.instances[0].closed
+
+    def test_rate_limit_retried_after_delay(
+        self, fake_http: type[_FakeConnection], monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        from hookline.telegram import _telegram_api
+        _telegram = sys.modules["hookline.telegram"]
+        slept: list[float] = []
+        monkeypatch.setattr(_telegram.time, "sleep", slept.append)
+        limited = {"ok": False, "parameters": {"retry_after": 2}}
+        fake_http.script = [
+            _FakeResponse(429, limited),
+            _FakeResponse(200, {"ok": True, "result": "sent"}),
+        ]
+        assert _telegram_api("sendMessage", {}) == {"ok": True, "result": "sent"}
+        assert slept == [2.0]
+        fake_http.script = [_FakeResponse(429, limited), _FakeResponse(429, limited)]
+        assert _telegram_api("sendMessage", {}) == limited
+        fake_http.script = [_FakeResponse(429, {"ok": False, "parameters": {"retry_after": 600}})]
+        assert _telegram_api("sendMessage", {})["parameters"]["retry_after"] == 600
+        assert slept == [2.0, 2.0]
+
+    def test_document_shares_connection(self, fake_http: type[_FakeConnection]) -> None:
+        from hookline.telegram import _send_document, _telegram_api
+        fake_http.script = [
+            _FakeResponse(200, {"ok": True}),
+            _FakeResponse(200, {"ok": True}),
+        ]
+        _telegram_api("getMe", {})
+        _send_document(b"log line\n", "out.log", caption="full output")
+        conn = fake_http.instances[0]
+        assert len(fake_http.instances) == 1
+        assert conn.requests[1] == ("POST", "/bottest-token/sendDocument")
+        assert b'filename="out.log"' in conn.bodies[1]
+        assert conn.bodies[1].count(b"log line\n") == 1
+        assert conn.headers[1]["Content-Length"] == str(len(conn.bodies[1]))
+        assert conn.timeout == 30
+
+    def test_document_boundary_avoids_file_contents(
+        self, fake_http: type[_FakeConnection], monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        import itertools
+
+        from hookline.telegram import _send_document
+        _telegram = sys.modules["hookline.telegram"]
+        monkeypatch.setattr(_telegram, "_boundary_counter", itertools.count())
+        clash = _telegram._BOUNDARY_SALT + b"00000000"
+        fake_http.script = [_FakeResponse(200, {"ok": True})]
+        _send_document(b"before " + clash + b" after", "out.log")
+        content_type = fake_http.instances[0].headers[0]["Content-Type"]
+        boundary = content_type.split("boundary=")[1].encode()
+        assert boundary != clash
+        assert fake_http.instances[0].bodies[0].endswith(b"--" + boundary + b"--")
+
+    def test_document_content_type_from_filename(
+        self, fake_http: type[_FakeConnection],
+    ) -> None:
+        from hookline.telegram import _send_document
+        fake_http.script = [_FakeResponse(200, {"ok": True}) for _ in range(3)]
+        _send_document(b"text", "transcript_proj.txt")
+        _send_document(b"{}", "state.json")
+        _send_document(b"\x1f\x8b", "logs.gz")
+        bodies = fake_http.instances[0].bodies
+        assert b"Content-Type: text/plain\r\n" in bodies[0]
+        assert b"Content-Type: application/json\r\n" in bodies[1]
+        assert b"Content-Type: application/octet-stream\r\n" in bodies[2]
+
+    def test_document_error_is_logged_not_raised(self, fake_http: type[_FakeConnection]) -> None:
+        from hookline.telegram import _send_document
+        fake_http.script = [TimeoutError("timed out")]
+        _send_document(b"x", "out.log")
+        fake_http.script = [_FakeResponse(400, {"ok": False})]
+        _send_document(b"x", "out.log")
+
+
+class TestSendMessage:
+    """Test send_message's button bookkeeping."""
+
+    def test_previous_buttons_removed_alongside_send(
+        self, hookline: Any, mock_telegram: list, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        from hookline.buttons import _get_last_button_msg, _set_last_button_msg
+        _telegram = sys.modules["hookline.telegram"]
+        monkeypatch.setattr(_telegram, "SHOW_BUTTONS", True)
+        _set_last_button_msg("proj", 41)
+        msg_id = _telegram.send_message("<b>hi</b>", project="proj")
+        methods = sorted(c[0] for c in mock_telegram)
+        assert methods == ["editMessageReplyMarkup", "sendMessage"]
+        edit = next(c[1] for c in mock_telegram if c[0] == "editMessageReplyMarkup")
+        assert edit["message_id"] == 41
+        assert _get_last_button_msg("proj") == msg_id
+
+    def test_button_markup_memoized(self, hookline: Any) -> None:
+        from hookline.buttons import _build_buttons
+        final = _build_buttons("proj", True)
+        assert _build_buttons("proj", True) is final
+        assert final["inline_keyboard"][0][1]["callback_data"] == "reset_proj"
+        assert _build_buttons("proj", False)["inline_keyboard"][0][0]["callback_data"] == (
+            "mute_30_proj"
+        )
+
+    def test_plain_text_fallback_only_after_rejection(
+        self, hookline: Any, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        _telegram = sys.modules["hookline.telegram"]
+        sent: list[dict[str, Any]] = []
+        replies: list[dict[str, Any] | None] = []
+
+        def fake_api(method: str, payload: dict[str, Any], timeout: int = 10) -> Any:
+            sent.append(payload)
+            return replies.pop(0)
+
+        monkeypatch.setattr(_telegram, "_telegram_api", fake_api)
+        bad_html = {"ok": False, "error_code": 400, "description": "can't parse entities"}
+        replies[:] = [bad_html, {"ok": True, "result": {"message_id": 7}}]
+        assert _telegram.send_message("<b>broken") == 7
+        assert "parse_mode" not in sent[1]
+        sent.clear()
+        replies[:] = [None]
+        assert _telegram.send_message("<b>hi</b>") is None
+        assert len(sent) == 1
@@ -38,6 +38,26 @@ class TestReadTranscriptTail:
         result = hookline._read_transcript_tail(str(transcript))
         assert len(result) == 2
 
+    def test_empty_file_returns_empty(self, hookline: Any, tmp_path: Path) -> None:
+        transcript = tmp_path / "test.jsonl"
+        transcript.write_text("")
+        assert hookline._read_transcript_tail(str(transcript)) == []
+
+    def test_tail_drops_partial_first_line(self, hookline: Any, tmp_path: Path) -> None:
+        transcript = tmp_path / "test.jsonl"
+        _write_transcript(transcript, [{"n": i} for i in range(100)])
+        result = hookline._read_transcript_tail(str(transcript), tail_bytes=40)
+        assert result and result[-1] == {"n": 99}
+        assert all(set(e) == {"n"} for e in result)
+
+    def test_reads_appended_lines(self, hookline: Any, tmp_path: Path) -> None:
+        transcript = tmp_path / "test.jsonl"
+        _write_transcript(transcript, [{"n": 1}])
+        assert hookline._read_transcript_tail(str(transcript)) == [{"n": 1}]
+        with transcript.open("a") as f:
+            f.write(json.dumps({"n": 2}) + "\n")
+        assert hookline._read_transcript_tail(str(transcript)) == [{"n": 1}, {"n": 2}]
+
 
 class TestExtractTranscriptSummary:
     """Test _extract_transcript_summary."""